@@ -6,19 +6,20 @@ Securely syncs Hospitable reservations with UniFi Access door control.
 
 import os
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 
 # Load configuration from environment variables
 from config_loader import load_config
 
 try:
-    from hospitable_sdk import HospitableSDK
     from unifi_access import UniFiAccess
     import requests
+    from unifi_access_pms.core.locking import SingleFlight, sync_scope
+    from unifi_access_pms.providers.hospitable import HospitableProvider
 except ImportError as e:
     print(f"❌ Missing required dependency: {e}")
-    print("Install with: pip install hospitable-sdk unifi-access-python requests")
+    print("Install with: pip install unifi-access-python requests && pip install -e .")
     sys.exit(1)
 
 
@@ -32,6 +33,11 @@ def generate_pin_from_phone(phone: str, length: int = 4) -> str:
         return digits.zfill(length)
 
 
+def to_utc(value: datetime) -> datetime:
+    """Normalize a datetime to aware UTC; naive values are taken as local time."""
+    return value.astimezone(timezone.utc)
+
+
 def send_notification(message: str, config: Dict[str, Any]) -> None:
     """Send push notification via Simplepush."""
     simplepush_key = os.getenv('SIMPLEPUSH_KEY')
@@ -46,7 +52,8 @@ def send_notification(message: str, config: Dict[str, Any]) -> None:
                 'key': simplepush_key,
                 'title': 'UniFi Access Sync',
                 'msg': message
-            }
+            },
+            timeout=10
         )
         if response.status_code == 200:
             print(f"📱 Notification sent: {message}")
@@ -70,9 +77,28 @@ def main():
         print("Please set the required environment variables or copy .env.example to .env")
         return
     
+    # Only one sync per controller at a time; overlapping requests coalesce
+    # into a single follow-up run (shared with `unifi-access-pms sync`)
+    lock = SingleFlight(
+        sync_scope([unifi_config['api_host']]),
+        os.getenv('UNIFI_ACCESS_PMS_LOCK_DIR')
+    )
+    if lock.run(lambda: run_sync(config)) == 0:
+        print("⏳ A sync for this controller is already running; it will run once more")
+
+
+def run_sync(config: Dict[str, Any]) -> None:
+    """Synchronize reservations with UniFi Access visitors."""
+    hospitable_config = config['hospitable']
+    unifi_config = config['unifi']
+    
     # Initialize SDKs
     try:
-        hospitable = HospitableSDK(api_key=hospitable_config['api_key'])
+        # Only the configured property is requested; pages are read lazily
+        hospitable = HospitableProvider({
+            'api_key': hospitable_config['api_key'],
+            'property_mappings': {hospitable_config['property_id']: None}
+        })
         unifi = UniFiAccess(
             host=unifi_config['api_host'],
             token=unifi_config['api_token']
@@ -81,18 +107,10 @@ def main():
         print(f"❌ SDK initialization failed: {e}")
         return
     
-    # Get current reservations
-    try:
-        print("📋 Fetching Hospitable reservations...")
-        reservations = hospitable.reservations.list(
-            property_id=hospitable_config['property_id'],
-            start_date=datetime.now().date(),
-            end_date=(datetime.now() + timedelta(days=30)).date()
-        )
-        print(f"Found {len(reservations)} reservations")
-    except Exception as e:
-        print(f"❌ Failed to fetch reservations: {e}")
-        return
+    # Sync window; schedule short horizons often and long ones rarely, e.g.
+    # SYNC_HORIZON_DAYS=2 every minute and SYNC_HORIZON_DAYS=90 hourly
+    horizon_days = float(os.getenv('SYNC_HORIZON_DAYS', '30'))
+    window_end = datetime.now() + timedelta(days=horizon_days)
     
     # Get current UniFi visitors
     try:
@@ -112,54 +130,70 @@ def main():
     # Track processed reservations
     processed_guests = set()
     
-    for reservation in reservations:
-        if reservation.status == 'confirmed':
-            guest_name = f"{reservation.guest.first_name} {reservation.guest.last_name}"
-            guest_phone = reservation.guest.phone or ""
-            
-            # Generate PIN from phone
-            pin = generate_pin_from_phone(guest_phone)
-            
-            # Check if visitor already exists
-            existing_visitor = None
-            for visitor in visitors:
-                if visitor.name == guest_name:
-                    existing_visitor = visitor
-                    break
-            
-            if existing_visitor:
-                # Update existing visitor
-                try:
-                    unifi.visitors.update(
-                        visitor_id=existing_visitor.id,
-                        start_time=reservation.check_in,
-                        end_time=reservation.check_out,
-                        pin=pin
-                    )
-                    updated += 1
-                    print(f"✅ Updated visitor: {guest_name}")
-                except Exception as e:
-                    print(f"⚠️ Failed to update {guest_name}: {e}")
-            else:
-                # Create new visitor
-                try:
-                    unifi.visitors.create(
-                        name=guest_name,
-                        start_time=reservation.check_in,
-                        end_time=reservation.check_out,
-                        pin=pin
-                    )
-                    created += 1
-                    print(f"✅ Created visitor: {guest_name}")
-                except Exception as e:
-                    print(f"⚠️ Failed to create {guest_name}: {e}")
-            
-            processed_guests.add(guest_name)
-            synced += 1
+    # Confirmed reservations are streamed page by page while syncing
+    print("📋 Fetching Hospitable reservations...")
+    reservations = hospitable.iter_reservations(datetime.now(), window_end)
+    
+    while True:
+        try:
+            reservation = next(reservations, None)
+        except Exception as e:
+            # Without the full list, deleting "missing" guests would be unsafe
+            print(f"❌ Failed to fetch reservations: {e}")
+            return
+        if reservation is None:
+            break
+        
+        guest_name = f"{reservation.guest.first_name} {reservation.guest.last_name}"
+        guest_phone = reservation.guest.phone or ""
+        
+        # Generate PIN from phone
+        pin = generate_pin_from_phone(guest_phone)
+        
+        # Check if visitor already exists
+        existing_visitor = None
+        for visitor in visitors:
+            if visitor.name == guest_name:
+                existing_visitor = visitor
+                break
+        
+        if existing_visitor:
+            # Update existing visitor
+            try:
+                unifi.visitors.update(
+                    visitor_id=existing_visitor.id,
+                    start_time=reservation.check_in,
+                    end_time=reservation.check_out,
+                    pin=pin
+                )
+                updated += 1
+                print(f"✅ Updated visitor: {guest_name}")
+            except Exception as e:
+                print(f"⚠️ Failed to update {guest_name}: {e}")
+        else:
+            # Create new visitor
+            try:
+                unifi.visitors.create(
+                    name=guest_name,
+                    start_time=reservation.check_in,
+                    end_time=reservation.check_out,
+                    pin=pin
+                )
+                created += 1
+                print(f"✅ Created visitor: {guest_name}")
+            except Exception as e:
+                print(f"⚠️ Failed to create {guest_name}: {e}")
+        
+        processed_guests.add(guest_name)
+        synced += 1
+    
+    print(f"Found {synced} confirmed reservations")
     
-    # Clean up cancelled/expired visitors
+    # Clean up cancelled/expired visitors within this window only
     for visitor in visitors:
-        if visitor.name not in processed_guests:
+        starts_later = (visitor.start_time is not None
+                        and to_utc(visitor.start_time) > to_utc(window_end))
+        if visitor.name not in processed_guests and not starts_later:
             try:
                 unifi.visitors.delete(visitor.id)
                 deleted += 1
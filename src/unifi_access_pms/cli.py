@@ -1,14 +1,27 @@
 #!/usr/bin/env python3
 """Command-line interface for UniFi Access PMS."""
 
+import sys
+import threading
+
 import click
 import yaml
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, List
 
 from .config.manager import ConfigManager
+from .config.watcher import ConfigWatcher
+from .core.audit import AuditStore
+from .core.cassette import Cassette
+from .core.health import ProbeReport, ProbeTarget, probe_all
+from .core.profiling import Profiler
 from .core.registry import ProviderRegistry, NotificationRegistry
+from .core.scheduler import TieredScheduler
+from .core.transitions import TransitionScheduler
+from .integrations.unifi_access import UniFiAccessClient
 from .notifications.manager import NotificationManager
+from .runner import SyncRunner
 
 
 @click.group()
@@ -104,67 +117,405 @@ def list_providers():
         click.echo(f"  - {provider}")
 
 
+def _echo_provider_stats(stats):
+    """Print per-provider attempt counts and latencies."""
+    for provider_name, provider_stats in stats.items():
+        click.echo(
+            f"📋 {provider_name}: {provider_stats.attempts} attempts, "
+            f"{provider_stats.failures} failures, avg {provider_stats.avg_latency:.2f}s"
+        )
+
+
+def _start_profiler(prefix: Optional[str]) -> Optional[Profiler]:
+    """Start profiling if ``--profile`` was given."""
+    if prefix is None:
+        return None
+    profiler = Profiler(prefix)
+    profiler.start()
+    return profiler
+
+
+def _stop_profiler(profiler: Optional[Profiler]) -> None:
+    """Stop profiling and report where the results were written."""
+    if profiler is None:
+        return
+    for path in profiler.stop():
+        click.echo(f"📊 Profile written to {path}")
+
+
+def _open_cassette(record: Optional[str], replay: Optional[str] = None,
+                   realtime: bool = False) -> Optional[Cassette]:
+    """Open the cassette given by ``--record`` or ``--replay``."""
+    if record and replay:
+        raise click.UsageError("--record and --replay cannot be combined")
+    if realtime and not replay:
+        raise click.UsageError("--realtime only applies to --replay")
+    if replay:
+        cassette = Cassette.replay(replay, realtime=realtime)
+        click.echo(f"📼 Replaying {len(cassette.interactions)} recorded calls from {replay}")
+        return cassette
+    if record:
+        return Cassette.record(record)
+    return None
+
+
+def _save_cassette(cassette: Optional[Cassette]) -> None:
+    """Write a recording, or report recorded calls a replay never reached."""
+    if cassette is None:
+        return
+    if cassette.replaying:
+        if cassette.unused():
+            click.echo(f"⚠️ {cassette.unused()} recorded calls were not replayed")
+        return
+    cassette.save()
+    click.echo(f"📼 Recorded {len(cassette.interactions)} calls to {cassette.path}")
+
+
+def _echo_results(results):
+    """Print a summary of each controller's sync result."""
+    for controller_name, result in results.items():
+        label = f"[{controller_name}] " if len(results) > 1 else ""
+        click.echo(
+            f"✅ {label}Sync complete: {result.total_processed} processed, "
+            f"{result.created} created, {result.updated} updated, "
+            f"{result.deleted} deleted, {result.retries} retries"
+        )
+        for deferred in result.deferred:
+            click.echo(f"⏳ {label}Deferred: {deferred}")
+        for error in result.errors:
+            click.echo(f"⚠️ {label}{error}")
+
+
 @cli.command()
 @click.option('--config', '-c', type=click.Path(exists=True), default='config.yaml',
               help='Configuration file path')
 @click.option('--providers', '-p', help='Comma-separated list of providers to sync')
 @click.option('--dry-run', is_flag=True, help='Show what would be done without making changes')
 @click.option('--verbose', '-v', is_flag=True, help='Verbose output')
-def sync(config: str, providers: Optional[str], dry_run: bool, verbose: bool):
+@click.option('--profile', 'profile', is_flag=False, flag_value='sync-profile', default=None,
+              metavar='PREFIX',
+              help='Write PREFIX.pstats and a PREFIX.trace.json call trace '
+                   '(chrome://tracing, Perfetto, speedscope); PREFIX defaults to sync-profile')
+@click.option('--record', type=click.Path(dir_okay=False), metavar='CASSETTE',
+              help='Record provider and controller calls with their timings to CASSETTE')
+@click.option('--replay', type=click.Path(exists=True, dir_okay=False), metavar='CASSETTE',
+              help='Replay a recorded run offline instead of calling providers and controllers')
+@click.option('--realtime', is_flag=True, help='With --replay, wait out each recorded call duration')
+def sync(config: str, providers: Optional[str], dry_run: bool, verbose: bool,
+         profile: Optional[str], record: Optional[str], replay: Optional[str], realtime: bool):
     """Synchronize reservations with UniFi Access."""
+    cassette = _open_cassette(record, replay, realtime)
+    profiler = _start_profiler(profile)
     try:
         config_manager = ConfigManager(config)
-        
+        config_manager.validate()
+        app_config = config_manager.config
+
         # Parse providers list
-        provider_list = None
+        provider_list = app_config.core.enabled_providers
         if providers:
             provider_list = [p.strip() for p in providers.split(',')]
-        
+
         if dry_run:
             click.echo("🔍 Dry run mode - no changes will be made")
-        
-        # TODO: Implement sync logic
-        click.echo("✅ Sync completed successfully")
+
+        runner = SyncRunner(app_config, provider_list, dry_run=dry_run, cassette=cassette)
+
+        def run_once():
+            if cassette is not None and cassette.replaying and 'window' in cassette.meta:
+                # Replay the recorded window so the same visitors are planned
+                start_date, end_date = map(datetime.fromisoformat, cassette.meta['window'])
+            else:
+                start_date = datetime.now()
+                end_date = start_date + timedelta(days=30)
+            if cassette is not None and not cassette.replaying:
+                cassette.meta['window'] = [start_date.isoformat(), end_date.isoformat()]
+            results = runner.sync(start_date, end_date)
+            if verbose:
+                _echo_provider_stats(runner.executor.stats)
+            _echo_results(results)
+
+        try:
+            if dry_run or (cassette is not None and cassette.replaying):
+                run_once()
+            elif runner.single_flight().run(run_once) == 0:
+                click.echo("⏳ A sync for these controllers is already running; "
+                           "it will run once more when it finishes")
+        finally:
+            runner.close()
         
     except Exception as e:
         click.echo(f"❌ Sync failed: {e}")
         raise click.ClickException(str(e))
+    finally:
+        _stop_profiler(profiler)
+        _save_cassette(cassette)
 
 
 @cli.command()
 @click.option('--config', '-c', type=click.Path(exists=True), default='config.yaml',
               help='Configuration file path')
-def test_providers(config: str):
-    """Test all enabled providers."""
+@click.option('--verbose', '-v', is_flag=True, help='Verbose output')
+@click.option('--profile', 'profile', is_flag=False, flag_value='daemon-profile', default=None,
+              metavar='PREFIX',
+              help='Write PREFIX.pstats and a PREFIX.trace.json call trace '
+                   '(chrome://tracing, Perfetto, speedscope); PREFIX defaults to daemon-profile')
+@click.option('--record', type=click.Path(dir_okay=False), metavar='CASSETTE',
+              help='Record provider, controller and channel calls with their timings to CASSETTE')
+def daemon(config: str, verbose: bool, profile: Optional[str], record: Optional[str]):
+    """Run tiered syncs continuously (see core.sync_tiers)."""
+    cassette = _open_cassette(record)
+    profiler = _start_profiler(profile)
     try:
         config_manager = ConfigManager(config)
-        # TODO: Implement provider testing
-        click.echo("✅ All providers tested successfully")
+        config_manager.validate()
+        app_config = config_manager.config
+        tiers = app_config.core.get_sync_tiers()
+
+        runner = SyncRunner(app_config, cassette=cassette)
+        notification_manager = NotificationManager(app_config, cassette=cassette)
+        watcher = ConfigWatcher(config_manager)
+        transitions = TransitionScheduler(runner.transition, runner.grace_period)
+
+        def run_tier(tier, start_date, end_date):
+            click.echo(f"🔄 [{tier.name}] Syncing the next {tier.horizon_hours:g} hours")
+
+            def run_once():
+                results = runner.sync(start_date, end_date)
+                transitions.plan(runner.reservations, until=end_date)
+                if verbose:
+                    _echo_provider_stats(runner.executor.stats)
+                _echo_results(results)
+                for controller_name, result in results.items():
+                    if result.errors:
+                        notification_manager.send_notification(
+                            f"[{controller_name}] Sync finished with {len(result.errors)} errors",
+                            event_type="error"
+                        )
+
+            if runner.single_flight().run(run_once) == 0:
+                click.echo(f"⏳ [{tier.name}] Another sync is running; coalesced")
+
+        scheduler = TieredScheduler(tiers, run_tier)
+
+        def reload_config():
+            reloaded = watcher.poll()
+            if reloaded is None:
+                return
+            new_config, changes = reloaded
+            click.echo("🔁 Configuration changed; applying")
+            runner.reconfigure(new_config, changes)
+            notification_manager.reconfigure(new_config, changes.channels)
+            if changes.core:
+                scheduler.set_tiers(new_config.core.get_sync_tiers())
+                transitions.grace_period = runner.grace_period
+
+        for tier in tiers:
+            click.echo(f"⏱️ Tier {tier.name}: {tier.horizon_hours:g}h every {tier.interval}s")
+        stop = threading.Event()
+        transition_thread = threading.Thread(target=transitions.run_forever, args=(stop,),
+                                             name='transitions', daemon=True)
+        transition_thread.start()
+        try:
+            scheduler.run_forever(stop, idle=reload_config)
+        except KeyboardInterrupt:
+            click.echo("👋 Daemon stopped")
+        finally:
+            stop.set()
+            transitions.wake()
+            transition_thread.join()
+            notification_manager.close()
+            runner.close()
+
+    except Exception as e:
+        click.echo(f"❌ Daemon failed: {e}")
+        raise click.ClickException(str(e))
+    finally:
+        _stop_profiler(profiler)
+        _save_cassette(cassette)
+
+
+@cli.command()
+@click.option('--config', '-c', type=click.Path(exists=True), default='config.yaml',
+              help='Configuration file path')
+@click.option('--reservation', '-r', help='Reservation ID')
+@click.option('--visitor', help='UniFi Access visitor ID')
+@click.option('--property', 'property_id', help='Property ID')
+@click.option('--guest', help='Guest name')
+@click.option('--since', type=click.DateTime(), help='Only entries at or after this time')
+@click.option('--limit', '-n', default=50, show_default=True, help='Maximum entries to show')
+@click.option('--runs', is_flag=True, help='List sync runs instead of visitor operations')
+def audit(config: str, reservation: Optional[str], visitor: Optional[str],
+          property_id: Optional[str], guest: Optional[str], since: Optional[datetime],
+          limit: int, runs: bool):
+    """Show the audit history of visitor changes and sync runs."""
+    try:
+        config_manager = ConfigManager(config)
+        audit_db = config_manager.config.core.audit_db if config_manager.config.core else None
+        if not audit_db or not Path(audit_db).exists():
+            raise click.ClickException(f"No audit log found at {audit_db}")
+
+        store = AuditStore(audit_db)
+        try:
+            since_ts = since.timestamp() if since else None
+            if runs:
+                for run in store.runs(since=since_ts, limit=limit):
+                    click.echo(
+                        f"{datetime.fromtimestamp(run.started_at):%Y-%m-%d %H:%M:%S} "
+                        f"[{run.controller}] run {run.run_id}: {run.processed} processed, "
+                        f"{run.created} created, {run.updated} updated, {run.deleted} deleted, "
+                        f"{run.errors} errors, {run.deferred} deferred "
+                        f"({run.finished_at - run.started_at:.1f}s)"
+                    )
+                return
+
+            entries = store.history(reservation_id=reservation, visitor_id=visitor,
+                                    property_id=property_id, name=guest,
+                                    since=since_ts, limit=limit)
+            if not entries:
+                click.echo("No matching audit entries")
+            for entry in entries:
+                pin = " (PIN changed)" if entry.pin_changed else ""
+                detail = f": {entry.detail}" if entry.detail else ""
+                click.echo(
+                    f"{datetime.fromtimestamp(entry.ts):%Y-%m-%d %H:%M:%S} "
+                    f"[{entry.controller}] {entry.action} {entry.name} {entry.status}{pin} "
+                    f"reservation={entry.reservation_id} visitor={entry.visitor_id} "
+                    f"property={entry.property_id}{detail}"
+                )
+        finally:
+            store.close()
+
+    except click.ClickException:
+        raise
+    except Exception as e:
+        click.echo(f"❌ Audit query failed: {e}")
+        raise click.ClickException(str(e))
+
+
+def _failing_probe(error: Exception):
+    """Probe for a target that could not even be set up."""
+    def probe():
+        raise error
+    return probe
+
+
+def _provider_targets(app_config) -> List[ProbeTarget]:
+    """Probe each enabled provider with a one-day fetch."""
+    targets = []
+    all_configs = app_config.providers or {}
+    for name in app_config.core.enabled_providers:
+        provider_config = all_configs.get(name)
+        if provider_config is None or not provider_config.enabled:
+            continue
+        try:
+            provider = ProviderRegistry.get_provider(name)(provider_config.config)
+        except Exception as e:
+            targets.append(ProbeTarget('provider', name, _failing_probe(e)))
+            continue
+
+        def fetch(provider=provider):
+            start_date = datetime.now()
+            return provider.get_reservations(start_date, start_date + timedelta(days=1))
+        targets.append(ProbeTarget('provider', name, fetch))
+    return targets
+
+
+def _controller_targets(app_config) -> List[ProbeTarget]:
+    """Probe each controller by listing its visitors."""
+    return [
+        ProbeTarget('controller', controller.name or controller.api_host,
+                    UniFiAccessClient.from_config(controller).get_visitors)
+        for controller in app_config.unifi.get_controllers()
+    ]
+
+
+def _echo_probe_reports(reports: List[ProbeReport]) -> bool:
+    """Print one line per probed target; return True if all passed."""
+    for report in reports:
+        if report.latencies:
+            latency = (f"p50 {report.p50 * 1000:.0f}ms, p95 {report.p95 * 1000:.0f}ms "
+                       f"({len(report.latencies)}/{report.probes} ok)")
+        else:
+            latency = f"0/{report.probes} ok"
+        icon = "✅" if report.ok else "❌"
+        detail = f": {report.failures[-1]}" if report.failures else ""
+        click.echo(f"{icon} {report.kind} {report.name}: {latency}{detail}")
+    return all(report.ok for report in reports)
+
+
+@cli.command()
+@click.option('--config', '-c', type=click.Path(exists=True), default='config.yaml',
+              help='Configuration file path')
+@click.option('--probes', '-n', default=3, show_default=True,
+              help='Probes per provider and controller')
+@click.option('--timeout', default=10.0, show_default=True,
+              help='Seconds each probe may take')
+def test_providers(config: str, probes: int, timeout: float):
+    """Probe every enabled provider and controller concurrently.
+
+    Exits with status 1 if any of them failed or timed out.
+    """
+    try:
+        config_manager = ConfigManager(config)
+        app_config = config_manager.config
+        targets = _provider_targets(app_config) + _controller_targets(app_config)
+        if not targets:
+            click.echo("No providers or controllers configured")
+            return
+        healthy = _echo_probe_reports(probe_all(targets, probes=probes, timeout=timeout))
     except Exception as e:
         click.echo(f"❌ Provider testing failed: {e}")
         raise click.ClickException(str(e))
 
+    if not healthy:
+        sys.exit(1)
+    click.echo("✅ All providers and controllers healthy")
+
 
 @cli.command()
 @click.option('--config', '-c', type=click.Path(exists=True), default='config.yaml',
               help='Configuration file path')
-def test_notifications(config: str):
-    """Test notification channels."""
+@click.option('--probes', '-n', default=1, show_default=True,
+              help='Test messages per channel')
+@click.option('--timeout', default=10.0, show_default=True,
+              help='Seconds each send may take')
+def test_notifications(config: str, probes: int, timeout: float):
+    """Send a test message through every channel concurrently.
+
+    Exits with status 1 if any channel failed or timed out.
+    """
     try:
         config_manager = ConfigManager(config)
         notification_manager = NotificationManager(config_manager.config)
-        
-        # Send test notification
-        notification_manager.send_notification(
-            "Test notification from UniFi Access PMS",
-            event_type="test"
-        )
-        
-        click.echo("✅ Test notifications sent successfully")
+        targets = [
+            ProbeTarget('channel', name,
+                        lambda channel=channel: channel.send_notification(
+                            "Test notification from UniFi Access PMS",
+                            title="Test Notification"))
+            for name, channel in notification_manager.channels.items()
+        ]
+        notifications = config_manager.config.notifications
+        for name in (notifications.enabled_channels if notifications else []):
+            channel_config = notifications.channels.get(name)
+            if channel_config and channel_config.enabled and name not in notification_manager.channels:
+                targets.append(ProbeTarget('channel', name, _failing_probe(
+                    RuntimeError("channel failed to initialize"))))
+        if not targets:
+            click.echo("No notification channels enabled")
+            return
+        try:
+            healthy = _echo_probe_reports(probe_all(targets, probes=probes, timeout=timeout))
+        finally:
+            notification_manager.close()
     except Exception as e:
         click.echo(f"❌ Notification testing failed: {e}")
         raise click.ClickException(str(e))
 
+    if not healthy:
+        sys.exit(1)
+    click.echo("✅ Test notifications sent successfully")
+
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
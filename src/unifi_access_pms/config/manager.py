@@ -25,6 +25,13 @@ class ConfigManager:
         
         return Config.from_dict(config_data)
     
+    def reload(self) -> Config:
+        """Re-read the file; keep the current config if the new one is invalid."""
+        config = self._load_config()
+        config.validate()
+        self.config = config
+        return config
+    
     def validate(self) -> bool:
         """Validate the loaded configuration."""
         return self.config.validate()
@@ -32,7 +39,8 @@ class ConfigManager:
     def get_provider_config(self, provider_name: str) -> Dict[str, Any]:
         """Get configuration for a specific provider."""
         providers = self.config.providers or {}
-        return providers.get(provider_name, {}).get('config', {})
+        provider = providers.get(provider_name)
+        return provider.config if provider else {}
     
     def get_notification_config(self, channel_name: str) -> Dict[str, Any]:
         """Get configuration for a specific notification channel."""
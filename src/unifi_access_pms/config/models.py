@@ -4,6 +4,14 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 
 
+@dataclass
+class SyncTierConfig:
+    """A sync window: how far ahead it looks and how often it runs."""
+    name: str
+    horizon_hours: float
+    interval: int
+
+
 @dataclass
 class CoreConfig:
     """Core configuration settings."""
@@ -11,13 +19,72 @@ class CoreConfig:
     pin_generation_method: str = "phone_based"
     timezone: str = "UTC"
     sync_interval: Optional[int] = None
+    snapshot_dir: Optional[str] = ".snapshots"
+    max_snapshot_staleness: int = 86400
+    lock_dir: Optional[str] = None
+    journal_dir: Optional[str] = ".journal"
+    audit_db: Optional[str] = ".audit.db"
+    checkout_grace_period: int = 0
+    imminent_checkin_window: int = 86400
+    write_budget: Optional[float] = None
+    shard_store: Optional[str] = None
+    node_id: Optional[str] = None
+    shard_lease_ttl: float = 60.0
+    sync_tiers: List[SyncTierConfig] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.sync_tiers = [
+            tier if isinstance(tier, SyncTierConfig) else SyncTierConfig(**tier)
+            for tier in self.sync_tiers
+        ]
+
+    def get_sync_tiers(self) -> List[SyncTierConfig]:
+        """Configured tiers, or a single 30-day window every sync_interval."""
+        if self.sync_tiers:
+            return self.sync_tiers
+        return [SyncTierConfig(name="default", horizon_hours=30 * 24,
+                               interval=self.sync_interval or 300)]
 
 
 @dataclass
 class UniFiConfig:
-    """UniFi Access configuration."""
+    """UniFi Access configuration.
+
+    A site with several controllers lists them under ``controllers``; each
+    entry is itself a ``UniFiConfig`` that inherits unset settings from the
+    top-level section and serves the property IDs in ``properties`` (an empty
+    list makes it the catch-all controller).
+    """
     api_host: str = ""
     api_token: str = ""
+    rate_limit: float = 10.0
+    burst: int = 20
+    max_retries: int = 3
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+    name: str = ""
+    properties: List[str] = field(default_factory=list)
+    controllers: List['UniFiConfig'] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UniFiConfig':
+        """Create UniFiConfig, expanding per-controller overrides."""
+        data = dict(data)
+        controllers_data = data.pop('controllers', None) or []
+        shared = {k: v for k, v in data.items() if k not in ('api_host', 'name', 'properties')}
+
+        config = cls(**data)
+        config.controllers = [cls(**{**shared, **controller}) for controller in controllers_data]
+        for controller in config.controllers:
+            if not controller.name:
+                controller.name = controller.api_host
+        return config
+
+    def get_controllers(self) -> List['UniFiConfig']:
+        """Return every configured controller."""
+        if self.controllers:
+            return self.controllers
+        return [self]
 
 
 @dataclass
@@ -27,6 +94,8 @@ class ProviderConfig:
     config: Dict[str, Any] = field(default_factory=dict)
     priority: int = 1
     retry_attempts: int = 3
+    retry_delay: float = 1.0
+    timeout: Optional[float] = None
 
 
 @dataclass
@@ -34,6 +103,17 @@ class NotificationChannelConfig:
     """Notification channel configuration."""
     enabled: bool = True
     config: Dict[str, Any] = field(default_factory=dict)
+    events: List[str] = field(default_factory=list)
+    rate_limit: Optional[int] = None
+
+
+@dataclass
+class HttpConfig:
+    """HTTP settings shared by the notification channels."""
+    timeout: float = 10.0
+    max_hosts: int = 10
+    max_connections_per_host: int = 4
+    proxy: Optional[str] = None
 
 
 @dataclass
@@ -42,6 +122,7 @@ class NotificationConfig:
     enabled_channels: List[str] = field(default_factory=list)
     channels: Dict[str, NotificationChannelConfig] = field(default_factory=dict)
     events: List[str] = field(default_factory=lambda: ["sync_complete", "error"])
+    http: HttpConfig = field(default_factory=HttpConfig)
 
 
 @dataclass
@@ -61,7 +142,7 @@ class Config:
             config.core = CoreConfig(**data['core'])
         
         if 'unifi' in data:
-            config.unifi = UniFiConfig(**data['unifi'])
+            config.unifi = UniFiConfig.from_dict(data['unifi'])
         
         if 'providers' in data:
             providers = {}
@@ -79,7 +160,8 @@ class Config:
             config.notifications = NotificationConfig(
                 enabled_channels=notif_data.get('enabled_channels', []),
                 channels=channels,
-                events=notif_data.get('events', ["sync_complete", "error"])
+                events=notif_data.get('events', ["sync_complete", "error"]),
+                http=HttpConfig(**notif_data.get('http', {}))
             )
         
         return config
@@ -92,10 +174,12 @@ class Config:
         if not self.unifi:
             raise ValueError("UniFi configuration is required")
         
-        if not self.unifi.api_host:
-            raise ValueError("UniFi API host is required")
-        
-        if not self.unifi.api_token:
-            raise ValueError("UniFi API token is required")
+        for controller in self.unifi.get_controllers():
+            label = f" for controller {controller.name}" if controller.name else ""
+            if not controller.api_host:
+                raise ValueError(f"UniFi API host is required{label}")
+            
+            if not controller.api_token:
+                raise ValueError(f"UniFi API token is required{label}")
         
         return True
\ No newline at end of file
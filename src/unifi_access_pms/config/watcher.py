@@ -0,0 +1,119 @@
+"""Configuration file watching and diffing for hot reload."""
+
+import os
+from dataclasses import dataclass, field, replace
+from typing import Dict, Optional, Set, Tuple
+
+from .manager import ConfigManager
+from .models import Config, UniFiConfig
+
+
+@dataclass
+class ConfigChanges:
+    """What differs between two configurations."""
+    providers: Set[str] = field(default_factory=set)
+    channels: Set[str] = field(default_factory=set)
+    controllers: Set[str] = field(default_factory=set)
+    core: bool = False
+
+    @property
+    def empty(self) -> bool:
+        """True if nothing changed."""
+        return not (self.providers or self.channels or self.controllers or self.core)
+
+
+def _changed_keys(old: Dict, new: Dict) -> Set[str]:
+    """Keys added, removed or modified between two dicts."""
+    return {key for key in set(old) | set(new) if old.get(key) != new.get(key)}
+
+
+def _controllers_by_host(unifi: Optional[UniFiConfig]) -> Dict[str, UniFiConfig]:
+    if unifi is None:
+        return {}
+    return {c.api_host: replace(c, controllers=[]) for c in unifi.get_controllers()}
+
+
+def diff_configs(old: Config, new: Config) -> ConfigChanges:
+    """Compare two configs by provider, channel and controller host."""
+    old_channels = old.notifications.channels if old.notifications else {}
+    new_channels = new.notifications.channels if new.notifications else {}
+    old_enabled = old.notifications.enabled_channels if old.notifications else []
+    new_enabled = new.notifications.enabled_channels if new.notifications else []
+
+    channels = _changed_keys(old_channels, new_channels)
+    channels |= set(old_enabled) ^ set(new_enabled)
+    old_http = old.notifications.http if old.notifications else None
+    new_http = new.notifications.http if new.notifications else None
+    if old_http != new_http:
+        # Channels share one HTTP session, so all of them move to the new one
+        channels |= set(old_channels) | set(new_channels)
+
+    return ConfigChanges(
+        providers=_changed_keys(old.providers or {}, new.providers or {}),
+        channels=channels,
+        controllers=_changed_keys(_controllers_by_host(old.unifi),
+                                  _controllers_by_host(new.unifi)),
+        core=old.core != new.core
+    )
+
+
+class ConfigWatcher:
+    """Detects edits to the config file and reloads it.
+
+    Uses inotify through the optional ``inotify_simple`` package when it is
+    available and falls back to polling the file's mtime and size. The parent
+    directory is watched so editors that replace the file are noticed too.
+    """
+
+    def __init__(self, config_manager: ConfigManager):
+        """Initialize config watcher."""
+        self.config_manager = config_manager
+        self.path = config_manager.config_path
+        self._signature = self._stat()
+        self._inotify = None
+        try:
+            from inotify_simple import INotify, flags
+            self._inotify = INotify()
+            self._inotify.add_watch(
+                str(self.path.parent.resolve()),
+                flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+            )
+        except (ImportError, OSError):
+            self._inotify = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def changed(self) -> bool:
+        """Return True if the file changed since the last check."""
+        if self._inotify is not None:
+            events = self._inotify.read(timeout=0)
+            if not any(event.name == self.path.name for event in events):
+                return False
+
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        return True
+
+    def poll(self) -> Optional[Tuple[Config, ConfigChanges]]:
+        """Reload the config if the file changed; return it with its diff."""
+        if not self.changed():
+            return None
+
+        old = self.config_manager.config
+        try:
+            new = self.config_manager.reload()
+        except Exception as e:
+            print(f"⚠️ Ignoring invalid configuration change: {e}")
+            return None
+
+        changes = diff_configs(old, new)
+        if changes.empty:
+            return None
+        return new, changes
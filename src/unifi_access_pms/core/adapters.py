@@ -0,0 +1,103 @@
+"""Adapters that expose synchronous plugins through the async interfaces."""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from .interfaces import (
+    ReservationProvider, NotificationChannel, UniFiAccessIntegration,
+    AsyncReservationProvider, AsyncNotificationChannel, AsyncUniFiAccessIntegration,
+)
+from .models import Reservation, Visitor
+from .registry import ProviderRegistry, NotificationRegistry
+
+T = TypeVar('T')
+
+
+async def _run_in_executor(executor: Optional[Executor], func: Callable[..., T],
+                           *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call in an executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+class AsyncProviderAdapter(AsyncReservationProvider):
+    """Runs a synchronous ``ReservationProvider`` in an executor."""
+
+    def __init__(self, provider: ReservationProvider, executor: Optional[Executor] = None):
+        """Initialize provider adapter."""
+        self.provider = provider
+        self.executor = executor
+
+    async def get_reservations(self, start_date: datetime, end_date: datetime) -> List[Reservation]:
+        """Fetch reservations for the given date range."""
+        return await _run_in_executor(self.executor, self.provider.get_reservations,
+                                      start_date, end_date)
+
+    def validate_config(self, config: Dict[str, Any]) -> bool:
+        """Validate provider configuration."""
+        return self.provider.validate_config(config)
+
+
+class AsyncChannelAdapter(AsyncNotificationChannel):
+    """Runs a synchronous ``NotificationChannel`` in an executor."""
+
+    def __init__(self, channel: NotificationChannel, executor: Optional[Executor] = None):
+        """Initialize channel adapter."""
+        self.channel = channel
+        self.executor = executor
+
+    async def send_notification(self, message: str, **kwargs) -> bool:
+        """Send a notification message."""
+        return await _run_in_executor(self.executor, self.channel.send_notification,
+                                      message, **kwargs)
+
+    def validate_config(self, config: Dict[str, Any]) -> bool:
+        """Validate channel configuration."""
+        return self.channel.validate_config(config)
+
+
+class AsyncIntegrationAdapter(AsyncUniFiAccessIntegration):
+    """Runs a synchronous ``UniFiAccessIntegration`` in an executor."""
+
+    def __init__(self, integration: UniFiAccessIntegration, executor: Optional[Executor] = None):
+        """Initialize integration adapter."""
+        self.integration = integration
+        self.executor = executor
+
+    async def get_visitors(self) -> List[Visitor]:
+        """Get all current visitors."""
+        return await _run_in_executor(self.executor, self.integration.get_visitors)
+
+    async def create_visitor(self, visitor: Visitor) -> str:
+        """Create a new visitor and return the visitor ID."""
+        return await _run_in_executor(self.executor, self.integration.create_visitor, visitor)
+
+    async def update_visitor(self, visitor_id: str, visitor: Visitor) -> bool:
+        """Update an existing visitor."""
+        return await _run_in_executor(self.executor, self.integration.update_visitor,
+                                      visitor_id, visitor)
+
+    async def delete_visitor(self, visitor_id: str) -> bool:
+        """Delete a visitor."""
+        return await _run_in_executor(self.executor, self.integration.delete_visitor, visitor_id)
+
+
+def create_async_provider(name: str, config: Dict[str, Any],
+                          executor: Optional[Executor] = None) -> AsyncReservationProvider:
+    """Instantiate a provider as async, preferring a native implementation."""
+    async_class = ProviderRegistry.get_async_provider(name)
+    if async_class is not None:
+        return async_class(config)
+    return AsyncProviderAdapter(ProviderRegistry.get_provider(name)(config), executor)
+
+
+def create_async_channel(name: str, config: Dict[str, Any],
+                         executor: Optional[Executor] = None) -> AsyncNotificationChannel:
+    """Instantiate a channel as async, preferring a native implementation."""
+    async_class = NotificationRegistry.get_async_channel(name)
+    if async_class is not None:
+        return async_class(config)
+    return AsyncChannelAdapter(NotificationRegistry.get_channel(name)(config), executor)
@@ -0,0 +1,251 @@
+"""Indexed SQLite audit log of visitor operations and sync runs."""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .models import SyncResult, VisitorOperation
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    run_id TEXT,
+    controller TEXT,
+    action TEXT NOT NULL,
+    status TEXT NOT NULL,
+    name TEXT,
+    reservation_id TEXT,
+    visitor_id TEXT,
+    property_id TEXT,
+    pin_changed INTEGER NOT NULL DEFAULT 0,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_operations_reservation ON operations (reservation_id, ts);
+CREATE INDEX IF NOT EXISTS idx_operations_visitor ON operations (visitor_id, ts);
+CREATE INDEX IF NOT EXISTS idx_operations_property ON operations (property_id, ts);
+CREATE INDEX IF NOT EXISTS idx_operations_name ON operations (name, ts);
+CREATE INDEX IF NOT EXISTS idx_operations_ts ON operations (ts);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    controller TEXT,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    processed INTEGER NOT NULL,
+    created INTEGER NOT NULL,
+    updated INTEGER NOT NULL,
+    deleted INTEGER NOT NULL,
+    retries INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    deferred INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at);
+"""
+
+_INSERT_OPERATION = (
+    "INSERT INTO operations (ts, run_id, controller, action, status, name, reservation_id, "
+    "visitor_id, property_id, pin_changed, detail) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_RUN = (
+    "INSERT INTO runs (run_id, controller, started_at, finished_at, processed, created, "
+    "updated, deleted, retries, errors, deferred) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+@dataclass
+class AuditEntry:
+    """One recorded visitor operation."""
+    ts: float
+    run_id: Optional[str]
+    controller: Optional[str]
+    action: str
+    status: str
+    name: Optional[str]
+    reservation_id: Optional[str]
+    visitor_id: Optional[str]
+    property_id: Optional[str]
+    pin_changed: bool
+    detail: Optional[str]
+
+
+@dataclass
+class AuditRun:
+    """Summary of one controller's sync run."""
+    run_id: str
+    controller: Optional[str]
+    started_at: float
+    finished_at: float
+    processed: int
+    created: int
+    updated: int
+    deleted: int
+    retries: int
+    errors: int
+    deferred: int
+
+
+class AuditStore:
+    """Append-only audit log backed by SQLite.
+
+    Records are queued and written by a background thread in batched
+    transactions, so recording never waits on disk. Reads use their own
+    connection; the database runs in WAL mode so they do not block writes.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 1.0):
+        """Initialize audit store."""
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+        self._queue: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='audit-writer',
+                                        daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            running = True
+            while running:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if batch[-1] is None or remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                records = [item for item in batch if item is not None]
+                running = len(records) == len(batch)
+                try:
+                    with conn:
+                        conn.executemany(_INSERT_OPERATION,
+                                         [row for kind, row in records if kind == 'operation'])
+                        conn.executemany(_INSERT_RUN,
+                                         [row for kind, row in records if kind == 'run'])
+                except sqlite3.Error as e:
+                    print(f"⚠️ Failed to write {len(records)} audit records: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            conn.close()
+
+    def record_operation(self, operation: VisitorOperation, status: str,
+                         run_id: Optional[str] = None, controller: Optional[str] = None,
+                         visitor_id: Optional[str] = None, detail: Optional[str] = None) -> None:
+        """Queue a visitor operation and its outcome (ok, failed or deferred)."""
+        self._queue.put(('operation', (
+            time.time(), run_id, controller, operation.action, status, operation.name,
+            operation.reservation_id, visitor_id or operation.visitor_id,
+            operation.property_id, int(operation.pin_changed), detail
+        )))
+
+    def record_run(self, run_id: str, controller: Optional[str], started_at: float,
+                   result: SyncResult) -> None:
+        """Queue the summary of a controller's sync run."""
+        self._queue.put(('run', (
+            run_id, controller, started_at, time.time(), result.total_processed,
+            result.created, result.updated, result.deleted, result.retries,
+            len(result.errors), len(result.deferred)
+        )))
+
+    def flush(self) -> None:
+        """Block until every queued record is written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write remaining records and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def history(self, reservation_id: Optional[str] = None, visitor_id: Optional[str] = None,
+                property_id: Optional[str] = None, name: Optional[str] = None,
+                since: Optional[float] = None, until: Optional[float] = None,
+                limit: int = 100) -> List[AuditEntry]:
+        """Return matching operations, newest first.
+
+        A reservation's history includes later operations on the visitor it
+        created, such as the delete after check-out.
+        """
+        clauses = []
+        params: list = []
+        if reservation_id is not None:
+            clauses.append(
+                "(reservation_id = ? OR visitor_id IN (SELECT visitor_id FROM operations "
+                "WHERE reservation_id = ? AND visitor_id IS NOT NULL))"
+            )
+            params += [reservation_id, reservation_id]
+        if visitor_id is not None:
+            clauses.append("visitor_id = ?")
+            params.append(visitor_id)
+        if property_id is not None:
+            clauses.append("property_id = ?")
+            params.append(property_id)
+        if name is not None:
+            clauses.append("name = ?")
+            params.append(name)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (
+            "SELECT ts, run_id, controller, action, status, name, reservation_id, visitor_id, "
+            f"property_id, pin_changed, detail FROM operations {where} "
+            "ORDER BY ts DESC, id DESC LIMIT ?"
+        )
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params + [limit]).fetchall()
+        finally:
+            conn.close()
+        return [AuditEntry(*row[:9], bool(row[9]), row[10]) for row in rows]
+
+    def runs(self, since: Optional[float] = None, limit: int = 20) -> List[AuditRun]:
+        """Return recorded sync runs, newest first."""
+        query = (
+            "SELECT run_id, controller, started_at, finished_at, processed, created, updated, "
+            "deleted, retries, errors, deferred FROM runs"
+        )
+        params: list = []
+        if since is not None:
+            query += " WHERE started_at >= ?"
+            params.append(since)
+        query += " ORDER BY started_at DESC, id DESC LIMIT ?"
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params + [limit]).fetchall()
+        finally:
+            conn.close()
+        return [AuditRun(*row) for row in rows]
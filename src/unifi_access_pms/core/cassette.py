@@ -0,0 +1,210 @@
+"""Record and replay provider, controller and channel calls."""
+
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .models import Guest, Reservation, Visitor
+from .resilience import CircuitOpenError, RateLimitExceeded, TransientError
+
+CASSETTE_VERSION = 1
+
+PROVIDER_METHODS = ('get_reservations',)
+CONTROLLER_METHODS = ('get_visitors', 'create_visitor', 'update_visitor', 'delete_visitor')
+CHANNEL_METHODS = ('send_notification',)
+
+_DATACLASSES = {cls.__name__: cls for cls in (Guest, Reservation, Visitor)}
+_ERRORS = {cls.__name__: cls for cls in (TransientError, RateLimitExceeded, CircuitOpenError)}
+
+
+class CassetteMiss(Exception):
+    """Replay reached a call the cassette has no (more) recordings for."""
+
+
+class ReplayedError(Exception):
+    """A recorded failure whose original exception type is not known here."""
+
+
+def _encode(value: Any) -> Any:
+    """Convert call arguments and results into JSON-compatible values."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if is_dataclass(value) and type(value).__name__ in _DATACLASSES:
+        return {'__type__': type(value).__name__,
+                'fields': {f.name: _encode(getattr(value, f.name)) for f in fields(value)}}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _encode(item) for key, item in value.items()}
+    return repr(value)
+
+
+def _decode(value: Any) -> Any:
+    """Rebuild values written by ``_encode``."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        if '__datetime__' in value:
+            return datetime.fromisoformat(value['__datetime__'])
+        if '__type__' in value:
+            cls = _DATACLASSES[value['__type__']]
+            return cls(**{key: _decode(item) for key, item in value['fields'].items()})
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+def _rebuild_error(error: Dict[str, Any]) -> Exception:
+    cls = _ERRORS.get(error['type'])
+    if cls is RateLimitExceeded:
+        return RateLimitExceeded(error['message'], error.get('retry_after'))
+    if cls is not None:
+        return cls(error['message'])
+    return ReplayedError(f"{error['type']}: {error['message']}")
+
+
+class CassetteProxy:
+    """Stands in for a provider, controller client or channel.
+
+    Calls to ``methods`` go through the cassette; any other attribute is
+    read from the wrapped object (absent while replaying without one).
+    """
+
+    def __init__(self, target: Any, cassette: 'Cassette', component: str,
+                 methods: Sequence[str]):
+        """Initialize cassette proxy."""
+        self._target = target
+        self._cassette = cassette
+        self._component = component
+        self._methods = set(methods)
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in self._methods:
+            return getattr(self._target, name)
+
+        def call(*args, **kwargs):
+            func = getattr(self._target, name) if self._target is not None else None
+            return self._cassette.call(self._component, name, func, args, kwargs)
+        return call
+
+
+class Cassette:
+    """A file of recorded calls with their arguments, results and timings.
+
+    In record mode every wrapped call is forwarded and logged. In replay mode
+    nothing is forwarded: each call returns (or raises) the next recording
+    for the same component and method, so a run with the same inputs takes
+    the same path. With ``realtime`` replay sleeps for each call's recorded
+    duration, reproducing the original latency profile offline.
+    """
+
+    def __init__(self, path: str, replaying: bool = False, realtime: bool = False,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize cassette."""
+        self.path = path
+        self.replaying = replaying
+        self.realtime = realtime
+        self.meta: Dict[str, Any] = {}
+        self.interactions: List[Dict[str, Any]] = []
+        self._clock = clock
+        self._sleep = sleep
+        self._origin = clock()
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = defaultdict(deque)
+
+        if replaying:
+            self._load()
+
+    @classmethod
+    def record(cls, path: str) -> 'Cassette':
+        """Open a cassette for recording to ``path``."""
+        return cls(path)
+
+    @classmethod
+    def replay(cls, path: str, realtime: bool = False) -> 'Cassette':
+        """Load a recorded cassette for replay."""
+        return cls(path, replaying=True, realtime=realtime)
+
+    def _open(self, mode: str):
+        if self.path.endswith('.gz'):
+            return gzip.open(self.path, mode + 't', encoding='utf-8')
+        return open(self.path, mode, encoding='utf-8')
+
+    def _load(self) -> None:
+        with self._open('r') as f:
+            data = json.load(f)
+        if data.get('version') != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {self.path}")
+        self.meta = data.get('meta', {})
+        self.interactions = data['interactions']
+        for interaction in self.interactions:
+            self._queues[(interaction['component'], interaction['method'])].append(interaction)
+
+    def save(self) -> None:
+        """Write the recorded calls."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {'version': CASSETTE_VERSION, 'meta': self.meta,
+                    'interactions': list(self.interactions)}
+        with self._open('w') as f:
+            json.dump(data, f)
+
+    def wrap(self, target: Any, component: str, methods: Sequence[str]) -> CassetteProxy:
+        """Route ``methods`` of ``target`` through this cassette."""
+        return CassetteProxy(target, self, component, methods)
+
+    def call(self, component: str, method: str, func: Optional[Callable], args: tuple,
+             kwargs: Dict[str, Any]) -> Any:
+        """Record a call to ``func`` or replay the next recorded one."""
+        if self.replaying:
+            return self._replay(component, method)
+
+        started = self._clock()
+        interaction: Dict[str, Any] = {
+            'component': component,
+            'method': method,
+            'args': _encode(list(args)),
+            'kwargs': _encode(kwargs),
+            'started': started - self._origin,
+        }
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            interaction['error'] = {'type': type(e).__name__, 'message': str(e),
+                                    'retry_after': getattr(e, 'retry_after', None)}
+            raise
+        else:
+            interaction['result'] = _encode(result)
+            return result
+        finally:
+            interaction['duration'] = self._clock() - started
+            with self._lock:
+                self.interactions.append(interaction)
+
+    def _replay(self, component: str, method: str) -> Any:
+        with self._lock:
+            queue = self._queues.get((component, method))
+            if not queue:
+                raise CassetteMiss(f"No recorded {method} call left for {component}")
+            interaction = queue.popleft()
+
+        if self.realtime:
+            self._sleep(interaction.get('duration', 0.0))
+        if 'error' in interaction:
+            raise _rebuild_error(interaction['error'])
+        return _decode(interaction.get('result'))
+
+    def unused(self) -> int:
+        """Recorded calls that a replay never consumed."""
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
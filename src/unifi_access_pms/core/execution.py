@@ -0,0 +1,309 @@
+"""Provider execution layer with retries, deadlines and priority failover."""
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+from ..config.models import Config, ProviderConfig
+from .interfaces import ReservationProvider
+from .models import Reservation
+from .profiling import traced
+from .registry import ProviderRegistry
+from .resilience import backoff_delay
+from .snapshots import SnapshotStore
+
+
+class ProviderError(Exception):
+    """A provider could not deliver reservations within its budget."""
+
+
+def _overlaps(reservation: Reservation, start_date: datetime, end_date: datetime) -> bool:
+    """Return True if a reservation overlaps the window (or cannot be compared)."""
+    try:
+        return reservation.check_out >= start_date and reservation.check_in <= end_date
+    except TypeError:
+        # Mixed naive/aware datetimes: keep the reservation rather than drop a guest
+        return True
+
+
+@dataclass
+class ProviderStats:
+    """Attempt counts and latencies recorded for one provider."""
+    attempts: int = 0
+    successes: int = 0
+    failures: int = 0
+    deadline_misses: int = 0
+    latencies: List[float] = field(default_factory=list)
+    last_error: Optional[str] = None
+
+    @property
+    def avg_latency(self) -> float:
+        """Average call latency in seconds."""
+        if not self.latencies:
+            return 0.0
+        return sum(self.latencies) / len(self.latencies)
+
+
+class ProviderExecutor:
+    """Runs providers with retries, per-provider deadlines and failover.
+
+    Each call to a provider is retried with jittered exponential backoff up to
+    ``ProviderConfig.retry_attempts`` times, all within ``ProviderConfig.timeout``.
+    Providers whose ``property_mappings`` share a door group form a failover
+    group. Every provider in a group is fetched, so duplicate stays can be
+    resolved by priority afterwards (``ReservationMerger``); failover only
+    matters when providers fail, and works per door group.
+
+    With a ``SnapshotStore``, every successful fetch is persisted. A failed
+    provider is served from its snapshot if it is younger than
+    ``max_staleness`` seconds and refreshed in the background. Providers
+    served this way, or missing altogether, are listed in ``stale`` so
+    callers can hold back destructive changes.
+    """
+
+    def __init__(self, providers: Dict[str, ReservationProvider],
+                 configs: Optional[Dict[str, ProviderConfig]] = None,
+                 default_deadline: float = 60.0,
+                 snapshots: Optional[SnapshotStore] = None,
+                 max_staleness: float = 86400.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize provider executor."""
+        self.providers = providers
+        self.configs = configs or {}
+        self.default_deadline = default_deadline
+        self.snapshots = snapshots
+        self.max_staleness = max_staleness
+        self.stats: Dict[str, ProviderStats] = {name: ProviderStats() for name in providers}
+        self.stale: Set[str] = set()
+        self._clock = clock
+        self._sleep = sleep
+        self._refreshing: Dict[str, Future] = {}
+        # Room for calls that overran their deadline plus background refreshes
+        self._pool = ThreadPoolExecutor(max_workers=max(2, 2 * len(providers)),
+                                        thread_name_prefix='provider')
+
+    @classmethod
+    def from_config(cls, config: Config, names: List[str]) -> 'ProviderExecutor':
+        """Instantiate the named providers from configuration."""
+        all_configs = config.providers or {}
+        providers = {}
+        configs = {}
+        for name in names:
+            provider_config = all_configs.get(name, ProviderConfig())
+            if not provider_config.enabled:
+                continue
+            provider_class = ProviderRegistry.get_provider(name)
+            providers[name] = provider_class(provider_config.config)
+            configs[name] = provider_config
+
+        core = config.core
+        if core and core.snapshot_dir:
+            return cls(providers, configs, snapshots=SnapshotStore(core.snapshot_dir),
+                       max_staleness=core.max_snapshot_staleness)
+        return cls(providers, configs)
+
+    def set_provider(self, name: str, provider: ReservationProvider,
+                     provider_config: ProviderConfig) -> None:
+        """Add or replace a provider, keeping the stats of the others."""
+        self.providers[name] = provider
+        self.configs[name] = provider_config
+        self.stats[name] = ProviderStats()
+
+    def remove_provider(self, name: str) -> None:
+        """Stop using a provider."""
+        self.providers.pop(name, None)
+        self.configs.pop(name, None)
+        self.stats.pop(name, None)
+
+    def close(self) -> None:
+        """Release worker threads without waiting for stragglers."""
+        self._pool.shutdown(wait=False)
+
+    def _config(self, name: str) -> ProviderConfig:
+        return self.configs.get(name) or ProviderConfig()
+
+    def _mappings(self, name: str) -> Dict[str, str]:
+        mappings = self._config(name).config.get('property_mappings') or {}
+        return {str(key): str(value) for key, value in mappings.items() if value is not None}
+
+    def _properties(self, name: str) -> Set[str]:
+        return set(self._mappings(name).values())
+
+    def _needed(self, name: str, covered: Set[str]) -> bool:
+        """True if the provider serves a door group no live fetch delivered."""
+        properties = self._properties(name)
+        return not properties or bool(properties - covered)
+
+    def failover_groups(self) -> List[List[str]]:
+        """Group providers that describe the same property, primary first."""
+        groups: List[List[str]] = []
+        group_properties: List[Set[str]] = []
+
+        for name in self.providers:
+            properties = self._properties(name)
+            merged = [i for i, props in enumerate(group_properties) if props & properties]
+            group = [name]
+            for i in reversed(merged):
+                group.extend(groups.pop(i))
+                properties |= group_properties.pop(i)
+            groups.append(group)
+            group_properties.append(properties)
+
+        return [sorted(group, key=lambda n: -self._config(n).priority) for group in groups]
+
+    def fetch(self, name: str, start_date: datetime, end_date: datetime) -> List[Reservation]:
+        """Fetch from one provider, retrying within its deadline."""
+        provider = self.providers[name]
+        provider_config = self._config(name)
+        stats = self.stats[name]
+        deadline = provider_config.timeout or self.default_deadline
+        deadline_at = self._clock() + deadline
+        attempt = 0
+
+        while True:
+            remaining = deadline_at - self._clock()
+            if remaining <= 0:
+                stats.deadline_misses += 1
+                raise ProviderError(f"{name} missed its {deadline}s deadline")
+
+            stats.attempts += 1
+            started = self._clock()
+            future = self._pool.submit(traced('provider', name, provider.get_reservations),
+                                       start_date, end_date)
+            try:
+                reservations = list(future.result(timeout=remaining))
+            except FuturesTimeout:
+                stats.latencies.append(self._clock() - started)
+                stats.failures += 1
+                stats.deadline_misses += 1
+                stats.last_error = "deadline exceeded"
+                # Let the slow call finish in the background and refresh the snapshot
+                future.add_done_callback(lambda f: self._save_late_result(name, f))
+                raise ProviderError(f"{name} missed its {deadline}s deadline")
+            except ImportError as e:
+                stats.failures += 1
+                stats.last_error = str(e)
+                raise ProviderError(f"{name} is unavailable: {e}") from e
+            except Exception as e:
+                stats.latencies.append(self._clock() - started)
+                stats.failures += 1
+                stats.last_error = str(e)
+                if attempt >= provider_config.retry_attempts:
+                    raise ProviderError(f"{name} failed after {attempt + 1} attempts: {e}") from e
+                delay = backoff_delay(attempt, provider_config.retry_delay)
+                self._sleep(min(delay, max(0.0, deadline_at - self._clock())))
+                attempt += 1
+                continue
+
+            stats.latencies.append(self._clock() - started)
+            stats.successes += 1
+            self._save_snapshot(name, reservations)
+            for reservation in reservations:
+                reservation.provider = name
+            return reservations
+
+    def _save_snapshot(self, name: str, reservations: List[Reservation]) -> None:
+        if self.snapshots is None:
+            return
+        try:
+            self.snapshots.save(name, reservations)
+        except OSError as e:
+            print(f"⚠️ Failed to save snapshot for {name}: {e}")
+
+    def _save_late_result(self, name: str, future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._save_snapshot(name, list(future.result()))
+
+    def _refresh(self, name: str, start_date: datetime, end_date: datetime) -> None:
+        """Background revalidation after serving a stale snapshot."""
+        try:
+            reservations = list(self.providers[name].get_reservations(start_date, end_date))
+        except Exception as e:
+            print(f"⚠️ Background refresh of {name} failed: {e}")
+            return
+        self._save_snapshot(name, reservations)
+
+    def _serve_stale(self, name: str, start_date: datetime,
+                     end_date: datetime) -> Optional[List[Reservation]]:
+        """Return the provider's snapshot if usable, scheduling a refresh."""
+        if self.snapshots is None:
+            return None
+
+        snapshot = self.snapshots.load(name)
+        if snapshot is None or snapshot.age > self.max_staleness:
+            return None
+
+        print(f"⚠️ Using {snapshot.age:.0f}s old snapshot for {name}")
+        self.stale.add(name)
+        refresh = self._refreshing.get(name)
+        if refresh is None or refresh.done():
+            self._refreshing[name] = self._pool.submit(
+                self._refresh, name, start_date, end_date)
+        reservations = [r for r in snapshot.reservations
+                        if _overlaps(r, start_date, end_date)]
+        for reservation in reservations:
+            reservation.provider = name
+        return reservations
+
+    def fetch_group(self, group: List[str], start_date: datetime,
+                    end_date: datetime) -> List[Reservation]:
+        """Fetch every provider of a failover group concurrently.
+
+        All live results are returned, duplicates included. A failed provider
+        is served from its snapshot, since it may know stays no other provider
+        does. Without one it is marked stale if the rest of the group covers
+        its door groups, and the group fails otherwise.
+        """
+        covered: Set[str] = set()
+        reservations: List[Reservation] = []
+        failed = []
+        with ThreadPoolExecutor(max_workers=len(group),
+                                thread_name_prefix='provider-fetch') as pool:
+            futures = [(name, pool.submit(self.fetch, name, start_date, end_date))
+                       for name in group]
+            for name, future in futures:
+                try:
+                    reservations.extend(future.result())
+                except ProviderError as e:
+                    failed.append((name, str(e)))
+                    print(f"⚠️ Provider {e}")
+                    continue
+                covered |= self._properties(name)
+
+        missing = []
+        for name, error in failed:
+            stale = self._serve_stale(name, start_date, end_date)
+            if stale is None:
+                missing.append((name, error))
+                continue
+            reservations.extend(stale)
+            covered |= self._properties(name)
+
+        errors = []
+        for name, error in missing:
+            if self._needed(name, covered):
+                errors.append(error)
+                continue
+            # Its door groups are served, but stays only it knows about are not
+            print(f"⚠️ No snapshot for {name}; relying on the rest of its failover group")
+            self.stale.add(name)
+
+        if errors:
+            raise ProviderError("; ".join(errors))
+        return reservations
+
+    def fetch_all(self, start_date: datetime, end_date: datetime) -> List[Reservation]:
+        """Fetch reservations from every failover group.
+
+        Raises ``ProviderError`` if any group produced no data, since syncing a
+        partial picture would delete visitors for the missing properties.
+        """
+        self.stale = set()
+        reservations: List[Reservation] = []
+        for group in self.failover_groups():
+            reservations.extend(self.fetch_group(group, start_date, end_date))
+        return reservations
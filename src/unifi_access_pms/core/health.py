@@ -0,0 +1,99 @@
+"""Concurrent health probes for providers, controllers and channels."""
+
+import math
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+
+@dataclass
+class ProbeTarget:
+    """Something to probe: one provider, controller or channel."""
+    kind: str  # 'provider', 'controller' or 'channel'
+    name: str
+    probe: Callable[[], Any]
+
+
+@dataclass
+class ProbeReport:
+    """Outcome of probing one target."""
+    kind: str
+    name: str
+    probes: int
+    latencies: List[float] = field(default_factory=list)
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True if every probe succeeded."""
+        return not self.failures and len(self.latencies) == self.probes
+
+    @property
+    def p50(self) -> Optional[float]:
+        """Median latency of successful probes in seconds."""
+        return percentile(self.latencies, 50)
+
+    @property
+    def p95(self) -> Optional[float]:
+        """95th percentile latency of successful probes in seconds."""
+        return percentile(self.latencies, 95)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, or None without values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def probe_all(targets: List[ProbeTarget], probes: int = 3,
+              timeout: float = 10.0) -> List[ProbeReport]:
+    """Probe every target ``probes`` times, all targets concurrently.
+
+    Each round probes every healthy target at once, each probe on its own
+    daemon thread so a hung call never keeps the process alive. A probe that
+    raises, or returns False, counts as a failure; one that runs past
+    ``timeout`` seconds also drops its target from later rounds, since its
+    thread may still be stuck on the call.
+    """
+    reports = [ProbeReport(t.kind, t.name, probes) for t in targets]
+    alive = list(range(len(targets)))
+
+    def timed(i: int, outcomes: queue.Queue) -> None:
+        started = time.perf_counter()
+        try:
+            if targets[i].probe() is False:
+                raise RuntimeError("reported failure")
+        except Exception as e:
+            outcomes.put((i, None, str(e) or type(e).__name__))
+        else:
+            outcomes.put((i, time.perf_counter() - started, None))
+
+    for _ in range(probes):
+        if not alive:
+            break
+        # A fresh queue per round, so a straggler never answers for a later one
+        outcomes: queue.Queue = queue.Queue()
+        for i in alive:
+            threading.Thread(target=timed, args=(i, outcomes), name=f'probe-{targets[i].name}',
+                             daemon=True).start()
+        deadline = time.monotonic() + timeout
+        waiting = set(alive)
+        while waiting:
+            try:
+                i, latency, error = outcomes.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            waiting.discard(i)
+            if error is None:
+                reports[i].latencies.append(latency)
+            else:
+                reports[i].failures.append(error)
+        for i in sorted(waiting):
+            reports[i].failures.append(f"timed out after {timeout:g}s")
+            alive.remove(i)
+    return reports
@@ -56,4 +56,64 @@ class UniFiAccessIntegration(ABC):
     @abstractmethod
     def delete_visitor(self, visitor_id: str) -> bool:
         """Delete a visitor."""
-        pass
\ No newline at end of file
+        pass
+
+
+class AsyncReservationProvider(ABC):
+    """Abstract base class for asyncio-native reservation providers."""
+    
+    @abstractmethod
+    async def get_reservations(self, start_date: datetime, end_date: datetime) -> List[Reservation]:
+        """Fetch reservations for the given date range."""
+        pass
+    
+    @abstractmethod
+    def validate_config(self, config: Dict[str, Any]) -> bool:
+        """Validate provider configuration."""
+        pass
+    
+    async def close(self) -> None:
+        """Release network resources."""
+        pass
+
+
+class AsyncNotificationChannel(ABC):
+    """Abstract base class for asyncio-native notification channels."""
+    
+    @abstractmethod
+    async def send_notification(self, message: str, **kwargs) -> bool:
+        """Send a notification message."""
+        pass
+    
+    @abstractmethod
+    def validate_config(self, config: Dict[str, Any]) -> bool:
+        """Validate channel configuration."""
+        pass
+    
+    async def close(self) -> None:
+        """Release network resources."""
+        pass
+
+
+class AsyncUniFiAccessIntegration(ABC):
+    """Abstract base class for asyncio-native UniFi Access integration."""
+    
+    @abstractmethod
+    async def get_visitors(self) -> List[Visitor]:
+        """Get all current visitors."""
+        pass
+    
+    @abstractmethod
+    async def create_visitor(self, visitor: Visitor) -> str:
+        """Create a new visitor and return the visitor ID."""
+        pass
+    
+    @abstractmethod
+    async def update_visitor(self, visitor_id: str, visitor: Visitor) -> bool:
+        """Update an existing visitor."""
+        pass
+    
+    @abstractmethod
+    async def delete_visitor(self, visitor_id: str) -> bool:
+        """Delete a visitor."""
+        pass
@@ -0,0 +1,119 @@
+"""Write-ahead journal of planned visitor operations."""
+
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from .models import VisitorOperation
+
+
+@dataclass
+class PendingOperation:
+    """An operation from an interrupted run that still has to be applied."""
+    operation: VisitorOperation
+    # Started but not confirmed: the write may or may not have reached the controller
+    in_doubt: bool = False
+
+
+class OperationJournal:
+    """Append-only JSON-lines journal for one controller.
+
+    A run writes its whole plan before touching the controller, then appends
+    a ``start`` and a ``done`` record around every operation; each record is
+    fsynced. A run that gets through its plan removes the file (writes it
+    deferred are re-planned by the next run), so a journal found on disk
+    belongs to a run that crashed, and ``pending`` returns the work it left
+    unfinished.
+    """
+
+    def __init__(self, path: str, max_age: float = 3600.0):
+        """Initialize operation journal."""
+        self.path = Path(path)
+        self.max_age = max_age
+        self._file = None
+
+    @classmethod
+    def for_controller(cls, directory: str, controller: str,
+                       max_age: float = 3600.0) -> 'OperationJournal':
+        """Journal stored under ``directory`` for a controller name or host."""
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', controller)
+        return cls(os.path.join(directory, f"{safe_name}.journal"), max_age)
+
+    def _append(self, record: dict) -> None:
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def pending(self) -> Optional[List[PendingOperation]]:
+        """Return unfinished operations of an interrupted run, or None."""
+        if not self.path.exists():
+            return None
+
+        plan = None
+        started = set()
+        done = set()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn final write from the crash
+                    break
+                if record['type'] == 'plan':
+                    plan = record
+                elif record['type'] == 'start':
+                    started.add(record['key'])
+                elif record['type'] == 'done':
+                    done.add(record['key'])
+
+        if plan is None or time.time() - plan['created'] > self.max_age:
+            print(f"⚠️ Discarding outdated operation journal {self.path}")
+            self.clear()
+            return None
+
+        operations = [VisitorOperation.from_dict(op) for op in plan['operations']]
+        return [PendingOperation(op, in_doubt=op.key in started)
+                for op in operations if op.key not in done]
+
+    def begin(self, operations: List[VisitorOperation]) -> None:
+        """Record the full plan before any operation is executed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.close()
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'type': 'plan',
+                'created': time.time(),
+                'operations': [op.to_dict() for op in operations],
+            }, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def start(self, operation: VisitorOperation) -> None:
+        """Record that an operation is about to be sent."""
+        self._append({'type': 'start', 'key': operation.key})
+
+    def done(self, operation: VisitorOperation) -> None:
+        """Record that an operation has completed (or needs no retry)."""
+        self._append({'type': 'done', 'key': operation.key})
+
+    def close(self) -> None:
+        """Close the journal file handle."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self) -> None:
+        """Remove the journal after the run finished."""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
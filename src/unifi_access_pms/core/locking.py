@@ -0,0 +1,166 @@
+"""Cross-process single-flight locking with request coalescing."""
+
+import hashlib
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+def default_lock_dir() -> str:
+    """Shared lock directory, independent of the working directory."""
+    return os.path.join(tempfile.gettempdir(), 'unifi-access-pms')
+
+
+def _normalize_host(host: str) -> str:
+    """Reduce a controller URL or address to a comparable host name."""
+    host = re.sub(r'^[a-z]+://', '', host.strip().lower())
+    return host.rstrip('/')
+
+
+def sync_scope(controllers: Iterable[str], properties: Iterable[str] = ()) -> str:
+    """Build a lock scope from controller hosts and property IDs."""
+    hosts = ','.join(sorted(_normalize_host(host) for host in controllers))
+    props = ','.join(sorted(str(p) for p in properties)) or '*'
+    return f"{hosts}|{props}"
+
+
+def controller_scopes(controllers: Iterable[str]) -> List[str]:
+    """One lock scope per controller host, as the legacy script uses."""
+    return sorted({sync_scope([host]) for host in controllers})
+
+
+class SingleFlight:
+    """Runs at most one sync per scope across processes and coalesces the rest.
+
+    The first caller takes an exclusive file lock and runs. A caller that
+    finds the lock held leaves a "pending" marker and returns immediately;
+    before releasing the lock, the holder checks the marker and runs exactly
+    one follow-up, however many requests arrived in the meantime.
+
+    ``scope`` may also be a list, normally one scope per controller: a run
+    then holds every one of those locks, taken in sorted order so callers
+    with overlapping sets never deadlock, and any held lock coalesces the
+    request into its holder's follow-up.
+    """
+
+    def __init__(self, scope: Union[str, Iterable[str]], lock_dir: Optional[str] = None):
+        """Initialize single-flight lock."""
+        self.scopes = [scope] if isinstance(scope, str) else sorted(set(scope))
+        self.scope = ' + '.join(self.scopes)
+        self.lock_dir = Path(lock_dir or default_lock_dir())
+        self.lock_paths: List[Path] = []
+        self.pending_paths: List[Path] = []
+        for name in self.scopes:
+            slug = re.sub(r'[^A-Za-z0-9]+', '-', name).strip('-')[:40]
+            digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:12]
+            self.lock_paths.append(self.lock_dir / f"{slug}-{digest}.lock")
+            self.pending_paths.append(self.lock_dir / f"{slug}-{digest}.pending")
+        self._fds: List[int] = []
+
+    def _lock(self, path: Path, blocking: bool) -> bool:
+        fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:  # pragma: no cover - Windows
+                msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            if blocking:
+                raise
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode('ascii'))
+        self._fds.append(fd)
+        return True
+
+    def _try_acquire(self, blocking: bool = False) -> bool:
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            for path in self.lock_paths:
+                if not self._lock(path, blocking):
+                    self._release()
+                    return False
+        except BaseException:
+            self._release()
+            raise
+        return True
+
+    def _release(self) -> None:
+        while self._fds:
+            fd = self._fds.pop()
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:  # pragma: no cover - Windows
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(fd)
+
+    def _take_pending(self) -> bool:
+        taken = False
+        for path in self.pending_paths:
+            try:
+                path.unlink()
+                taken = True
+            except FileNotFoundError:
+                pass
+        return taken
+
+    def _pending(self) -> bool:
+        return any(path.exists() for path in self.pending_paths)
+
+    def request(self) -> bool:
+        """Ask for a run; return True if this caller now holds the lock."""
+        if self._try_acquire():
+            return True
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        for path in self.pending_paths:
+            path.touch()
+        # The holder may have released between our attempt and the marker
+        return self._try_acquire()
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        """Hold the lock for a short write, waiting for any run to finish.
+
+        Requests coalesced meanwhile are left pending for the next ``run``.
+        """
+        self._try_acquire(blocking=True)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def run(self, func: Callable[[], object]) -> int:
+        """Run ``func`` under the lock; return how many times it ran (0 if coalesced)."""
+        if not self.request():
+            return 0
+
+        runs = 0
+        while True:
+            try:
+                self._take_pending()
+                func()
+                runs += 1
+                if self._pending():
+                    continue
+            except BaseException:
+                self._release()
+                raise
+
+            self._release()
+            # A request may have landed between the last check and the release
+            if not self._pending() or not self._try_acquire():
+                return runs
@@ -0,0 +1,110 @@
+"""Cross-provider reservation merging and deduplication."""
+
+import re
+from dataclasses import replace
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from ..config.models import ProviderConfig
+from .models import Reservation
+
+# Names calendar feeds use when they do not expose the guest
+PLACEHOLDER_NAMES = {'', 'reserved', 'not available', 'airbnb not available', 'blocked', 'guest'}
+
+
+def _normalize_name(reservation: Reservation) -> str:
+    """Lowercased guest name with punctuation and extra spaces removed."""
+    name = re.sub(r'[^a-z0-9 ]', ' ', reservation.guest_name.lower())
+    return ' '.join(name.split())
+
+
+def _phone_suffix(phone: Optional[str], length: int = 4) -> str:
+    """Last digits of a phone number; feeds often only expose these."""
+    digits = ''.join(filter(str.isdigit, phone or ''))
+    return digits[-length:] if len(digits) >= length else ''
+
+
+def _day(value) -> Optional[date]:
+    return value.date() if value is not None else None
+
+
+class ReservationMerger:
+    """Collapses reservations that several providers report for the same stay.
+
+    Reservations are indexed by property and check-in/check-out dates, where
+    the property is the provider's ``property_mappings`` target (the door
+    group) if it has one so different providers' IDs line up. Within a slot,
+    two reservations are the same stay if their guest phone suffixes match,
+    or, lacking phones, their normalized names match or one is a placeholder
+    such as "Reserved". The record from the provider with the highest
+    ``ProviderConfig.priority`` wins; fields it lacks (phone, email, property
+    name) are filled from the others and every merged record is listed in
+    ``sources``.
+    """
+
+    def __init__(self, configs: Dict[str, ProviderConfig]):
+        """Initialize reservation merger."""
+        self.configs = configs
+        self.duplicates = 0
+
+    def _priority(self, reservation: Reservation) -> int:
+        provider_config = self.configs.get(reservation.provider or '')
+        return provider_config.priority if provider_config else 0
+
+    def _place(self, reservation: Reservation) -> str:
+        provider_config = self.configs.get(reservation.provider or '')
+        mappings = (provider_config.config.get('property_mappings') or {}) if provider_config else {}
+        return str(mappings.get(reservation.property_id, reservation.property_id))
+
+    def _slot(self, reservation: Reservation) -> Tuple[str, Optional[date], Optional[date]]:
+        return (self._place(reservation), _day(reservation.check_in), _day(reservation.check_out))
+
+    @staticmethod
+    def _same_guest(a: Reservation, b: Reservation) -> bool:
+        phone_a, phone_b = _phone_suffix(a.guest.phone), _phone_suffix(b.guest.phone)
+        if phone_a and phone_b:
+            return phone_a == phone_b
+        name_a, name_b = _normalize_name(a), _normalize_name(b)
+        return name_a == name_b or name_a in PLACEHOLDER_NAMES or name_b in PLACEHOLDER_NAMES
+
+    def merge(self, reservations: List[Reservation]) -> List[Reservation]:
+        """Return one reservation per stay, in first-seen order."""
+        slots: Dict[Tuple[str, Optional[date], Optional[date]], List[List[Reservation]]] = {}
+        stays: List[List[Reservation]] = []
+
+        for reservation in reservations:
+            candidates = slots.setdefault(self._slot(reservation), [])
+            stay = next((s for s in candidates
+                         if all(r.provider != reservation.provider for r in s)
+                         and self._same_guest(s[0], reservation)), None)
+            if stay is None:
+                stay = []
+                candidates.append(stay)
+                stays.append(stay)
+            stay.append(reservation)
+
+        self.duplicates = len(reservations) - len(stays)
+        return [self._resolve(stay) for stay in stays]
+
+    def _resolve(self, stay: List[Reservation]) -> Reservation:
+        """Pick the highest priority record and fill its gaps from the rest."""
+        ranked = sorted(stay, key=self._priority, reverse=True)
+        winner = ranked[0]
+        sources = [f"{r.provider}:{r.id}" if r.provider else r.id for r in stay]
+        if len(stay) == 1:
+            winner.sources = sources
+            return winner
+
+        guest = winner.guest
+        for other in ranked[1:]:
+            guest = replace(guest, phone=guest.phone or other.guest.phone,
+                            email=guest.email or other.guest.email)
+        if _normalize_name(winner) in PLACEHOLDER_NAMES:
+            named = next((r for r in ranked if _normalize_name(r) not in PLACEHOLDER_NAMES), None)
+            if named is not None:
+                guest = replace(guest, first_name=named.guest.first_name,
+                                last_name=named.guest.last_name)
+        property_name = winner.property_name or next(
+            (r.property_name for r in ranked if r.property_name), None)
+
+        return replace(winner, guest=guest, property_name=property_name, sources=sources)
@@ -1,8 +1,8 @@
 """Core data models for UniFi Access PMS."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 
 
 @dataclass
@@ -24,6 +24,10 @@ class Reservation:
     status: str
     property_id: str
     property_name: Optional[str] = None
+    # Provider that reported the reservation and, after merging, every
+    # "provider:id" record that described the same stay
+    provider: Optional[str] = None
+    sources: List[str] = field(default_factory=list)
     
     @property
     def guest_name(self) -> str:
@@ -56,16 +60,84 @@ class SyncResult:
     created: int = 0
     updated: int = 0
     deleted: int = 0
+    retries: int = 0
     errors: List[str] = None
+    deferred: List[str] = None
     
     def __post_init__(self):
         if self.errors is None:
             self.errors = []
+        if self.deferred is None:
+            self.deferred = []
     
     @property
     def success_rate(self) -> float:
         """Calculate success rate as a percentage."""
         if self.total_processed == 0:
             return 100.0
+        # Deferred writes are retried on the next run, so only hard errors count
         failed = len(self.errors)
-        return ((self.total_processed - failed) / self.total_processed) * 100
\ No newline at end of file
+        return ((self.total_processed - failed) / self.total_processed) * 100
+
+
+@dataclass
+class VisitorOperation:
+    """A planned create, update or delete of a UniFi Access visitor."""
+    action: str
+    name: str
+    visitor_id: Optional[str] = None
+    visitor: Optional[Visitor] = None
+    reservation_id: Optional[str] = None
+    property_id: Optional[str] = None
+    pin_changed: bool = False
+    # When the write must land: check-in for creates and updates, the
+    # visitor's start for deletes; orders writes by urgency
+    deadline: Optional[datetime] = None
+    
+    @property
+    def key(self) -> str:
+        """Idempotency key for journaling."""
+        return f"{self.action}:{self.reservation_id or self.visitor_id or self.name}"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the operation journal."""
+        data: Dict[str, Any] = {
+            'action': self.action,
+            'name': self.name,
+            'visitor_id': self.visitor_id,
+            'reservation_id': self.reservation_id,
+            'property_id': self.property_id,
+            'pin_changed': self.pin_changed,
+            'deadline': self.deadline.isoformat() if self.deadline else None,
+        }
+        if self.visitor is not None:
+            data['visitor'] = {
+                'name': self.visitor.name,
+                'start_time': self.visitor.start_time.isoformat() if self.visitor.start_time else None,
+                'end_time': self.visitor.end_time.isoformat() if self.visitor.end_time else None,
+                'pin': self.visitor.pin,
+            }
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'VisitorOperation':
+        """Deserialize from the operation journal."""
+        visitor = None
+        visitor_data = data.get('visitor')
+        if visitor_data:
+            visitor = Visitor(
+                name=visitor_data['name'],
+                start_time=datetime.fromisoformat(visitor_data['start_time']) if visitor_data['start_time'] else None,
+                end_time=datetime.fromisoformat(visitor_data['end_time']) if visitor_data['end_time'] else None,
+                pin=visitor_data['pin']
+            )
+        return cls(
+            action=data['action'],
+            name=data['name'],
+            visitor_id=data.get('visitor_id'),
+            visitor=visitor,
+            reservation_id=data.get('reservation_id'),
+            property_id=data.get('property_id'),
+            pin_changed=data.get('pin_changed', False),
+            deadline=datetime.fromisoformat(data['deadline']) if data.get('deadline') else None
+        )
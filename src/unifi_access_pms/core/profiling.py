@@ -0,0 +1,180 @@
+"""Opt-in profiling: cProfile statistics plus a wall-clock call trace."""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Shared no-op context manager returned by ``span`` while profiling is off
+_NULL_SPAN = nullcontext()
+
+_tracer: Optional['Tracer'] = None
+
+
+class Tracer:
+    """Collects complete ("X") events in the Chrome trace event format.
+
+    The JSON written by ``dump`` loads in chrome://tracing, Perfetto and
+    speedscope, which render it as a per-thread flame chart.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """Initialize tracer."""
+        self._clock = clock
+        self._origin = clock()
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, category: str, name: str, started: float, finished: float,
+               args: Optional[Dict[str, Any]] = None) -> None:
+        """Record one call that ran from ``started`` to ``finished``."""
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (started - self._origin) * 1e6,
+            'dur': (finished - started) * 1e6,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            self._events.append(event)
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """Recorded events in completion order."""
+        with self._lock:
+            return list(self._events)
+
+    def dump(self, path: str) -> None:
+        """Write the trace as JSON, naming each thread."""
+        names = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': thread.ident,
+             'args': {'name': thread.name}}
+            for thread in threading.enumerate()
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': names + self.events, 'displayTimeUnit': 'ms'}, f)
+
+
+class _Span:
+    def __init__(self, tracer: Tracer, category: str, name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.category = category
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.started = self.tracer._clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        args = self.args
+        if exc_type is not None:
+            args = {**args, 'error': exc_type.__name__}
+        self.tracer.record(self.category, self.name, self.started, self.tracer._clock(), args)
+        return False
+
+
+def span(category: str, name: str, **args: Any):
+    """Context manager timing a provider, controller or channel call.
+
+    Returns a shared no-op context when profiling is off, so instrumented
+    code pays one global lookup per call.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, category, name, args)
+
+
+def traced(category: str, name: str, func: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``func`` in a span if profiling is on, else return it unchanged."""
+    if _tracer is None:
+        return func
+
+    def wrapper(*args, **kwargs):
+        with span(category, name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class Profiler:
+    """Profiles everything run between ``start`` and ``stop``.
+
+    Writes ``<prefix>.pstats`` (load with ``python -m pstats`` or snakeviz)
+    and ``<prefix>.trace.json`` with the wall-clock span of every provider,
+    controller and channel call. Before Python 3.12 cProfile only sees the
+    thread that enabled it, so each thread started while profiling gets its
+    own profile and the statistics are merged on ``stop``.
+    """
+
+    def __init__(self, prefix: str):
+        """Initialize profiler."""
+        self.prefix = prefix
+        self.tracer = Tracer()
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def _new_profile(self) -> cProfile.Profile:
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+    def _profile_thread(self, frame, event, arg) -> None:
+        # Runs once per new thread, then hands the thread over to cProfile
+        sys.setprofile(None)
+        self._new_profile().enable()
+
+    def start(self) -> None:
+        """Install the tracer and start profiling."""
+        global _tracer
+        _tracer = self.tracer
+        if sys.version_info < (3, 12):
+            threading.setprofile(self._profile_thread)
+        self._new_profile().enable()
+
+    def stop(self) -> List[str]:
+        """Stop profiling, write the outputs and return their paths."""
+        global _tracer
+        _tracer = None
+        threading.setprofile(None)
+        with self._lock:
+            profiles = list(self._profiles)
+        for profile in profiles:
+            profile.disable()
+
+        directory = os.path.dirname(self.prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        stats_path = f"{self.prefix}.pstats"
+        trace_path = f"{self.prefix}.trace.json"
+
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            try:
+                stats.add(profile)
+            except TypeError:
+                # A thread that never ran any profiled code has no stats
+                continue
+        stats.dump_stats(stats_path)
+        self.tracer.dump(trace_path)
+        return [stats_path, trace_path]
+
+    def __enter__(self) -> 'Profiler':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.stop()
+        return False
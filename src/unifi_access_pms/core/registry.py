@@ -1,19 +1,27 @@
 """Registry for providers and notification channels."""
 
-from typing import Dict, Type, List
-from ..core.interfaces import ReservationProvider, NotificationChannel
+from typing import Dict, Type, List, Optional
+from ..core.interfaces import (
+    ReservationProvider, NotificationChannel, AsyncReservationProvider, AsyncNotificationChannel,
+)
 
 
 class ProviderRegistry:
     """Registry for reservation providers."""
     
     _providers: Dict[str, Type[ReservationProvider]] = {}
+    _async_providers: Dict[str, Type[AsyncReservationProvider]] = {}
     
     @classmethod
     def register(cls, name: str, provider_class: Type[ReservationProvider]):
         """Register a provider."""
         cls._providers[name] = provider_class
     
+    @classmethod
+    def register_async(cls, name: str, provider_class: Type[AsyncReservationProvider]):
+        """Register a native async implementation of a provider."""
+        cls._async_providers[name] = provider_class
+    
     @classmethod
     def get_provider(cls, name: str) -> Type[ReservationProvider]:
         """Get a provider by name."""
@@ -21,6 +29,11 @@ class ProviderRegistry:
             raise ValueError(f"Unknown provider: {name}")
         return cls._providers[name]
     
+    @classmethod
+    def get_async_provider(cls, name: str) -> Optional[Type[AsyncReservationProvider]]:
+        """Get the native async implementation of a provider, if any."""
+        return cls._async_providers.get(name)
+    
     @classmethod
     def list_providers(cls) -> List[str]:
         """List all registered providers."""
@@ -31,12 +44,18 @@ class NotificationRegistry:
     """Registry for notification channels."""
     
     _channels: Dict[str, Type[NotificationChannel]] = {}
+    _async_channels: Dict[str, Type[AsyncNotificationChannel]] = {}
     
     @classmethod
     def register(cls, name: str, channel_class: Type[NotificationChannel]):
         """Register a notification channel."""
         cls._channels[name] = channel_class
     
+    @classmethod
+    def register_async(cls, name: str, channel_class: Type[AsyncNotificationChannel]):
+        """Register a native async implementation of a channel."""
+        cls._async_channels[name] = channel_class
+    
     @classmethod
     def get_channel(cls, name: str) -> Type[NotificationChannel]:
         """Get a channel by name."""
@@ -44,6 +63,11 @@ class NotificationRegistry:
             raise ValueError(f"Unknown notification channel: {name}")
         return cls._channels[name]
     
+    @classmethod
+    def get_async_channel(cls, name: str) -> Optional[Type[AsyncNotificationChannel]]:
+        """Get the native async implementation of a channel, if any."""
+        return cls._async_channels.get(name)
+    
     @classmethod
     def list_channels(cls) -> List[str]:
         """List all registered channels."""
@@ -54,8 +78,9 @@ class NotificationRegistry:
 def register_builtin_providers():
     """Register built-in providers."""
     try:
-        from ..providers.hospitable import HospitableProvider
+        from ..providers.hospitable import HospitableProvider, AsyncHospitableProvider
         ProviderRegistry.register('hospitable', HospitableProvider)
+        ProviderRegistry.register_async('hospitable', AsyncHospitableProvider)
     except ImportError:
         pass
 
@@ -63,14 +88,16 @@ def register_builtin_providers():
 def register_builtin_channels():
     """Register built-in notification channels."""
     try:
-        from ..notifications.simplepush import SimplepushChannel
+        from ..notifications.simplepush import SimplepushChannel, AsyncSimplepushChannel
         NotificationRegistry.register('simplepush', SimplepushChannel)
+        NotificationRegistry.register_async('simplepush', AsyncSimplepushChannel)
     except ImportError:
         pass
     
     try:
-        from ..notifications.matrix import MatrixChannel
+        from ..notifications.matrix import MatrixChannel, AsyncMatrixChannel
         NotificationRegistry.register('matrix', MatrixChannel)
+        NotificationRegistry.register_async('matrix', AsyncMatrixChannel)
     except ImportError:
         pass
 
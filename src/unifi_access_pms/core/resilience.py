@@ -0,0 +1,191 @@
+"""Rate limiting, backoff and circuit breaking primitives."""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+
+class TransientError(Exception):
+    """An operation failed for a reason that is expected to clear on its own."""
+
+
+class RateLimitExceeded(TransientError):
+    """The remote service kept throttling us after all retries were used."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(TransientError):
+    """The circuit breaker is open and the call was not attempted."""
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Return a full-jitter exponential backoff delay for the given attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """Parse a Retry-After header value (seconds or HTTP date) into seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return max(0.0, float(value))
+
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Thread-safe token bucket with adaptive slow-down on throttling.
+
+    Tokens refill at ``rate`` per second up to ``burst``. When the remote side
+    throttles us, ``throttle`` pauses the bucket (honouring Retry-After) and
+    halves the effective rate; each successful call recovers it additively.
+    """
+
+    def __init__(self, rate: float, burst: int,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize token bucket."""
+        if rate <= 0:
+            raise ValueError("Rate limit must be positive")
+        if burst < 1:
+            raise ValueError("Burst size must be at least 1")
+
+        self.rate = float(rate)
+        self.burst = burst
+        self.min_rate = self.rate / 16
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._current_rate = self.rate
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+
+    @property
+    def current_rate(self) -> float:
+        """Effective refill rate after adaptive slow-down."""
+        return self._current_rate
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self._current_rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available; otherwise return the seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self._current_rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until tokens are available."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            self._sleep(wait)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """Slow down after a throttling response from the remote side."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._current_rate = max(self.min_rate, self._current_rate / 2)
+            self._tokens = 0.0
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def record_success(self) -> None:
+        """Recover the effective rate after a successful call."""
+        with self._lock:
+            if self._current_rate < self.rate:
+                self._current_rate = min(self.rate, self._current_rate + self.rate / 10)
+
+
+class CircuitBreaker:
+    """Classic closed/open/half-open circuit breaker.
+
+    Once half-open, a single trial call is let through; the rest are
+    short-circuited until it succeeds, or until ``reset_timeout`` passes
+    without it reporting back.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """Current breaker state."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Return True if a call may be attempted."""
+        with self._lock:
+            state = self._state()
+            if state != self.HALF_OPEN:
+                return state == self.CLOSED
+            now = self._clock()
+            if self._trial_at is not None and now - self._trial_at < self.reset_timeout:
+                return False
+            self._trial_at = now
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit once the threshold is hit."""
+        with self._lock:
+            self._failures += 1
+            if self._state() == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._trial_at = None
@@ -0,0 +1,86 @@
+"""Tiered scheduling of sync windows with different cadences."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from ..config.models import SyncTierConfig
+
+
+class TieredScheduler:
+    """Runs several sync windows, each on its own cadence.
+
+    A near-term window (say the next 48 hours every minute) keeps imminent
+    arrivals fresh while wider windows run rarely. When several tiers are due
+    at once only the widest runs; its slice contains the narrower ones, so
+    every narrower tier is rescheduled as if it had run too.
+    """
+
+    def __init__(self, tiers: List[SyncTierConfig],
+                 run_tier: Callable[[SyncTierConfig, datetime, datetime], None],
+                 clock: Callable[[], float] = time.time):
+        """Initialize tiered scheduler."""
+        if not tiers:
+            raise ValueError("At least one sync tier is required")
+        self.tiers = sorted(tiers, key=lambda t: t.horizon_hours)
+        self.run_tier = run_tier
+        self._clock = clock
+        self.next_run: Dict[str, float] = {tier.name: 0.0 for tier in self.tiers}
+
+    def due(self) -> List[SyncTierConfig]:
+        """Tiers whose next run time has passed."""
+        now = self._clock()
+        return [tier for tier in self.tiers if self.next_run[tier.name] <= now]
+
+    def seconds_until_next(self) -> float:
+        """Seconds until the earliest tier is due."""
+        return max(0.0, min(self.next_run.values()) - self._clock())
+
+    def run_pending(self) -> Optional[SyncTierConfig]:
+        """Run the widest due tier, if any, and return it."""
+        due = self.due()
+        if not due:
+            return None
+
+        tier = due[-1]
+        start_date = datetime.fromtimestamp(self._clock())
+        end_date = start_date + timedelta(hours=tier.horizon_hours)
+        try:
+            self.run_tier(tier, start_date, end_date)
+        finally:
+            finished = self._clock()
+            for covered in self.tiers:
+                if covered.horizon_hours <= tier.horizon_hours:
+                    self.next_run[covered.name] = finished + covered.interval
+        return tier
+
+    def set_tiers(self, tiers: List[SyncTierConfig]) -> None:
+        """Replace the tiers, keeping the schedule of tiers that still exist."""
+        if not tiers:
+            raise ValueError("At least one sync tier is required")
+        self.tiers = sorted(tiers, key=lambda t: t.horizon_hours)
+        self.next_run = {tier.name: self.next_run.get(tier.name, 0.0) for tier in self.tiers}
+
+    def run_forever(self, stop: Optional[threading.Event] = None,
+                    idle: Optional[Callable[[], None]] = None,
+                    idle_interval: float = 5.0) -> None:
+        """Run tiers as they come due until ``stop`` is set.
+
+        ``idle`` is called at least every ``idle_interval`` seconds between
+        runs, e.g. to check for configuration changes.
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                print(f"❌ Scheduled sync failed: {e}")
+
+            wait = self.seconds_until_next()
+            if idle is not None:
+                wait = min(wait, idle_interval)
+            if stop.wait(wait):
+                break
+            if idle is not None:
+                idle()
@@ -0,0 +1,229 @@
+"""Controller sharding across worker nodes with leases in a shared SQLite store."""
+
+import bisect
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    node_id TEXT PRIMARY KEY,
+    heartbeat REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    shard TEXT PRIMARY KEY,
+    node_id TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def default_node_id() -> str:
+    """Identify this worker by host name and process ID."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes.
+
+    Adding or removing a node only moves the shards that hash next to its
+    virtual nodes, so a rebalance touches about 1/N of the shards.
+    """
+
+    def __init__(self, nodes: List[str], replicas: int = 64):
+        """Initialize hash ring."""
+        points = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, shard: str) -> Optional[str]:
+        """Node owning a shard, or None for an empty ring."""
+        if not self._nodes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(shard)) % len(self._nodes)
+        return self._nodes[index]
+
+
+class ShardCoordinator:
+    """Assigns shards (controllers) to live nodes and guards them with leases.
+
+    Every node heartbeats into a shared SQLite database; the nodes seen
+    within ``lease_ttl`` form a consistent hash ring that decides who should
+    own each shard. A node only syncs shards it holds an unexpired lease on.
+    Leases are exclusive rows, taken only when free or expired and renewed
+    by a background heartbeat, and a node releases a shard it no longer
+    should own only between runs (``acquire``), so two nodes never hold the
+    same shard. A node that dies stops renewing and its shards move once the
+    leases expire. A node that cannot renew stops treating its leases as
+    valid before they expire for everyone else.
+    """
+
+    def __init__(self, path: str, shards: List[str], node_id: Optional[str] = None,
+                 lease_ttl: float = 60.0, clock: Callable[[], float] = time.time):
+        """Initialize shard coordinator."""
+        self.path = path
+        self.shards = list(shards)
+        self.node_id = node_id or default_node_id()
+        self.lease_ttl = lease_ttl
+        self._clock = clock
+        self._owned: Set[str] = set()
+        self._valid_until = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _heartbeat(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(
+            "INSERT INTO nodes (node_id, heartbeat) VALUES (?, ?) "
+            "ON CONFLICT(node_id) DO UPDATE SET heartbeat = excluded.heartbeat",
+            (self.node_id, now)
+        )
+        conn.execute("UPDATE leases SET expires_at = ? WHERE node_id = ?",
+                     (now + self.lease_ttl, self.node_id))
+
+    def live_nodes(self) -> List[str]:
+        """Nodes that heartbeated within the lease TTL."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT node_id FROM nodes WHERE heartbeat > ? ORDER BY node_id",
+                                (self._clock() - self.lease_ttl,)).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    def acquire(self) -> Set[str]:
+        """Rebalance: release shards that moved away, lease the ones assigned here.
+
+        Call between sync runs only; returns the shards this node may sync.
+        """
+        now = self._clock()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._heartbeat(conn, now)
+                conn.execute("DELETE FROM nodes WHERE heartbeat <= ?", (now - self.lease_ttl,))
+                nodes = [row[0] for row in conn.execute("SELECT node_id FROM nodes")]
+                ring = HashRing(nodes)
+                wanted = {s for s in self.shards if ring.node_for(s) == self.node_id}
+
+                conn.execute(
+                    f"DELETE FROM leases WHERE node_id = ? AND shard NOT IN "
+                    f"({','.join('?' * len(wanted))})",
+                    (self.node_id, *wanted)
+                )
+                for shard in wanted:
+                    conn.execute(
+                        "INSERT INTO leases (shard, node_id, expires_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(shard) DO UPDATE SET node_id = excluded.node_id, "
+                        "expires_at = excluded.expires_at "
+                        "WHERE leases.node_id = excluded.node_id OR leases.expires_at <= ?",
+                        (shard, self.node_id, now + self.lease_ttl, now)
+                    )
+                owned = {row[0] for row in conn.execute(
+                    "SELECT shard FROM leases WHERE node_id = ?", (self.node_id,))}
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._owned = owned & set(self.shards)
+            self._valid_until = now + self.lease_ttl
+        return set(self._owned)
+
+    def renew(self) -> bool:
+        """Heartbeat and extend this node's leases; return False on failure."""
+        now = self._clock()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                self._heartbeat(conn, now)
+                held = {row[0] for row in conn.execute(
+                    "SELECT shard FROM leases WHERE node_id = ?", (self.node_id,))}
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Shard lease renewal failed: {e}")
+            return False
+        with self._lock:
+            self._owned &= held
+            self._valid_until = now + self.lease_ttl
+        return True
+
+    def owned(self) -> Set[str]:
+        """Shards this node may sync right now.
+
+        Empty once the leases may have lapsed without being renewed, a margin
+        of a third of the TTL ahead of their expiry in the store.
+        """
+        with self._lock:
+            if self._clock() > self._valid_until - self.lease_ttl / 3:
+                return set()
+            return set(self._owned)
+
+    def release(self) -> None:
+        """Give up every lease and leave the ring, e.g. on shutdown."""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM leases WHERE node_id = ?", (self.node_id,))
+            conn.execute("DELETE FROM nodes WHERE node_id = ?", (self.node_id,))
+        finally:
+            conn.close()
+        with self._lock:
+            self._owned = set()
+
+    def assignment(self) -> Dict[str, Optional[str]]:
+        """Current lease holder of every shard."""
+        conn = self._connect()
+        try:
+            rows = dict(conn.execute(
+                "SELECT shard, node_id FROM leases WHERE expires_at > ?", (self._clock(),)))
+        finally:
+            conn.close()
+        return {shard: rows.get(shard) for shard in self.shards}
+
+    def start(self) -> None:
+        """Renew leases in the background every third of the TTL."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(self.lease_ttl / 3):
+                self.renew()
+
+        self._thread = threading.Thread(target=loop, name='shard-heartbeat', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop renewing and release every lease."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.release()
@@ -0,0 +1,118 @@
+"""On-disk reservation snapshots for stale-while-revalidate fetches."""
+
+import gzip
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional
+
+from .models import Guest, Reservation
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class Snapshot:
+    """Last successful reservation fetch for one provider."""
+    provider: str
+    fetched_at: datetime
+    reservations: List[Reservation]
+
+    @property
+    def age(self) -> float:
+        """Age of the snapshot in seconds."""
+        return (datetime.now() - self.fetched_at).total_seconds()
+
+
+def _encode_datetime(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _decode_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _encode_reservation(reservation: Reservation) -> List[Any]:
+    guest = reservation.guest
+    return [
+        reservation.id, guest.first_name, guest.last_name, guest.phone, guest.email,
+        _encode_datetime(reservation.check_in), _encode_datetime(reservation.check_out),
+        reservation.status, reservation.property_id, reservation.property_name,
+    ]
+
+
+def _decode_reservation(row: List[Any]) -> Reservation:
+    (reservation_id, first_name, last_name, phone, email,
+     check_in, check_out, status, property_id, property_name) = row
+    return Reservation(
+        id=reservation_id,
+        guest=Guest(first_name=first_name, last_name=last_name, phone=phone, email=email),
+        check_in=_decode_datetime(check_in),
+        check_out=_decode_datetime(check_out),
+        status=status,
+        property_id=property_id,
+        property_name=property_name
+    )
+
+
+class SnapshotStore:
+    """Stores one gzip-compressed JSON snapshot per provider.
+
+    Reservations are stored as positional rows rather than dicts to keep the
+    files small; writes go through a temporary file and an atomic rename so a
+    crash never leaves a truncated snapshot behind.
+    """
+
+    def __init__(self, directory: str):
+        """Initialize snapshot store."""
+        self.directory = Path(directory)
+
+    def _path(self, provider: str) -> Path:
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', provider)
+        return self.directory / f"{safe_name}.json.gz"
+
+    def save(self, provider: str, reservations: List[Reservation],
+             fetched_at: Optional[datetime] = None) -> None:
+        """Persist a successful fetch for a provider."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'v': SNAPSHOT_VERSION,
+            'provider': provider,
+            'fetched_at': (fetched_at or datetime.now()).isoformat(),
+            'rows': [_encode_reservation(r) for r in reservations],
+        }
+        data = gzip.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(provider))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def load(self, provider: str) -> Optional[Snapshot]:
+        """Load the snapshot for a provider, or None if missing or unreadable."""
+        path = self._path(provider)
+        if not path.exists():
+            return None
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                payload = json.load(f)
+            if payload.get('v') != SNAPSHOT_VERSION:
+                return None
+            return Snapshot(
+                provider=payload['provider'],
+                fetched_at=datetime.fromisoformat(payload['fetched_at']),
+                reservations=[_decode_reservation(row) for row in payload['rows']]
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Ignoring unreadable snapshot {path}: {e}")
+            return None
@@ -0,0 +1,488 @@
+"""Reservation to visitor synchronization engine."""
+
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from ..config.models import UniFiConfig
+from .audit import AuditStore
+from .interfaces import UniFiAccessIntegration
+from .journal import OperationJournal, PendingOperation
+from .models import Reservation, Visitor, SyncResult, VisitorOperation
+from .profiling import span
+from .resilience import TransientError
+from .write_queue import WriteQueue
+
+
+def _starts_before(visitor: Visitor, window_end: Optional[datetime]) -> bool:
+    """Return True if a visitor falls inside a window ending at ``window_end``."""
+    if window_end is None or visitor.start_time is None:
+        return True
+    try:
+        return visitor.start_time <= window_end
+    except TypeError:
+        # Naive/aware mismatch: leave the visitor to an unbounded sync
+        return False
+
+
+def generate_pin_from_phone(phone: Optional[str], length: int = 4) -> str:
+    """Generate a PIN from phone number digits."""
+    digits = ''.join(filter(str.isdigit, phone or ''))
+    if len(digits) >= length:
+        return digits[-length:]
+    # Pad with zeros if not enough digits
+    return digits.zfill(length)
+
+
+class SyncEngine:
+    """Reconciles reservations against the visitors on a UniFi Access controller.
+
+    With an ``OperationJournal`` the planned operations are recorded before
+    any write. If the previous run was interrupted, the next ``sync`` call
+    first re-applies that run's unfinished operations, then lists and diffs
+    the controller as usual. With an ``AuditStore`` every write and its
+    outcome is recorded under ``run_id`` and ``controller``.
+
+    Writes go through a ``WriteQueue``: imminent check-ins first, then
+    overdue revocations, then later changes. With ``write_budget`` a run
+    stops writing after that many seconds and defers the (least urgent)
+    rest to the next run. With ``fence`` every write first checks that this
+    process may still write to the controller, and the run stops writing as
+    soon as it may not.
+    """
+
+    def __init__(self, integration: UniFiAccessIntegration, pin_length: int = 4,
+                 dry_run: bool = False, journal: Optional[OperationJournal] = None,
+                 audit: Optional[AuditStore] = None, run_id: Optional[str] = None,
+                 controller: Optional[str] = None,
+                 grace_period: timedelta = timedelta(0),
+                 imminent_window: float = 86400.0, write_budget: Optional[float] = None,
+                 clock: Callable[[], float] = time.time,
+                 fence: Optional[Callable[[], bool]] = None):
+        """Initialize sync engine."""
+        self.integration = integration
+        self.pin_length = pin_length
+        self.dry_run = dry_run
+        self.grace_period = grace_period
+        self.imminent_window = imminent_window
+        self.write_budget = write_budget
+        self._clock = clock
+        self.fence = fence
+        self.journal = journal
+        self.audit = audit
+        self.run_id = run_id
+        self.controller = controller
+
+    def build_visitor(self, reservation: Reservation) -> Visitor:
+        """Build the desired visitor for a reservation."""
+        return Visitor(
+            name=reservation.guest_name,
+            start_time=reservation.check_in,
+            end_time=reservation.check_out + self.grace_period,
+            pin=generate_pin_from_phone(reservation.guest.phone, self.pin_length)
+        )
+
+    def build_visit(self, stays: List[Reservation]) -> Tuple[Visitor, Reservation]:
+        """Build one guest's visitor from all of their confirmed stays.
+
+        A guest has a single visitor, so stays that follow each other within
+        the grace period form one visit and the visitor covers the current
+        or next visit. Returns the visitor and the visit's first stay.
+        """
+        if len(stays) == 1:
+            return self.build_visitor(stays[0]), stays[0]
+        try:
+            visits: List[List[Reservation]] = []
+            ends: List[datetime] = []
+            for stay in sorted(stays, key=lambda r: r.check_in):
+                end = stay.check_out + self.grace_period
+                if ends and stay.check_in <= ends[-1]:
+                    visits[-1].append(stay)
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    visits.append([stay])
+                    ends.append(end)
+            now = self._clock()
+            index = next((i for i, end in enumerate(ends) if end.timestamp() > now),
+                         len(visits) - 1)
+        except TypeError:
+            # Naive/aware mismatch across providers: fall back to the first stay
+            return self.build_visitor(stays[0]), stays[0]
+
+        visit = visits[index]
+        visitor = self.build_visitor(visit[0])
+        visitor.end_time = ends[index]
+        return visitor, visit[0]
+
+    def _stays_by_guest(self, reservations: List[Reservation]) -> Dict[str, List[Reservation]]:
+        stays: Dict[str, List[Reservation]] = {}
+        for reservation in reservations:
+            if reservation.status == 'confirmed':
+                stays.setdefault(reservation.guest_name, []).append(reservation)
+        return stays
+
+    @staticmethod
+    def _needs_update(existing: Visitor, desired: Visitor) -> bool:
+        return (existing.start_time != desired.start_time
+                or existing.end_time != desired.end_time
+                or existing.pin != desired.pin)
+
+    def plan(self, reservations: List[Reservation], visitors: List[Visitor],
+             result: SyncResult, allow_deletes: bool = True,
+             window_end: Optional[datetime] = None) -> List[VisitorOperation]:
+        """Diff reservations against visitors into a list of operations.
+
+        With ``window_end`` only visitors starting before the end of the window
+        are candidates for deletion, so a short-horizon sync never removes
+        visitors for reservations beyond its slice.
+        """
+        visitors_by_name: Dict[str, Visitor] = {v.name: v for v in visitors}
+        processed: Set[str] = set()
+        operations: List[VisitorOperation] = []
+
+        for stays in self._stays_by_guest(reservations).values():
+            desired, reservation = self.build_visit(stays)
+            existing = visitors_by_name.get(desired.name)
+            processed.add(desired.name)
+            result.total_processed += len(stays)
+
+            if existing is None:
+                operations.append(VisitorOperation(
+                    'create', desired.name, visitor=desired, reservation_id=reservation.id,
+                    property_id=reservation.property_id, pin_changed=True,
+                    deadline=reservation.check_in))
+            elif self._needs_update(existing, desired):
+                operations.append(VisitorOperation(
+                    'update', desired.name, visitor_id=existing.id, visitor=desired,
+                    reservation_id=reservation.id, property_id=reservation.property_id,
+                    pin_changed=existing.pin != desired.pin, deadline=reservation.check_in))
+
+        for visitor in visitors:
+            if visitor.name in processed or not _starts_before(visitor, window_end):
+                continue
+            if not allow_deletes:
+                result.deferred.append(f"delete {visitor.name}: suppressed while data is stale")
+                continue
+            operations.append(VisitorOperation('delete', visitor.name, visitor_id=visitor.id,
+                                               deadline=visitor.start_time or visitor.end_time))
+
+        return operations
+
+    def sync(self, reservations: List[Reservation], allow_deletes: bool = True,
+             window_end: Optional[datetime] = None) -> SyncResult:
+        """Create, update and delete visitors so they match the reservations.
+
+        Pass ``allow_deletes=False`` when the reservations may be stale, so a
+        guest missing from old data is never locked out, and ``window_end``
+        when the reservations only cover a slice of the calendar.
+        """
+        result = SyncResult()
+
+        if self.journal is not None and not self.dry_run:
+            pending = self.journal.pending()
+            if pending:
+                print(f"↩️ Resuming {len(pending)} unfinished operations from journal")
+                self._resume(pending, result)
+
+        operations = self.plan(reservations, self.integration.get_visitors(),
+                               result, allow_deletes, window_end)
+        if self.journal is not None and not self.dry_run:
+            self.journal.begin(operations)
+        self._execute(operations, result)
+        return result
+
+    def _in_stay(self, reservation: Reservation, now: float) -> bool:
+        """True if the guest is between check-in and the end of the grace period."""
+        return (reservation.status == 'confirmed'
+                and reservation.check_in.timestamp() <= now
+                < (reservation.check_out + self.grace_period).timestamp())
+
+    def transition(self, reservation: Reservation, action: str, result: SyncResult,
+                   reservations: Optional[List[Reservation]] = None) -> Optional[bool]:
+        """Apply one check-in ('activate') or check-out ('revoke') change.
+
+        Only the guest's own visitor is written, so a transition costs one
+        visitor listing and at most one write instead of a full sync. The
+        guest's other stays in ``reservations`` shape the visitor as in
+        ``plan``, and a revoke is skipped while another of them still needs
+        it, e.g. back-to-back stays overlapping the grace period.
+        """
+        stays = [other for other in reservations or []
+                 if other.id != reservation.id and other.status == 'confirmed'
+                 and other.guest_name == reservation.guest_name]
+        desired, _ = self.build_visit([reservation] + stays)
+        if action == 'revoke':
+            now = self._clock()
+            if any(self._in_stay(other, now) for other in stays):
+                return True
+
+        existing = next((v for v in self.integration.get_visitors()
+                         if v.name == desired.name), None)
+
+        if action == 'revoke':
+            if existing is None:
+                return True
+            operation = VisitorOperation('delete', desired.name, visitor_id=existing.id,
+                                         reservation_id=reservation.id,
+                                         property_id=reservation.property_id)
+        elif existing is None:
+            operation = VisitorOperation('create', desired.name, visitor=desired,
+                                         reservation_id=reservation.id,
+                                         property_id=reservation.property_id, pin_changed=True)
+        elif self._needs_update(existing, desired):
+            operation = VisitorOperation('update', desired.name, visitor_id=existing.id,
+                                         visitor=desired, reservation_id=reservation.id,
+                                         property_id=reservation.property_id,
+                                         pin_changed=existing.pin != desired.pin)
+        else:
+            return True
+
+        result.total_processed += 1
+        if self._fenced():
+            self._defer_rest([operation], result, "shard lease lapsed")
+            return None
+        return self.apply(operation, result)
+
+    def _resume(self, pending: List[PendingOperation], result: SyncResult) -> None:
+        """Re-apply the unfinished operations of an interrupted run.
+
+        A create or delete that was sent but not confirmed may already have
+        been applied; those the controller already reflects are marked done
+        instead of being sent again.
+        """
+        if any(p.in_doubt and p.operation.action in ('create', 'delete') for p in pending):
+            visitors = self.integration.get_visitors()
+            names = {v.name for v in visitors}
+            ids = {v.id for v in visitors}
+            landed = [p for p in pending if p.in_doubt and (
+                (p.operation.action == 'create' and p.operation.name in names)
+                or (p.operation.action == 'delete' and p.operation.visitor_id not in ids))]
+            for p in landed:
+                self.journal.done(p.operation)
+            pending = [p for p in pending if p not in landed]
+
+        self._execute([p.operation for p in pending], result)
+
+    def _execute(self, operations: List[VisitorOperation], result: SyncResult) -> None:
+        """Apply operations most urgent first, journaling each one, and finish the journal."""
+        journal = None if self.dry_run else self.journal
+        queue = WriteQueue(operations, self.imminent_window, self._clock)
+        started = self._clock()
+        while queue:
+            operation = queue.pop()
+            if (self.write_budget is not None and not self.dry_run
+                    and self._clock() - started >= self.write_budget):
+                self._defer_rest([operation] + queue.drain(), result, "write budget spent")
+                break
+            if self._fenced():
+                self._defer_rest([operation] + queue.drain(), result, "shard lease lapsed")
+                break
+            if journal is not None:
+                journal.start(operation)
+            if self.apply(operation, result) is not None and journal is not None:
+                journal.done(operation)
+
+        if journal is not None:
+            # Deferred writes are not replayed from the journal: the next run's
+            # diff re-derives them and queues them by urgency with new work
+            journal.clear()
+
+    def _fenced(self) -> bool:
+        """True if this process may no longer write to the controller."""
+        return self.fence is not None and not self.dry_run and not self.fence()
+
+    def _defer_rest(self, operations: List[VisitorOperation], result: SyncResult,
+                    reason: str) -> None:
+        """Leave writes this run may not make for the next run."""
+        print(f"⏳ Deferring {len(operations)} writes: {reason}")
+        for operation in operations:
+            result.deferred.append(f"{operation.action} {operation.name}: {reason}")
+            self._audit(operation, 'deferred', detail=reason)
+
+    def apply(self, operation: VisitorOperation, result: SyncResult) -> Optional[bool]:
+        """Run one visitor write and record its outcome on the result.
+
+        Returns True on success, False on a hard failure and None when the
+        write was deferred because of a transient condition.
+        """
+        action, name = operation.action, operation.name
+        if self.dry_run:
+            print(f"🔍 Would {action} visitor: {name}")
+            return True
+
+        retries_before = getattr(self.integration, 'retry_count', 0)
+        try:
+            if action == 'create':
+                outcome = self.integration.create_visitor(operation.visitor)
+            elif action == 'update':
+                outcome = self.integration.update_visitor(operation.visitor_id, operation.visitor)
+            else:
+                outcome = self.integration.delete_visitor(operation.visitor_id)
+        except TransientError as e:
+            result.deferred.append(f"{action} {name}: {e}")
+            print(f"⏳ Deferred {action} of {name}: {e}")
+            self._audit(operation, 'deferred', detail=str(e))
+            return None
+        except Exception as e:
+            result.errors.append(f"Failed to {action} {name}: {e}")
+            print(f"⚠️ Failed to {action} {name}: {e}")
+            self._audit(operation, 'failed', detail=str(e))
+            return False
+        finally:
+            result.retries += getattr(self.integration, 'retry_count', 0) - retries_before
+
+        if outcome is False:
+            result.errors.append(f"Failed to {action} {name}")
+            print(f"⚠️ Failed to {action} {name}")
+            self._audit(operation, 'failed')
+            return False
+
+        created_id = outcome if action == 'create' and isinstance(outcome, str) else None
+        self._audit(operation, 'ok', visitor_id=created_id)
+
+        if action == 'create':
+            result.created += 1
+        elif action == 'update':
+            result.updated += 1
+        else:
+            result.deleted += 1
+        return True
+
+    def _audit(self, operation: VisitorOperation, status: str,
+               visitor_id: Optional[str] = None, detail: Optional[str] = None) -> None:
+        if self.audit is not None:
+            self.audit.record_operation(operation, status, self.run_id, self.controller,
+                                        visitor_id=visitor_id, detail=detail)
+
+
+class ControllerFanOut:
+    """Routes reservations to their controllers and syncs controllers concurrently.
+
+    Each controller gets its own ``SyncEngine`` over the client returned by
+    ``client_for`` (normally ``ControllerPool.get``), so a run takes roughly
+    as long as the slowest controller rather than the sum of all of them.
+    """
+
+    def __init__(self, controllers: List[UniFiConfig],
+                 client_for: Callable[[UniFiConfig], UniFiAccessIntegration],
+                 pin_length: int = 4, dry_run: bool = False,
+                 journal_dir: Optional[str] = None, audit: Optional[AuditStore] = None,
+                 grace_period: timedelta = timedelta(0), owned: Optional[Set[str]] = None,
+                 imminent_window: float = 86400.0, write_budget: Optional[float] = None,
+                 lease: Optional[Callable[[], Set[str]]] = None):
+        """Initialize controller fan-out.
+
+        With ``owned``, reservations are still routed across every controller
+        but only the controllers named in it are synced. ``lease`` returns the
+        controllers this process may write to right now (normally
+        ``ShardCoordinator.owned``); it is checked before every write, so a
+        controller whose lease lapses mid-run stops being written to.
+        """
+        self.controllers = controllers
+        self.client_for = client_for
+        self.pin_length = pin_length
+        self.dry_run = dry_run
+        self.journal_dir = journal_dir
+        self.audit = audit
+        self.grace_period = grace_period
+        self.owned = owned
+        self.imminent_window = imminent_window
+        self.write_budget = write_budget
+        self.lease = lease
+
+    def _key(self, controller: UniFiConfig) -> str:
+        return controller.name or controller.api_host
+
+    def _fence(self, key: str) -> Optional[Callable[[], bool]]:
+        if self.lease is None:
+            return None
+        return lambda: key in self.lease()
+
+    def _synced(self) -> List[UniFiConfig]:
+        """Controllers this process syncs."""
+        if self.owned is None:
+            return self.controllers
+        return [c for c in self.controllers if self._key(c) in self.owned]
+
+    def route(self, reservations: List[Reservation]) -> Dict[str, List[Reservation]]:
+        """Assign each reservation to the controller serving its property."""
+        routes: Dict[str, List[Reservation]] = {self._key(c): [] for c in self.controllers}
+        by_property: Dict[str, str] = {}
+        for controller in self.controllers:
+            for property_id in controller.properties:
+                by_property.setdefault(str(property_id), self._key(controller))
+        catch_all = next((self._key(c) for c in self.controllers if not c.properties), None)
+
+        for reservation in reservations:
+            key = by_property.get(str(reservation.property_id), catch_all)
+            if key is None:
+                print(f"⚠️ No controller for property {reservation.property_id}, "
+                      f"skipping reservation {reservation.id}")
+                continue
+            routes[key].append(reservation)
+        return routes
+
+    def controller_for(self, reservation: Reservation) -> Optional[UniFiConfig]:
+        """Controller serving a reservation's property, if any."""
+        routes = self.route([reservation])
+        return next((c for c in self.controllers if routes[self._key(c)]), None)
+
+    def transition(self, reservation: Reservation, action: str,
+                   reservations: Optional[List[Reservation]] = None) -> Optional[SyncResult]:
+        """Apply one check-in or check-out change on the reservation's controller.
+
+        ``reservations`` is the current picture, consulted so a revoke does not
+        remove a visitor another stay of the same guest still uses.
+        """
+        controller = self.controller_for(reservation)
+        if controller is None or controller not in self._synced():
+            return None
+
+        key = self._key(controller)
+        engine = SyncEngine(self.client_for(controller), self.pin_length, self.dry_run,
+                            audit=None if self.dry_run else self.audit,
+                            run_id=f"{action}-{reservation.id}", controller=key,
+                            grace_period=self.grace_period, fence=self._fence(key))
+        result = SyncResult()
+        engine.transition(reservation, action, result, reservations)
+        return result
+
+    def sync(self, reservations: List[Reservation], allow_deletes: bool = True,
+             window_end: Optional[datetime] = None) -> Dict[str, SyncResult]:
+        """Sync every controller concurrently and return results by controller."""
+        routes = self.route(reservations)
+        run_id = uuid.uuid4().hex[:12]
+
+        def run(controller: UniFiConfig) -> SyncResult:
+            key = self._key(controller)
+            journal = None
+            if self.journal_dir:
+                journal = OperationJournal.for_controller(self.journal_dir, key)
+            audit = None if self.dry_run else self.audit
+            started_at = time.time()
+            with span('sync', key, reservations=len(routes[key])):
+                engine = SyncEngine(self.client_for(controller), self.pin_length, self.dry_run,
+                                    journal, audit=audit, run_id=run_id, controller=key,
+                                    grace_period=self.grace_period,
+                                    imminent_window=self.imminent_window,
+                                    write_budget=self.write_budget, fence=self._fence(key))
+                result = engine.sync(routes[key], allow_deletes=allow_deletes,
+                                     window_end=window_end)
+            if audit is not None:
+                audit.record_run(run_id, key, started_at, result)
+            return result
+
+        results: Dict[str, SyncResult] = {}
+        controllers = self._synced()
+        with ThreadPoolExecutor(max_workers=max(1, len(controllers)),
+                                thread_name_prefix='controller') as pool:
+            futures = {self._key(c): pool.submit(run, c) for c in controllers}
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    print(f"❌ Sync of controller {key} failed: {e}")
+                    results[key] = SyncResult(errors=[f"Controller {key} failed: {e}"])
+        return results
@@ -0,0 +1,118 @@
+"""Event-time scheduling of check-in and check-out transitions."""
+
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+from .models import Reservation
+
+
+@dataclass
+class Transition:
+    """A single access change due at an exact time."""
+    due_at: float
+    action: str  # 'activate' or 'revoke'
+    reservation: Reservation
+
+
+class TransitionScheduler:
+    """Applies check-in and check-out transitions exactly when they are due.
+
+    Upcoming transitions are kept in a min-heap keyed by due time; the worker
+    sleeps until the earliest one and applies only that change, so a guest's
+    access is revoked at check-out (plus ``grace_period``) without polling
+    the whole calendar in between.
+    """
+
+    def __init__(self, apply: Callable[[Transition], None],
+                 grace_period: timedelta = timedelta(0),
+                 clock: Callable[[], float] = time.time):
+        """Initialize transition scheduler."""
+        self.apply = apply
+        self.grace_period = grace_period
+        self._clock = clock
+        self._heap: List[Tuple[float, int, Transition]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._heap)
+
+    def transitions_for(self, reservation: Reservation) -> List[Transition]:
+        """Activation at check-in and revocation after check-out plus grace."""
+        return [
+            Transition(reservation.check_in.timestamp(), 'activate', reservation),
+            Transition((reservation.check_out + self.grace_period).timestamp(), 'revoke',
+                       reservation),
+        ]
+
+    def plan(self, reservations: List[Reservation], until: Optional[datetime] = None) -> None:
+        """Replace the transitions due before ``until`` with those of ``reservations``.
+
+        ``reservations`` is the fresh picture of the window ending at
+        ``until``; transitions beyond it are kept so a short-horizon sync
+        does not drop those planned by a wider one.
+        """
+        now = self._clock()
+        horizon = until.timestamp() if until is not None else float('inf')
+        upcoming = [
+            transition for reservation in reservations
+            if reservation.status == 'confirmed'
+            for transition in self.transitions_for(reservation)
+            if now < transition.due_at <= horizon
+        ]
+
+        with self._condition:
+            heap = [entry for entry in self._heap if entry[0] > horizon]
+            heap.extend((t.due_at, next(self._counter), t) for t in upcoming)
+            heapq.heapify(heap)
+            self._heap = heap
+            self._condition.notify_all()
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Seconds until the earliest transition, or None if none is planned."""
+        with self._condition:
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - self._clock())
+
+    def pop_due(self) -> List[Transition]:
+        """Remove and return every transition whose time has come."""
+        now = self._clock()
+        due = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def run_due(self) -> int:
+        """Apply due transitions; return how many were applied."""
+        due = self.pop_due()
+        for transition in due:
+            try:
+                self.apply(transition)
+            except Exception as e:
+                print(f"❌ Failed to {transition.action} {transition.reservation.guest_name}: {e}")
+        return len(due)
+
+    def wake(self) -> None:
+        """Interrupt the wait, e.g. to notice that ``stop`` was set."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def run_forever(self, stop: threading.Event) -> None:
+        """Apply transitions as they come due until ``stop`` is set."""
+        while not stop.is_set():
+            self.run_due()
+            with self._condition:
+                if stop.is_set():
+                    break
+                wait = None
+                if self._heap:
+                    wait = max(0.0, self._heap[0][0] - self._clock())
+                self._condition.wait(wait)
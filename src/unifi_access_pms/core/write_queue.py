@@ -0,0 +1,69 @@
+"""Urgency ordering of visitor writes."""
+
+import heapq
+import itertools
+import time
+from typing import Callable, List, Optional, Tuple
+
+from .models import VisitorOperation
+
+# Urgency tiers, most urgent first
+IMMINENT_CHECK_IN = 0
+OVERDUE_REVOCATION = 1
+LATER = 2
+
+
+def write_priority(operation: VisitorOperation, now: float,
+                   imminent_window: float = 86400.0) -> Tuple[int, float]:
+    """Sort key for a visitor write: urgency tier, then deadline.
+
+    Creates and updates for guests checking in within ``imminent_window``
+    seconds (or already in-house) come first, then deletes that are overdue,
+    then everything else; each tier runs earliest deadline first.
+    """
+    if operation.deadline is None:
+        return LATER, float('inf')
+    deadline = operation.deadline.timestamp()
+    if operation.action == 'delete':
+        tier = OVERDUE_REVOCATION if deadline <= now else LATER
+    else:
+        tier = IMMINENT_CHECK_IN if deadline <= now + imminent_window else LATER
+    return tier, deadline
+
+
+class WriteQueue:
+    """Priority queue of visitor writes for one controller.
+
+    Writes are popped most urgent first, so when a run is throttled or cut
+    short by its write budget it is the far-future changes that wait for the
+    next run, not a guest arriving within the hour.
+    """
+
+    def __init__(self, operations: Optional[List[VisitorOperation]] = None,
+                 imminent_window: float = 86400.0, clock: Callable[[], float] = time.time):
+        """Initialize write queue."""
+        self.imminent_window = imminent_window
+        self._clock = clock
+        self._heap: List[Tuple[Tuple[int, float], int, VisitorOperation]] = []
+        self._counter = itertools.count()
+        for operation in operations or []:
+            self.push(operation)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, operation: VisitorOperation) -> None:
+        """Queue a write."""
+        priority = write_priority(operation, self._clock(), self.imminent_window)
+        heapq.heappush(self._heap, (priority, next(self._counter), operation))
+
+    def pop(self) -> VisitorOperation:
+        """Remove and return the most urgent write."""
+        return heapq.heappop(self._heap)[2]
+
+    def drain(self) -> List[VisitorOperation]:
+        """Remove and return every remaining write, most urgent first."""
+        operations = []
+        while self._heap:
+            operations.append(self.pop())
+        return operations
@@ -0,0 +1,46 @@
+"""Pool of long-lived UniFi Access clients keyed by controller host."""
+
+import threading
+from typing import Callable, Dict, List
+
+from ..config.models import UniFiConfig
+from .unifi_access import UniFiAccessClient
+
+
+class ControllerPool:
+    """Keeps one ``UniFiAccessClient`` per controller host.
+
+    Clients (and with them their rate limiters, circuit breakers and SDK
+    connections) are created on first use and reused across sync runs, so
+    every controller keeps its own independent throttling state.
+    """
+
+    def __init__(self, factory: Callable[[UniFiConfig], UniFiAccessClient] = UniFiAccessClient.from_config):
+        """Initialize controller pool."""
+        self._factory = factory
+        self._clients: Dict[str, UniFiAccessClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, config: UniFiConfig) -> UniFiAccessClient:
+        """Get or create the client for a controller."""
+        with self._lock:
+            client = self._clients.get(config.api_host)
+            if client is None:
+                client = self._factory(config)
+                self._clients[config.api_host] = client
+            return client
+
+    def hosts(self) -> List[str]:
+        """List hosts with a live client."""
+        with self._lock:
+            return list(self._clients.keys())
+
+    def discard(self, host: str) -> None:
+        """Drop the client for one host so it is rebuilt on next use."""
+        with self._lock:
+            self._clients.pop(host, None)
+
+    def clear(self) -> None:
+        """Drop all pooled clients."""
+        with self._lock:
+            self._clients.clear()
@@ -1,21 +1,116 @@
 """UniFi Access integration implementation."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, TypeVar
 from datetime import datetime
+import time
 
+from ..config.models import UniFiConfig
 from ..core.interfaces import UniFiAccessIntegration
 from ..core.models import Visitor
+from ..core.profiling import span
+from ..core.resilience import (
+    TokenBucket, CircuitBreaker, TransientError, RateLimitExceeded,
+    CircuitOpenError, backoff_delay, parse_retry_after,
+)
+
+T = TypeVar('T')
+
+THROTTLE_STATUS_CODES = {429}
+TRANSIENT_STATUS_CODES = {500, 502, 503, 504}
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    """Extract an HTTP status code from an SDK or requests exception."""
+    status = getattr(exc, 'status_code', None)
+    if status is None:
+        response = getattr(exc, 'response', None)
+        status = getattr(response, 'status_code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Extract a Retry-After hint from an exception, if present."""
+    value = getattr(exc, 'retry_after', None)
+    if value is None:
+        headers = getattr(getattr(exc, 'response', None), 'headers', None) or {}
+        value = headers.get('Retry-After')
+    return parse_retry_after(value)
+
+
+def _is_connection_error(exc: Exception) -> bool:
+    """Return True for network-level failures worth retrying."""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    return type(exc).__name__ in ('ConnectionError', 'Timeout', 'ReadTimeout', 'ConnectTimeout')
+
+
+def _is_connect_error(exc: Exception) -> bool:
+    """Return True if the request failed before reaching the controller."""
+    # requests wraps urllib3's NewConnectionError in MaxRetryError.reason
+    pending = [exc]
+    for _ in range(4):
+        if not pending:
+            break
+        current = pending.pop()
+        if isinstance(current, ConnectionRefusedError):
+            return True
+        if type(current).__name__ in ('ConnectTimeout', 'NewConnectionError'):
+            return True
+        pending.extend(e for e in (getattr(current, 'reason', None), current.__cause__,
+                                   *current.args[:1]) if isinstance(e, Exception))
+    return False
 
 
 class UniFiAccessClient(UniFiAccessIntegration):
-    """UniFi Access client implementation."""
-    
-    def __init__(self, host: str, token: str):
+    """UniFi Access client implementation.
+
+    Every controller call goes through a token bucket. Throttling responses
+    (429) slow the bucket down and are retried after Retry-After; 5xx and
+    connection errors are retried with jittered backoff and feed a circuit
+    breaker that rejects writes while the controller is unhealthy. Transient
+    failures that outlast the retries raise ``TransientError`` so callers can
+    tell them apart from hard failures. Creates are not idempotent: they are
+    only retried when the request never reached the controller, and any
+    other transient failure raises ``TransientError`` at once so the next
+    run re-lists visitors instead of creating a duplicate.
+    """
+
+    def __init__(self, host: str, token: str, rate_limit: float = 10.0, burst: int = 20,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_cap: float = 30.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0):
         """Initialize UniFi Access client."""
         self.host = host
         self.token = token
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_count = 0
+        self._bucket = TokenBucket(rate_limit, burst)
+        self._breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._sleep = time.sleep
         self._client = None
-    
+
+    @classmethod
+    def from_config(cls, config: UniFiConfig) -> 'UniFiAccessClient':
+        """Create a client from UniFi configuration."""
+        return cls(
+            config.api_host,
+            config.api_token,
+            rate_limit=config.rate_limit,
+            burst=config.burst,
+            max_retries=config.max_retries,
+            failure_threshold=config.circuit_failure_threshold,
+            reset_timeout=config.circuit_reset_timeout
+        )
+
+    @property
+    def circuit_state(self) -> str:
+        """Current circuit breaker state."""
+        return self._breaker.state
+
     def _get_client(self):
         """Get or create UniFi Access client."""
         if self._client is None:
@@ -25,13 +120,51 @@ class UniFiAccessClient(UniFiAccessIntegration):
             except ImportError:
                 raise ImportError("unifi_access_python is required for UniFi Access integration")
         return self._client
-    
+
+    def _call(self, operation: Callable[[], T], write: bool = False, label: str = "call",
+              idempotent: bool = True) -> T:
+        """Run a controller call with rate limiting, retries and circuit breaking."""
+        if write and not self._breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.host}, write not attempted")
+
+        attempt = 0
+        while True:
+            self._bucket.acquire()
+            try:
+                with span('controller', label, host=self.host, attempt=attempt):
+                    result = operation()
+            except Exception as e:
+                status = _status_code(e)
+                if status in THROTTLE_STATUS_CODES:
+                    retry_after = _retry_after(e)
+                    self._bucket.throttle(retry_after)
+                    if attempt >= self.max_retries:
+                        raise RateLimitExceeded(f"Throttled by {self.host}: {e}", retry_after) from e
+                elif status in TRANSIENT_STATUS_CODES or _is_connection_error(e):
+                    self._breaker.record_failure()
+                    if not idempotent and not _is_connect_error(e):
+                        # The controller may have applied it; retrying could duplicate it
+                        raise TransientError(
+                            f"{label} on {self.host} may not have been applied: {e}") from e
+                    if attempt >= self.max_retries or not self._breaker.allow():
+                        raise TransientError(f"Controller {self.host} unavailable: {e}") from e
+                    self._sleep(backoff_delay(attempt, self.backoff_base, self.backoff_cap))
+                else:
+                    raise
+                attempt += 1
+                self.retry_count += 1
+                continue
+
+            self._bucket.record_success()
+            self._breaker.record_success()
+            return result
+
     def get_visitors(self) -> List[Visitor]:
         """Get all current visitors."""
         client = self._get_client()
         visitors = []
-        
-        unifi_visitors = client.visitors.list()
+
+        unifi_visitors = self._call(client.visitors.list, label="get_visitors")
         for uv in unifi_visitors:
             visitor = Visitor(
                 id=str(uv.id),
@@ -42,44 +175,49 @@ class UniFiAccessClient(UniFiAccessIntegration):
                 status=getattr(uv, 'status', 'active')
             )
             visitors.append(visitor)
-        
+
         return visitors
-    
+
     def create_visitor(self, visitor: Visitor) -> str:
         """Create a new visitor and return the visitor ID."""
         client = self._get_client()
-        
-        result = client.visitors.create(
+
+        result = self._call(lambda: client.visitors.create(
             name=visitor.name,
             start_time=visitor.start_time,
             end_time=visitor.end_time,
             pin=visitor.pin
-        )
-        
+        ), write=True, label="create_visitor", idempotent=False)
+
         return str(result.id)
-    
+
     def update_visitor(self, visitor_id: str, visitor: Visitor) -> bool:
-        """Update an existing visitor."""
+        """Update an existing visitor.
+
+        Raises ``TransientError`` when the write could not be attempted or
+        kept being throttled; a hard failure raises the controller's error, so
+        callers can record its cause.
+        """
         client = self._get_client()
-        
-        try:
-            client.visitors.update(
-                visitor_id=visitor_id,
-                name=visitor.name,
-                start_time=visitor.start_time,
-                end_time=visitor.end_time,
-                pin=visitor.pin
-            )
-            return True
-        except Exception:
-            return False
-    
+
+        self._call(lambda: client.visitors.update(
+            visitor_id=visitor_id,
+            name=visitor.name,
+            start_time=visitor.start_time,
+            end_time=visitor.end_time,
+            pin=visitor.pin
+        ), write=True, label="update_visitor")
+        return True
+
     def delete_visitor(self, visitor_id: str) -> bool:
-        """Delete a visitor."""
+        """Delete a visitor.
+
+        Raises ``TransientError`` when the write could not be attempted or
+        kept being throttled; a hard failure raises the controller's error, so
+        callers can record its cause.
+        """
         client = self._get_client()
-        
-        try:
-            client.visitors.delete(visitor_id)
-            return True
-        except Exception:
-            return False
\ No newline at end of file
+
+        self._call(lambda: client.visitors.delete(visitor_id), write=True,
+                   label="delete_visitor")
+        return True
@@ -0,0 +1,57 @@
+"""Shared HTTP session for notification channels."""
+
+import threading
+from typing import Optional
+
+from ..config.models import HttpConfig
+
+
+class HttpClient:
+    """A pooled ``requests`` session with default timeouts and proxy settings.
+
+    One client is shared by every channel of a ``NotificationManager``, so
+    connections (and their TLS sessions) are kept alive across messages and,
+    in the daemon, across sync runs. ``max_connections_per_host`` caps the
+    connections to each host; callers beyond it wait for a free one.
+    """
+
+    def __init__(self, config: Optional[HttpConfig] = None):
+        """Initialize HTTP client."""
+        self.config = config or HttpConfig()
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _get_session(self):
+        """Get or create the pooled session."""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.config.max_hosts,
+                                      pool_maxsize=self.config.max_connections_per_host,
+                                      pool_block=True)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                if self.config.proxy:
+                    session.proxies.update({'http': self.config.proxy,
+                                            'https': self.config.proxy})
+                self._session = session
+            return self._session
+
+    def request(self, method: str, url: str, **kwargs):
+        """Send a request, applying the configured timeout unless one is given."""
+        kwargs.setdefault('timeout', self.config.timeout)
+        return self._get_session().request(method, url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        """Send a POST request."""
+        return self.request('POST', url, **kwargs)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -1,35 +1,84 @@
 """Notification manager for UniFi Access PMS."""
 
-from typing import Dict, Any, List
+import inspect
+from typing import Dict, Any, List, Optional, Set, Union
+from ..config.models import Config, HttpConfig, NotificationChannelConfig
+from ..core.cassette import CHANNEL_METHODS, Cassette
 from ..core.interfaces import NotificationChannel
+from ..core.profiling import span
 from ..core.registry import NotificationRegistry
+from .http import HttpClient
 
 
 class NotificationManager:
-    """Manages notification channels and sending."""
+    """Manages notification channels and sending.
     
-    def __init__(self, config: Dict[str, Any]):
+    Channels that accept an ``http`` argument share one pooled
+    ``HttpClient`` configured by ``notifications.http``. With a ``cassette``
+    every message sent is recorded, or replayed instead of being sent.
+    """
+    
+    def __init__(self, config: Union[Config, Dict[str, Any]],
+                 cassette: Optional[Cassette] = None):
         """Initialize notification manager."""
+        if isinstance(config, dict):
+            config = Config.from_dict(config)
         self.config = config
+        self.cassette = cassette
+        self.http = HttpClient(self._http_config())
         self.channels: Dict[str, NotificationChannel] = {}
         self._initialize_channels()
     
-    def _initialize_channels(self):
-        """Initialize enabled notification channels."""
-        notifications_config = self.config.get('notifications', {})
-        enabled_channels = notifications_config.get('enabled_channels', [])
-        channels_config = notifications_config.get('channels', {})
+    def _http_config(self) -> HttpConfig:
+        """HTTP settings from the config, or the defaults."""
+        if self.config.notifications is None:
+            return HttpConfig()
+        return self.config.notifications.http
+    
+    def _enabled_channel_configs(self) -> Dict[str, NotificationChannelConfig]:
+        """Configs of channels that are listed in enabled_channels and enabled."""
+        notifications_config = self.config.notifications
+        if notifications_config is None:
+            return {}
         
-        for channel_name in enabled_channels:
-            if channel_name in channels_config:
-                channel_config = channels_config[channel_name]
-                if channel_config.get('enabled', True):
-                    try:
-                        channel_class = NotificationRegistry.get_channel(channel_name)
-                        channel = channel_class(channel_config.get('config', {}))
-                        self.channels[channel_name] = channel
-                    except Exception as e:
-                        print(f"Failed to initialize channel {channel_name}: {e}")
+        enabled = {}
+        for channel_name in notifications_config.enabled_channels:
+            channel_config = notifications_config.channels.get(channel_name)
+            if channel_config is not None and channel_config.enabled:
+                enabled[channel_name] = channel_config
+        return enabled
+    
+    def _initialize_channels(self, names: Optional[Set[str]] = None):
+        """Initialize enabled notification channels (only ``names`` if given)."""
+        for channel_name, channel_config in self._enabled_channel_configs().items():
+            if names is not None and channel_name not in names:
+                continue
+            try:
+                channel_class = NotificationRegistry.get_channel(channel_name)
+                if 'http' in inspect.signature(channel_class).parameters:
+                    channel = channel_class(channel_config.config, http=self.http)
+                else:
+                    channel = channel_class(channel_config.config)
+                if self.cassette is not None:
+                    channel = self.cassette.wrap(channel, f"channel:{channel_name}",
+                                                 CHANNEL_METHODS)
+                self.channels[channel_name] = channel
+            except Exception as e:
+                print(f"Failed to initialize channel {channel_name}: {e}")
+    
+    def reconfigure(self, config: Config, changed: Set[str]) -> None:
+        """Apply a reloaded config, rebuilding only the channels in ``changed``."""
+        self.config = config
+        enabled = self._enabled_channel_configs()
+        if self._http_config() != self.http.config:
+            # New pool settings: every channel moves to a fresh session
+            self.http.close()
+            self.http = HttpClient(self._http_config())
+            changed = set(changed) | set(enabled)
+        for channel_name in list(self.channels):
+            if channel_name in changed or channel_name not in enabled:
+                del self.channels[channel_name]
+        self._initialize_channels({name for name in changed if name in enabled})
     
     def send_notification(self, message: str, event_type: str = "general", **kwargs) -> bool:
         """Send notification to all enabled channels."""
@@ -39,7 +88,8 @@ class NotificationManager:
         success = True
         for channel_name, channel in self.channels.items():
             try:
-                result = channel.send_notification(message, **kwargs)
+                with span('channel', channel_name, event_type=event_type):
+                    result = channel.send_notification(message, **kwargs)
                 if not result:
                     success = False
                     print(f"Failed to send notification via {channel_name}")
@@ -63,4 +113,8 @@ class NotificationManager:
                 print(f"Error testing channel {channel_name}: {e}")
                 results[channel_name] = False
         
-        return results
\ No newline at end of file
+        return results
+    
+    def close(self) -> None:
+        """Close the shared HTTP session."""
+        self.http.close()
@@ -1,16 +1,26 @@
 """Matrix notification channel."""
 
-import requests
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from ..core.interfaces import NotificationChannel
+from ..core.interfaces import NotificationChannel, AsyncNotificationChannel
+from .http import HttpClient
+
+
+def _build_message(title: str, message: str) -> Dict[str, Any]:
+    """Build a Matrix message payload with rich formatting."""
+    return {
+        'msgtype': 'm.text',
+        'body': f"{title}\n\n{message}",  # Plain text fallback
+        'format': 'org.matrix.custom.html',
+        'formatted_body': f"<b>{title}</b><br><br>{message.replace(chr(10), '<br>')}"
+    }
 
 
 class MatrixChannel(NotificationChannel):
     """Matrix notification channel."""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], http: Optional[HttpClient] = None):
         """Initialize Matrix channel."""
         self.config = config
         self.homeserver = config.get('homeserver')
@@ -23,6 +33,7 @@ class MatrixChannel(NotificationChannel):
         # Ensure homeserver has proper format
         if not self.homeserver.startswith('http'):
             self.homeserver = f"https://{self.homeserver}"
+        self.http = http or HttpClient()
     
     def send_notification(self, message: str, **kwargs) -> bool:
         """Send notification via Matrix."""
@@ -38,18 +49,12 @@ class MatrixChannel(NotificationChannel):
             }
             
             # Message payload with rich formatting
-            payload = {
-                'msgtype': 'm.text',
-                'body': f"{title}\n\n{message}",  # Plain text fallback
-                'format': 'org.matrix.custom.html',
-                'formatted_body': f"<b>{title}</b><br><br>{message.replace(chr(10), '<br>')}"
-            }
+            payload = _build_message(title, message)
             
-            response = requests.post(
+            response = self.http.post(
                 url,
                 headers=headers,
-                data=json.dumps(payload),
-                timeout=10
+                data=json.dumps(payload)
             )
             
             if response.status_code == 200:
@@ -66,4 +71,65 @@ class MatrixChannel(NotificationChannel):
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate Matrix configuration."""
         required_fields = ['homeserver', 'access_token', 'room_id']
-        return all(field in config for field in required_fields)
\ No newline at end of file
+        return all(field in config for field in required_fields)
+
+
+class AsyncMatrixChannel(AsyncNotificationChannel):
+    """Matrix notification channel using aiohttp."""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize async Matrix channel."""
+        self.config = config
+        self.homeserver = config.get('homeserver')
+        self.access_token = config.get('access_token')
+        self.room_id = config.get('room_id')
+        
+        if not all([self.homeserver, self.access_token, self.room_id]):
+            raise ValueError("Matrix homeserver, access_token, and room_id are required")
+        
+        # Ensure homeserver has proper format
+        if not self.homeserver.startswith('http'):
+            self.homeserver = f"https://{self.homeserver}"
+        self._session = None
+    
+    async def _get_session(self):
+        """Get or create the aiohttp session."""
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError("aiohttp is required for the async Matrix channel")
+            self._session = aiohttp.ClientSession(
+                headers={'Authorization': f'Bearer {self.access_token}'},
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+    
+    async def send_notification(self, message: str, **kwargs) -> bool:
+        """Send notification via Matrix."""
+        try:
+            title = kwargs.get('title', 'UniFi Access PMS')
+            url = f"{self.homeserver}/_matrix/client/r0/rooms/{self.room_id}/send/m.room.message"
+            session = await self._get_session()
+            
+            async with session.post(url, json=_build_message(title, message)) as response:
+                if response.status == 200:
+                    print(f"📱 Matrix notification sent to room {self.room_id}")
+                    return True
+                print(f"⚠️ Matrix notification failed: {response.status} - {await response.text()}")
+                return False
+            
+        except Exception as e:
+            print(f"Failed to send Matrix notification: {e}")
+            return False
+    
+    def validate_config(self, config: Dict[str, Any]) -> bool:
+        """Validate Matrix configuration."""
+        required_fields = ['homeserver', 'access_token', 'room_id']
+        return all(field in config for field in required_fields)
+    
+    async def close(self) -> None:
+        """Close the aiohttp session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
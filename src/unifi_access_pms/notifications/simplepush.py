@@ -1,34 +1,36 @@
 """Simplepush notification channel."""
 
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from ..core.interfaces import NotificationChannel
+from ..core.interfaces import NotificationChannel, AsyncNotificationChannel
+from .http import HttpClient
+
+SIMPLEPUSH_URL = 'https://api.simplepush.io/send'
 
 
 class SimplepushChannel(NotificationChannel):
     """Simplepush notification channel."""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], http: Optional[HttpClient] = None):
         """Initialize Simplepush channel."""
         self.config = config
         self.key = config.get('key')
         if not self.key:
             raise ValueError("Simplepush key is required")
+        self.http = http or HttpClient()
     
     def send_notification(self, message: str, **kwargs) -> bool:
         """Send notification via Simplepush."""
         try:
             title = kwargs.get('title', 'UniFi Access PMS')
             
-            response = requests.post(
-                'https://api.simplepush.io/send',
+            response = self.http.post(
+                SIMPLEPUSH_URL,
                 data={
                     'key': self.key,
                     'title': title,
                     'msg': message
-                },
-                timeout=10
+                }
             )
             
             return response.status_code == 200
@@ -39,4 +41,56 @@ class SimplepushChannel(NotificationChannel):
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate Simplepush configuration."""
-        return 'key' in config and config['key']
\ No newline at end of file
+        return 'key' in config and config['key']
+
+
+class AsyncSimplepushChannel(AsyncNotificationChannel):
+    """Simplepush notification channel using aiohttp."""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize async Simplepush channel."""
+        self.config = config
+        self.key = config.get('key')
+        if not self.key:
+            raise ValueError("Simplepush key is required")
+        self._session = None
+    
+    async def _get_session(self):
+        """Get or create the aiohttp session."""
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError("aiohttp is required for the async Simplepush channel")
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        return self._session
+    
+    async def send_notification(self, message: str, **kwargs) -> bool:
+        """Send notification via Simplepush."""
+        try:
+            title = kwargs.get('title', 'UniFi Access PMS')
+            session = await self._get_session()
+            
+            async with session.post(
+                SIMPLEPUSH_URL,
+                data={
+                    'key': self.key,
+                    'title': title,
+                    'msg': message
+                }
+            ) as response:
+                return response.status == 200
+            
+        except Exception as e:
+            print(f"Failed to send Simplepush notification: {e}")
+            return False
+    
+    def validate_config(self, config: Dict[str, Any]) -> bool:
+        """Validate Simplepush configuration."""
+        return 'key' in config and config['key']
+    
+    async def close(self) -> None:
+        """Close the aiohttp session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
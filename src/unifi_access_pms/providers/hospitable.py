@@ -1,14 +1,23 @@
 """Hospitable provider implementation."""
 
-from typing import List, Dict, Any
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-from ..core.interfaces import ReservationProvider
+from ..core.interfaces import ReservationProvider, AsyncReservationProvider
 from ..core.models import Reservation, Guest
 
+DEFAULT_API_URL = "https://public.api.hospitable.com/v2"
+CONFIRMED_STATUSES = ('confirmed', 'accepted')
+DEFAULT_PAGE_SIZE = 100
+
 
 class HospitableProvider(ReservationProvider):
-    """Hospitable reservation provider."""
+    """Hospitable reservation provider.
+    
+    Reservations are requested for the mapped properties only and consumed
+    page by page; ``iter_reservations`` yields confirmed reservations as each
+    page arrives instead of building the full list first.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize Hospitable provider."""
@@ -16,46 +25,158 @@ class HospitableProvider(ReservationProvider):
         self.api_key = config.get('api_key')
         if not self.api_key:
             raise ValueError("Hospitable API key is required")
+        self.api_url = config.get('api_url', DEFAULT_API_URL).rstrip('/')
+        self.property_ids = list((config.get('property_mappings') or {}).keys())
+        self.per_page = config.get('per_page', DEFAULT_PAGE_SIZE)
+        self.timeout = config.get('timeout', 30)
+        self._session = None
     
-    def get_reservations(self, start_date: datetime, end_date: datetime) -> List[Reservation]:
-        """Fetch reservations from Hospitable."""
-        try:
-            from hospitable_sdk import HospitableSDK
-        except ImportError:
-            raise ImportError("hospitable_sdk is required for Hospitable provider")
-        
-        sdk = HospitableSDK(api_key=self.api_key)
-        
-        # Get reservations
-        reservations = []
-        hospitable_reservations = sdk.reservations.list(
-            start_date=start_date.date(),
-            end_date=end_date.date()
-        )
+    def _get_session(self):
+        """Get or create the HTTP session."""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers.update({
+                'Authorization': f'Bearer {self.api_key}',
+                'Accept': 'application/json'
+            })
+        return self._session
+    
+    def iter_reservations(self, start_date: datetime, end_date: datetime) -> Iterator[Reservation]:
+        """Yield confirmed reservations, fetching one page at a time."""
+        session = self._get_session()
+        url = f"{self.api_url}/reservations"
+        params = _query_params(start_date, end_date, self.property_ids, self.per_page)
         
-        for res in hospitable_reservations:
-            if res.status == 'confirmed':
-                guest = Guest(
-                    first_name=res.guest.first_name or '',
-                    last_name=res.guest.last_name or '',
-                    phone=res.guest.phone,
-                    email=res.guest.email
-                )
-                
-                reservation = Reservation(
-                    id=str(res.id),
-                    guest=guest,
-                    check_in=res.check_in,
-                    check_out=res.check_out,
-                    status=res.status,
-                    property_id=str(res.property_id),
-                    property_name=getattr(res, 'property_name', None)
-                )
-                reservations.append(reservation)
+        while url:
+            response = session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            payload = response.json()
+            
+            for item in payload.get('data', []):
+                if item.get('status') in CONFIRMED_STATUSES:
+                    yield _reservation_from_api(item)
+            
+            # The next link already carries the query string
+            url = (payload.get('links') or {}).get('next')
+            params = None
+    
+    def get_reservations(self, start_date: datetime, end_date: datetime) -> List[Reservation]:
+        """Fetch confirmed reservations from Hospitable."""
+        return list(self.iter_reservations(start_date, end_date))
+    
+    def validate_config(self, config: Dict[str, Any]) -> bool:
+        """Validate Hospitable provider configuration."""
+        required_fields = ['api_key']
+        return all(field in config for field in required_fields)
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp from the Hospitable API."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _reservation_from_api(item: Dict[str, Any]) -> Reservation:
+    """Convert a Hospitable REST API reservation into a Reservation."""
+    guest_data = item.get('guest') or {}
+    phones = guest_data.get('phone_numbers') or []
+    guest = Guest(
+        first_name=guest_data.get('first_name') or '',
+        last_name=guest_data.get('last_name') or '',
+        phone=phones[0] if phones else guest_data.get('phone'),
+        email=guest_data.get('email')
+    )
+
+    properties = item.get('properties') or []
+    property_data = properties[0] if properties else {}
+    status = item.get('status', '')
+
+    return Reservation(
+        id=str(item['id']),
+        guest=guest,
+        check_in=_parse_datetime(item.get('check_in') or item.get('arrival_date')),
+        check_out=_parse_datetime(item.get('check_out') or item.get('departure_date')),
+        status='confirmed' if status in CONFIRMED_STATUSES else status,
+        property_id=str(property_data.get('id') or item.get('property_id', '')),
+        property_name=property_data.get('name')
+    )
+
+
+def _query_params(start_date: datetime, end_date: datetime, property_ids: List[str],
+                  per_page: int) -> List[Tuple[str, Any]]:
+    """Query string restricting the listing to the window and mapped properties."""
+    return [
+        ('start_date', start_date.date().isoformat()),
+        ('end_date', end_date.date().isoformat()),
+        ('include', 'guest,properties'),
+        ('per_page', str(per_page)),
+    ] + [('properties[]', property_id) for property_id in property_ids]
+
+
+class AsyncHospitableProvider(AsyncReservationProvider):
+    """Hospitable reservation provider talking to the REST API with aiohttp."""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize async Hospitable provider."""
+        self.config = config
+        self.api_key = config.get('api_key')
+        if not self.api_key:
+            raise ValueError("Hospitable API key is required")
+        self.api_url = config.get('api_url', DEFAULT_API_URL).rstrip('/')
+        self.property_ids = list((config.get('property_mappings') or {}).keys())
+        self.per_page = config.get('per_page', DEFAULT_PAGE_SIZE)
+        self.timeout = config.get('timeout', 30)
+        self._session = None
+    
+    async def _get_session(self):
+        """Get or create the aiohttp session."""
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError("aiohttp is required for the async Hospitable provider")
+            self._session = aiohttp.ClientSession(
+                headers={
+                    'Authorization': f'Bearer {self.api_key}',
+                    'Accept': 'application/json'
+                },
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def iter_reservations(self, start_date: datetime,
+                                end_date: datetime) -> AsyncIterator[Reservation]:
+        """Yield confirmed reservations, fetching one page at a time."""
+        session = await self._get_session()
+        url = f"{self.api_url}/reservations"
+        params = _query_params(start_date, end_date, self.property_ids, self.per_page)
         
-        return reservations
+        while url:
+            async with session.get(url, params=params) as response:
+                response.raise_for_status()
+                payload = await response.json()
+            
+            for item in payload.get('data', []):
+                if item.get('status') in CONFIRMED_STATUSES:
+                    yield _reservation_from_api(item)
+            
+            # The next link already carries the query string
+            url = (payload.get('links') or {}).get('next')
+            params = None
+    
+    async def get_reservations(self, start_date: datetime, end_date: datetime) -> List[Reservation]:
+        """Fetch confirmed reservations from Hospitable."""
+        return [reservation async for reservation in self.iter_reservations(start_date, end_date)]
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate Hospitable provider configuration."""
         required_fields = ['api_key']
-        return all(field in config for field in required_fields)
\ No newline at end of file
+        return all(field in config for field in required_fields)
+    
+    async def close(self) -> None:
+        """Close the aiohttp session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,247 @@
+"""End-to-end sync pipeline shared by the CLI commands."""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from .config.models import Config, ProviderConfig
+from .config.watcher import ConfigChanges
+from .core.audit import AuditStore
+from .core.cassette import CONTROLLER_METHODS, PROVIDER_METHODS, Cassette
+from .core.execution import ProviderExecutor
+from .core.locking import SingleFlight, controller_scopes, sync_scope
+from .core.merge import ReservationMerger
+from .core.models import Reservation, SyncResult
+from .core.profiling import span
+from .core.registry import ProviderRegistry
+from .core.sharding import ShardCoordinator
+from .core.snapshots import SnapshotStore
+from .core.sync import ControllerFanOut
+from .core.transitions import Transition
+from .integrations.pool import ControllerPool
+from .integrations.unifi_access import UniFiAccessClient
+
+
+class SyncRunner:
+    """Fetches reservations from providers and reconciles every controller.
+
+    The provider executor and controller pool are kept between runs so
+    long-running processes reuse warm clients, rate limiters and snapshots.
+    With ``core.shard_store`` set, controllers are partitioned between all
+    runners sharing that store and each runner only syncs those it leases.
+    With a ``cassette`` every provider and controller call is recorded, or
+    replayed without touching the network, the journal, snapshots, the audit
+    log or shard leases.
+    """
+
+    def __init__(self, config: Config, provider_names: Optional[List[str]] = None,
+                 dry_run: bool = False, pool: Optional[ControllerPool] = None,
+                 cassette: Optional[Cassette] = None):
+        """Initialize sync runner."""
+        self.config = config
+        self._explicit_providers = provider_names
+        self.provider_names = provider_names or config.core.enabled_providers
+        self.dry_run = dry_run
+        self.cassette = cassette
+        replaying = cassette is not None and cassette.replaying
+        self._replaying = replaying
+        if pool is None and cassette is not None:
+            pool = ControllerPool(factory=self._recorded_client)
+        self.pool = pool or ControllerPool()
+        self.executor = ProviderExecutor.from_config(config, self.provider_names)
+        if cassette is not None:
+            for name, provider in list(self.executor.providers.items()):
+                self.executor.providers[name] = self._recorded_provider(name, provider)
+            if replaying:
+                self.executor.snapshots = None
+        self.merger = ReservationMerger(self.executor.configs)
+        self.reservations: List[Reservation] = []
+        # Transitions and scheduled syncs of one process take turns on the controllers
+        self._write_lock = threading.Lock()
+        self.audit = self._open_audit()
+        self.shards = self._open_shards()
+
+    def _open_audit(self) -> Optional[AuditStore]:
+        if self.config.core.audit_db and not self.dry_run and not self._replaying:
+            return AuditStore(self.config.core.audit_db)
+        return None
+
+    def _open_shards(self) -> Optional[ShardCoordinator]:
+        core = self.config.core
+        if not core.shard_store or self.dry_run or self._replaying:
+            return None
+        shards = ShardCoordinator(core.shard_store, self._controller_keys(),
+                                  node_id=core.node_id, lease_ttl=core.shard_lease_ttl)
+        shards.start()
+        return shards
+
+    def _recorded_provider(self, name: str, provider):
+        return self.cassette.wrap(provider, f"provider:{name}", PROVIDER_METHODS)
+
+    def _recorded_client(self, config):
+        client = None if self.cassette.replaying else UniFiAccessClient.from_config(config)
+        return self.cassette.wrap(client, f"controller:{config.name or config.api_host}",
+                                  CONTROLLER_METHODS)
+
+    @property
+    def controllers(self):
+        """Controllers this runner syncs."""
+        return self.config.unifi.get_controllers()
+
+    def _controller_keys(self) -> List[str]:
+        return [c.name or c.api_host for c in self.controllers]
+
+    @property
+    def scopes(self) -> List[str]:
+        """Lock scopes of this run, one per controller host."""
+        return controller_scopes(c.api_host for c in self.controllers)
+
+    def single_flight(self) -> SingleFlight:
+        """Cross-process lock on every controller this runner writes to.
+
+        Each controller has its own lock, shared with any other process
+        syncing it (e.g. the legacy script), whichever other controllers
+        that process covers.
+        """
+        return SingleFlight(self.scopes, self.config.core.lock_dir)
+
+    @property
+    def grace_period(self) -> timedelta:
+        """How long guests keep access after check-out."""
+        return timedelta(seconds=self.config.core.checkout_grace_period)
+
+    def _fan_out(self, owned: Optional[Set[str]] = None) -> ControllerFanOut:
+        journal_dir = self.config.core.journal_dir
+        if self.cassette is not None and self.cassette.replaying:
+            journal_dir = None
+        lease = self.shards.owned if self.shards is not None else None
+        return ControllerFanOut(self.controllers, self.pool.get, dry_run=self.dry_run,
+                                journal_dir=journal_dir, audit=self.audit,
+                                grace_period=self.grace_period, owned=owned,
+                                imminent_window=self.config.core.imminent_checkin_window,
+                                write_budget=self.config.core.write_budget, lease=lease)
+
+    def sync(self, start_date: datetime, end_date: datetime) -> Dict[str, SyncResult]:
+        """Fetch and merge reservations for the window and sync every controller.
+
+        Reservations that checked out within the grace period are still
+        fetched so their visitors are not deleted early. Shards are
+        rebalanced under the write lock, so no transition is writing to a
+        controller this node gives up, and every write re-checks its lease.
+        """
+        owned = None
+        if self.shards is not None:
+            with self._write_lock:
+                owned = self.shards.acquire()
+            if not owned:
+                print(f"💤 Node {self.shards.node_id} holds no controller shards")
+                return {}
+            print(f"🧩 Node {self.shards.node_id} syncing {', '.join(sorted(owned))}")
+
+        fetch_start = start_date - self.grace_period
+        with span('sync', 'fetch_all'):
+            fetched = self.executor.fetch_all(fetch_start, end_date)
+        with span('sync', 'merge', reservations=len(fetched)):
+            reservations = self.merger.merge(fetched)
+        self.reservations = reservations
+        if self.merger.duplicates:
+            print(f"🔗 Merged {self.merger.duplicates} duplicate reservations across providers")
+        if self.executor.stale:
+            print(f"⚠️ No fresh data from {', '.join(sorted(self.executor.stale))}; "
+                  "deletions suppressed")
+
+        with self._write_lock:
+            return self._fan_out(owned).sync(reservations,
+                                             allow_deletes=not self.executor.stale,
+                                             window_end=end_date)
+
+    def transition(self, transition: Transition) -> None:
+        """Apply a single check-in or check-out transition.
+
+        Revokes are dropped while the last fetch relied on snapshots or
+        missed a provider, like deletions in ``sync``; the next fresh sync
+        removes the visitor if the stay really ended.
+        """
+        reservation = transition.reservation
+        if transition.action == 'revoke' and self.executor.stale:
+            print(f"⏳ Keeping access for {reservation.guest_name} while "
+                  f"{', '.join(sorted(self.executor.stale))} data is stale")
+            return
+        controller = self._fan_out().controller_for(reservation)
+        if controller is None:
+            return
+        # Same per-controller lock as syncs, taken before the write lock like theirs
+        lock = SingleFlight(sync_scope([controller.api_host]), self.config.core.lock_dir)
+        with lock.hold(), self._write_lock:
+            owned = self.shards.owned() if self.shards is not None else None
+            result = self._fan_out(owned).transition(reservation, transition.action,
+                                                     self.reservations)
+        if result is None:
+            return
+        if result.created or result.updated:
+            print(f"🔓 Activated access for {reservation.guest_name}")
+        elif result.deleted:
+            print(f"🔒 Revoked access for {reservation.guest_name}")
+        for error in result.errors + result.deferred:
+            print(f"⚠️ {transition.action} {reservation.guest_name}: {error}")
+
+    def reconfigure(self, config: Config, changes: ConfigChanges) -> None:
+        """Apply a reloaded config, rebuilding only what changed.
+
+        Unchanged providers keep their stats and snapshots, and unchanged
+        controllers keep their pooled clients, rate limiters and breakers.
+        """
+        previous = self.config.core
+        self.config = config
+
+        if changes.core:
+            core = config.core
+            if not self._replaying:
+                self.executor.snapshots = (SnapshotStore(core.snapshot_dir)
+                                           if core.snapshot_dir else None)
+            self.executor.max_staleness = core.max_snapshot_staleness
+            if core.audit_db != previous.audit_db:
+                # Swap between runs and transitions; the old store flushes on close
+                with self._write_lock:
+                    if self.audit is not None:
+                        self.audit.close()
+                    self.audit = self._open_audit()
+                print(f"🔁 Audit log now at {core.audit_db}" if core.audit_db
+                      else "🔁 Audit log disabled")
+            shard_settings = ('shard_store', 'node_id', 'shard_lease_ttl')
+            if any(getattr(core, s) != getattr(previous, s) for s in shard_settings):
+                # Leave the old ring (releasing every lease) before joining the new one
+                with self._write_lock:
+                    if self.shards is not None:
+                        self.shards.stop()
+                    self.shards = self._open_shards()
+                print("🔁 Rejoined controller shards with the new settings")
+
+        names = self._explicit_providers or config.core.enabled_providers
+        all_configs = config.providers or {}
+        for name in set(self.provider_names) | set(names):
+            provider_config = all_configs.get(name, ProviderConfig())
+            if name not in names or not provider_config.enabled:
+                self.executor.remove_provider(name)
+            elif name in changes.providers or name not in self.executor.providers:
+                provider_class = ProviderRegistry.get_provider(name)
+                provider = provider_class(provider_config.config)
+                if self.cassette is not None:
+                    provider = self._recorded_provider(name, provider)
+                self.executor.set_provider(name, provider, provider_config)
+                print(f"🔁 Reloaded provider {name}")
+        self.provider_names = names
+
+        for host in changes.controllers:
+            self.pool.discard(host)
+            print(f"🔁 Reloaded controller {host}")
+        if self.shards is not None:
+            self.shards.shards = self._controller_keys()
+
+    def close(self) -> None:
+        """Release provider threads and shard leases and flush the audit log."""
+        self.executor.close()
+        if self.shards is not None:
+            self.shards.stop()
+        if self.audit is not None:
+            self.audit.close()
@@ -0,0 +1,33 @@
+"""Shared test helpers."""
+
+from datetime import datetime
+
+from src.unifi_access_pms.core.models import Guest, Reservation
+
+
+class FakeClock:
+    """Manually advanced clock; ``sleep`` just moves it forward."""
+
+    def __init__(self, now=0.0):
+        self.now = now.timestamp() if isinstance(now, datetime) else now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_reservation(reservation_id="r1", first_name="Ann", last_name="Guest", phone="5551234",
+                     check_in=datetime(2024, 1, 1, 15, 0), check_out=datetime(2024, 1, 3, 11, 0),
+                     property_id="prop_1", provider=None):
+    """Build a confirmed reservation, two nights by default."""
+    return Reservation(
+        id=reservation_id,
+        guest=Guest(first_name=first_name, last_name=last_name, phone=phone),
+        check_in=check_in,
+        check_out=check_out,
+        status="confirmed",
+        property_id=property_id,
+        provider=provider
+    )
@@ -0,0 +1,112 @@
+"""Test async adapters and native async plugins."""
+
+import asyncio
+from datetime import datetime
+
+from src.unifi_access_pms.core.adapters import AsyncIntegrationAdapter, AsyncProviderAdapter
+from src.unifi_access_pms.core.interfaces import ReservationProvider
+from src.unifi_access_pms.core.models import Guest, Reservation, Visitor
+from src.unifi_access_pms.providers.hospitable import HospitableProvider, _reservation_from_api
+
+
+class StaticProvider(ReservationProvider):
+    def get_reservations(self, start_date, end_date):
+        return [Reservation(
+            id="r1",
+            guest=Guest(first_name="Jane", last_name="Smith"),
+            check_in=start_date,
+            check_out=end_date,
+            status="confirmed",
+            property_id="prop_1"
+        )]
+
+    def validate_config(self, config):
+        return True
+
+
+class StaticIntegration:
+    def get_visitors(self):
+        return [Visitor(id="1", name="Jane Smith", pin="1234")]
+
+    def delete_visitor(self, visitor_id):
+        return visitor_id == "1"
+
+
+def test_provider_adapter_runs_sync_provider():
+    """Test a sync provider can be awaited through the adapter."""
+    adapter = AsyncProviderAdapter(StaticProvider())
+
+    reservations = asyncio.run(
+        adapter.get_reservations(datetime(2024, 1, 1), datetime(2024, 1, 2)))
+
+    assert [r.id for r in reservations] == ["r1"]
+
+
+def test_integration_adapter_runs_concurrently():
+    """Test integration calls can be gathered on one event loop."""
+    adapter = AsyncIntegrationAdapter(StaticIntegration())
+
+    async def run():
+        return await asyncio.gather(adapter.get_visitors(), adapter.delete_visitor("1"))
+
+    visitors, deleted = asyncio.run(run())
+
+    assert visitors[0].name == "Jane Smith"
+    assert deleted is True
+
+
+def test_reservation_from_hospitable_api():
+    """Test REST API payloads map onto Reservation."""
+    reservation = _reservation_from_api({
+        'id': 'abc',
+        'status': 'accepted',
+        'check_in': '2024-01-01T16:00:00Z',
+        'check_out': '2024-01-03T11:00:00Z',
+        'guest': {'first_name': 'Jane', 'last_name': 'Smith',
+                  'phone_numbers': ['+15551234567']},
+        'properties': [{'id': 'prop_1', 'name': 'Cabin'}],
+    })
+
+    assert reservation.status == 'confirmed'
+    assert reservation.property_id == 'prop_1'
+    assert reservation.guest.phone == '+15551234567'
+    assert reservation.check_in.hour == 16
+
+
+def test_hospitable_pages_are_read_lazily():
+    """Test pages are only requested as reservations are consumed."""
+    pages = {
+        'first': {'data': [{'id': '1', 'status': 'accepted', 'guest': {'first_name': 'A'}},
+                           {'id': '2', 'status': 'cancelled'}],
+                  'links': {'next': 'second'}},
+        'second': {'data': [{'id': '3', 'status': 'accepted', 'guest': {'first_name': 'B'}}],
+                   'links': {}},
+    }
+
+    class Response:
+        def __init__(self, payload):
+            self.payload = payload
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.payload
+
+    class Session:
+        def __init__(self):
+            self.requests = []
+
+        def get(self, url, params=None, timeout=None):
+            self.requests.append((url, params))
+            return Response(pages['first' if url.endswith('/reservations') else url])
+
+    provider = HospitableProvider({'api_key': 'key', 'property_mappings': {'p1': 'door'}})
+    provider._session = Session()
+    reservations = provider.iter_reservations(datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+    assert next(reservations).id == '1'
+    assert len(provider._session.requests) == 1
+    assert ('properties[]', 'p1') in provider._session.requests[0][1]
+    assert [r.id for r in reservations] == ['3']
+    assert provider._session.requests[1] == ('second', None)
@@ -0,0 +1,104 @@
+"""Test the SQLite audit log."""
+
+from datetime import datetime
+
+from src.unifi_access_pms.config.models import Config
+from src.unifi_access_pms.config.watcher import diff_configs
+from src.unifi_access_pms.core.audit import AuditStore
+from src.unifi_access_pms.core.models import SyncResult, Visitor
+from src.unifi_access_pms.core.sync import SyncEngine
+from src.unifi_access_pms.runner import SyncRunner
+from tests.conftest import make_reservation
+
+
+class IdIntegration:
+    def __init__(self, visitors):
+        self.visitors = visitors
+
+    def get_visitors(self):
+        return list(self.visitors)
+
+    def create_visitor(self, visitor):
+        return "v-new"
+
+    def update_visitor(self, visitor_id, visitor):
+        return True
+
+    def delete_visitor(self, visitor_id):
+        return False
+
+
+def test_engine_records_operations_and_outcomes(tmp_path):
+    """Test every write is recorded with its outcome and PIN change flag."""
+    store = AuditStore(str(tmp_path / "audit.db"))
+    visitors = [
+        Visitor(id="v-bob", name="Bob Guest", pin="0000",
+                start_time=datetime(2024, 1, 1, 15, 0), end_time=datetime(2024, 1, 3, 11, 0)),
+        Visitor(id="v-old", name="Old Guest", pin="0000"),
+    ]
+    reservations = [make_reservation("r1", "Ann", phone="5551234"),
+                    make_reservation("r2", "Bob", phone="5559999")]
+
+    engine = SyncEngine(IdIntegration(visitors), audit=store, run_id="run1", controller="main")
+    engine.sync(reservations)
+    store.close()
+
+    ann = store.history(reservation_id="r1")
+    assert [(e.action, e.status, e.visitor_id) for e in ann] == [('create', 'ok', 'v-new')]
+
+    bob = store.history(visitor_id="v-bob")
+    assert bob[0].action == 'update' and bob[0].pin_changed
+    assert bob[0].property_id == "prop_1" and bob[0].controller == "main"
+
+    old = store.history(name="Old Guest")
+    assert [(e.action, e.status) for e in old] == [('delete', 'failed')]
+
+
+def test_reservation_history_follows_created_visitor(tmp_path):
+    """Test a reservation's history includes the later delete of its visitor."""
+    store = AuditStore(str(tmp_path / "audit.db"))
+    engine = SyncEngine(IdIntegration([]), audit=store, run_id="run1")
+    engine.sync([make_reservation("r1", "Ann", phone="5551234")])
+
+    class Deleting(IdIntegration):
+        def delete_visitor(self, visitor_id):
+            return True
+
+    later = SyncEngine(Deleting([Visitor(id="v-new", name="Ann Guest", pin="1234")]),
+                       audit=store, run_id="run2")
+    later.sync([])
+    store.flush()
+
+    history = store.history(reservation_id="r1")
+    assert [e.action for e in history] == ['delete', 'create']
+    assert [e.run_id for e in history] == ['run2', 'run1']
+    store.close()
+
+
+def test_records_run_summaries(tmp_path):
+    """Test run summaries are queryable newest first."""
+    store = AuditStore(str(tmp_path / "audit.db"))
+    for run_id in ("a", "b"):
+        store.record_run(run_id, "main", float(ord(run_id)), SyncResult(created=1))
+    store.close()
+
+    assert [run.run_id for run in store.runs()] == ["b", "a"]
+
+
+def test_reload_moves_audit_log_to_new_path(tmp_path):
+    """Test a changed core.audit_db closes the old store and opens the new one."""
+    def make_config(audit_db):
+        return Config.from_dict({
+            'core': {'enabled_providers': [], 'snapshot_dir': None, 'audit_db': audit_db},
+            'unifi': {'api_host': 'https://main.local', 'api_token': 'token'},
+        })
+    old_config = make_config(str(tmp_path / "old.db"))
+    new_config = make_config(str(tmp_path / "new.db"))
+    runner = SyncRunner(old_config)
+    old_store = runner.audit
+
+    runner.reconfigure(new_config, diff_configs(old_config, new_config))
+
+    assert runner.audit.path == str(tmp_path / "new.db")
+    assert not old_store._writer.is_alive()
+    runner.close()
@@ -0,0 +1,111 @@
+"""Test recording and replaying provider and controller traffic."""
+
+from datetime import datetime
+
+import pytest
+
+from src.unifi_access_pms.config.models import Config
+from src.unifi_access_pms.core.cassette import CONTROLLER_METHODS, Cassette, CassetteMiss
+from src.unifi_access_pms.core.interfaces import ReservationProvider
+from src.unifi_access_pms.core.models import Visitor
+from src.unifi_access_pms.core.registry import ProviderRegistry
+from src.unifi_access_pms.core.resilience import RateLimitExceeded
+from src.unifi_access_pms.integrations.pool import ControllerPool
+from src.unifi_access_pms.runner import SyncRunner
+from tests.conftest import FakeClock, make_reservation
+
+
+class RecordedProvider(ReservationProvider):
+    calls = 0
+
+    def __init__(self, config):
+        self.config = config
+
+    def get_reservations(self, start_date, end_date):
+        RecordedProvider.calls += 1
+        return [make_reservation("r1")]
+
+    def validate_config(self, config):
+        return True
+
+
+class FakeController:
+    def __init__(self, clock=None):
+        self.clock = clock
+        self.created = []
+
+    def get_visitors(self):
+        if self.clock is not None:
+            self.clock.now += 0.25
+        return [Visitor(id="v-old", name="Old Guest", pin="0000")]
+
+    def create_visitor(self, visitor):
+        self.created.append(visitor)
+        return "v-new"
+
+    def update_visitor(self, visitor_id, visitor):
+        return True
+
+    def delete_visitor(self, visitor_id):
+        raise RateLimitExceeded("throttled", retry_after=2.0)
+
+
+def test_replay_returns_recorded_results_and_errors(tmp_path):
+    """Test results, exceptions and their order survive a round trip."""
+    path = str(tmp_path / "run.json.gz")
+    clock = FakeClock()
+    recorder = Cassette(path, clock=clock)
+    controller = recorder.wrap(FakeController(clock), "controller:main", CONTROLLER_METHODS)
+
+    visitors = controller.get_visitors()
+    assert controller.create_visitor(Visitor(name="Ann Guest", pin="1234")) == "v-new"
+    with pytest.raises(RateLimitExceeded):
+        controller.delete_visitor("v-old")
+    recorder.save()
+
+    slept = []
+    player = Cassette(path, replaying=True, realtime=True, sleep=slept.append)
+    replayed = player.wrap(None, "controller:main", CONTROLLER_METHODS)
+
+    assert replayed.get_visitors() == visitors
+    assert replayed.create_visitor(Visitor(name="Ann Guest", pin="1234")) == "v-new"
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        replayed.delete_visitor("v-old")
+    assert excinfo.value.retry_after == 2.0
+    assert slept == [0.25, 0.0, 0.0]
+    with pytest.raises(CassetteMiss):
+        replayed.get_visitors()
+
+
+def test_runner_replays_recorded_sync_offline(tmp_path):
+    """Test a recorded sync replays without calling providers or controllers."""
+    ProviderRegistry.register('recorded', RecordedProvider)
+    config = Config.from_dict({
+        'core': {'enabled_providers': ['recorded'], 'snapshot_dir': None,
+                 'journal_dir': str(tmp_path / "journal"), 'audit_db': None},
+        'unifi': {'api_host': 'https://main.local', 'api_token': 'token'},
+        'providers': {'recorded': {'config': {}}}
+    })
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 31)
+    path = str(tmp_path / "run.json")
+
+    recorder = Cassette.record(path)
+    controller = FakeController()
+    pool = ControllerPool(factory=lambda c: recorder.wrap(
+        controller, f"controller:{c.api_host}", CONTROLLER_METHODS))
+    runner = SyncRunner(config, pool=pool, cassette=recorder)
+    recorded = runner.sync(start, end)
+    runner.close()
+    recorder.save()
+
+    calls = RecordedProvider.calls
+    player = Cassette.replay(path)
+    runner = SyncRunner(config, cassette=player)
+    replayed = runner.sync(start, end)
+    runner.close()
+
+    assert RecordedProvider.calls == calls
+    assert len(controller.created) == 1
+    assert replayed == recorded
+    assert replayed['https://main.local'].created == 1
+    assert player.unused() == 0
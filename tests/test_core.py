@@ -1,9 +1,13 @@
 """Test core functionality."""
 
+import threading
+
 import pytest
 from datetime import datetime
 
+from src.unifi_access_pms.config.models import UniFiConfig
 from src.unifi_access_pms.core.models import Guest, Reservation, Visitor
+from src.unifi_access_pms.core.sync import ControllerFanOut
 
 
 def test_guest_creation():
@@ -56,4 +60,56 @@ def test_visitor_validation():
         Visitor(name="", pin="1234")  # Empty name
     
     with pytest.raises(ValueError):
-        Visitor(name="Test", pin="12")  # Short PIN
\ No newline at end of file
+        Visitor(name="Test", pin="12")  # Short PIN
+
+
+def test_controllers_inherit_shared_settings():
+    """Test per-controller config inherits the top-level UniFi section."""
+    unifi = UniFiConfig.from_dict({
+        'api_token': 'shared',
+        'rate_limit': 5,
+        'controllers': [
+            {'name': 'a', 'api_host': 'https://a', 'properties': ['p1']},
+            {'api_host': 'https://b', 'api_token': 'own'},
+        ]
+    })
+
+    a, b = unifi.get_controllers()
+    assert (a.api_token, a.rate_limit, a.properties) == ('shared', 5, ['p1'])
+    assert (b.name, b.api_token, b.properties) == ('https://b', 'own', [])
+
+
+def test_fan_out_routes_by_property():
+    """Test reservations are routed to their controller with a catch-all."""
+    controllers = [
+        UniFiConfig(name='a', api_host='https://a', properties=['p1']),
+        UniFiConfig(name='b', api_host='https://b'),
+    ]
+    guest = Guest(first_name="Jane", last_name="Smith")
+    reservations = [
+        Reservation(id=str(i), guest=guest, check_in=datetime(2024, 1, 1),
+                    check_out=datetime(2024, 1, 2), status="confirmed", property_id=p)
+        for i, p in enumerate(['p1', 'p2'])
+    ]
+
+    routes = ControllerFanOut(controllers, client_for=None).route(reservations)
+
+    assert [r.property_id for r in routes['a']] == ['p1']
+    assert [r.property_id for r in routes['b']] == ['p2']
+
+
+def test_fan_out_syncs_controllers_concurrently():
+    """Test every controller is synced at the same time, not one after another."""
+    controllers = [UniFiConfig(name=name, api_host=f"https://{name}") for name in "abc"]
+    # Each listing blocks until all three controllers are listing at once
+    barrier = threading.Barrier(len(controllers), timeout=2)
+
+    class BlockingIntegration:
+        def get_visitors(self):
+            barrier.wait()
+            return []
+
+    results = ControllerFanOut(controllers, lambda c: BlockingIntegration()).sync([])
+
+    assert sorted(results) == ['a', 'b', 'c']
+    assert all(not result.errors for result in results.values())
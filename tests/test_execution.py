@@ -0,0 +1,182 @@
+"""Test provider retries and failover."""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from src.unifi_access_pms.config.models import ProviderConfig
+from src.unifi_access_pms.core.execution import ProviderExecutor, ProviderError
+from src.unifi_access_pms.core.interfaces import ReservationProvider
+from src.unifi_access_pms.core.models import SyncResult, Visitor
+from src.unifi_access_pms.core.snapshots import SnapshotStore
+from src.unifi_access_pms.core.sync import SyncEngine
+from tests.conftest import make_reservation
+
+
+class FlakyProvider(ReservationProvider):
+    def __init__(self, failures=0, delay=0.0, reservation_id="r1"):
+        self.failures = failures
+        self.delay = delay
+        self.reservation_id = reservation_id
+        self.calls = 0
+
+    def get_reservations(self, start_date, end_date):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.calls <= self.failures:
+            raise RuntimeError("transient")
+        return [make_reservation(self.reservation_id)]
+
+    def validate_config(self, config):
+        return True
+
+
+class StaticProvider(ReservationProvider):
+    def __init__(self, property_ids):
+        self.property_ids = property_ids
+        self.calls = 0
+
+    def get_reservations(self, start_date, end_date):
+        self.calls += 1
+        return [make_reservation(property_id, property_id=property_id)
+                for property_id in self.property_ids]
+
+    def validate_config(self, config):
+        return True
+
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 31)
+
+
+def test_retries_until_success():
+    """Test transient failures are retried and counted."""
+    provider = FlakyProvider(failures=2)
+    executor = ProviderExecutor({"p": provider},
+                                {"p": ProviderConfig(retry_attempts=2, retry_delay=0)})
+
+    reservations = executor.fetch_all(START, END)
+
+    assert [r.id for r in reservations] == ["r1"]
+    assert executor.stats["p"].attempts == 3
+    assert executor.stats["p"].failures == 2
+    assert len(executor.stats["p"].latencies) == 3
+
+
+def test_gives_up_after_retry_attempts():
+    """Test the executor stops after retry_attempts retries."""
+    executor = ProviderExecutor({"p": FlakyProvider(failures=5)},
+                                {"p": ProviderConfig(retry_attempts=1, retry_delay=0)})
+
+    with pytest.raises(ProviderError):
+        executor.fetch_all(START, END)
+    assert executor.stats["p"].attempts == 2
+
+
+def test_failover_to_lower_priority_on_deadline():
+    """Test a slow primary falls back to the provider for the same property."""
+    mappings = {"property_mappings": {"listing": "door-1"}}
+    primary = FlakyProvider(delay=0.5, reservation_id="primary")
+    backup = FlakyProvider(reservation_id="backup")
+    executor = ProviderExecutor(
+        {"primary": primary, "backup": backup},
+        {
+            "primary": ProviderConfig(config=mappings, priority=100, timeout=0.05),
+            "backup": ProviderConfig(config=mappings, priority=90),
+        }
+    )
+
+    assert executor.failover_groups() == [["primary", "backup"]]
+    reservations = executor.fetch_all(START, END)
+    executor.close()
+
+    assert [r.id for r in reservations] == ["backup"]
+    assert executor.stats["primary"].deadline_misses == 1
+
+
+def test_lower_priority_provider_fills_door_groups_the_primary_lacks():
+    """Test failover is per door group when providers only partly overlap."""
+    hospitable = StaticProvider(["p1", "p2"])
+    ics = StaticProvider(["x", "y"])
+    executor = ProviderExecutor(
+        {"hospitable": hospitable, "ics": ics},
+        {
+            "hospitable": ProviderConfig(priority=100, config={
+                "property_mappings": {"p1": "door_a", "p2": "door_b"}}),
+            "ics": ProviderConfig(priority=90, config={
+                "property_mappings": {"x": "door_b", "y": "door_c"}}),
+        }
+    )
+
+    reservations = executor.fetch_all(START, END)
+
+    assert executor.failover_groups() == [["hospitable", "ics"]]
+    assert ics.calls == 1
+    # Duplicates for the shared door_b are left to ReservationMerger
+    assert sorted(r.id for r in reservations) == ["p1", "p2", "x", "y"]
+
+
+def test_failed_provider_in_covered_group_suppresses_deletes():
+    """Test a failed provider's unique stays are not deleted when others cover its doors."""
+    mappings = {"property_mappings": {"listing": "door-1"}}
+    executor = ProviderExecutor(
+        {"hospitable": FlakyProvider(reservation_id="h1"), "ics": FlakyProvider(failures=5)},
+        {
+            "hospitable": ProviderConfig(config=mappings, priority=100),
+            "ics": ProviderConfig(config=mappings, priority=90, retry_attempts=0),
+        }
+    )
+    ics_guest = Visitor(id="v-ics", name="Ics Guest", pin="1234",
+                        start_time=datetime(2024, 1, 10), end_time=datetime(2024, 1, 12))
+
+    reservations = executor.fetch_all(START, END)
+    executor.close()
+    result = SyncResult()
+    operations = SyncEngine(None).plan(reservations, [ics_guest], result,
+                                       allow_deletes=not executor.stale)
+
+    assert [r.id for r in reservations] == ["h1"]
+    assert executor.stale == {"ics"}
+    assert all(op.action != 'delete' for op in operations)
+    assert result.deferred == ["delete Ics Guest: suppressed while data is stale"]
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test snapshots survive a save/load round trip."""
+    store = SnapshotStore(str(tmp_path))
+    store.save("p", [make_reservation("r1")])
+
+    snapshot = store.load("p")
+
+    assert snapshot.reservations == [make_reservation("r1")]
+    assert snapshot.age < 60
+
+
+def test_serves_stale_snapshot_when_provider_fails(tmp_path):
+    """Test a failing provider falls back to its snapshot and is marked stale."""
+    store = SnapshotStore(str(tmp_path))
+    store.save("p", [make_reservation("cached")])
+    provider = FlakyProvider(failures=5)
+    executor = ProviderExecutor({"p": provider},
+                                {"p": ProviderConfig(retry_attempts=0)},
+                                snapshots=store)
+
+    reservations = executor.fetch_all(START, END)
+    executor.close()
+
+    assert [r.id for r in reservations] == ["cached"]
+    assert executor.stale == {"p"}
+
+
+def test_stale_snapshot_beyond_bound_is_ignored(tmp_path):
+    """Test snapshots older than max_staleness are not used."""
+    store = SnapshotStore(str(tmp_path))
+    store.save("p", [make_reservation("cached")], fetched_at=datetime(2000, 1, 1))
+    executor = ProviderExecutor({"p": FlakyProvider(failures=5)},
+                                {"p": ProviderConfig(retry_attempts=0)},
+                                snapshots=store, max_staleness=60)
+
+    with pytest.raises(ProviderError):
+        executor.fetch_all(START, END)
@@ -0,0 +1,66 @@
+"""Test concurrent health probing."""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from src.unifi_access_pms.core.health import ProbeTarget, percentile, probe_all
+
+
+def test_percentile_uses_nearest_rank():
+    """Test p50 and p95 over a small sample."""
+    values = [0.5, 0.1, 0.4, 0.2, 0.3]
+
+    assert percentile(values, 50) == 0.3
+    assert percentile(values, 95) == 0.5
+    assert percentile([], 50) is None
+
+
+def test_probes_run_concurrently_and_report_failures():
+    """Test targets are probed at once and failures and timeouts are reported."""
+    barrier = threading.Barrier(2, timeout=2)
+    release = threading.Event()
+
+    def hang():
+        release.wait(5)
+
+    def fail():
+        raise ConnectionError("refused")
+
+    targets = [
+        ProbeTarget('provider', 'a', barrier.wait),
+        ProbeTarget('controller', 'b', barrier.wait),
+        ProbeTarget('channel', 'rejected', lambda: False),
+        ProbeTarget('provider', 'down', fail),
+        ProbeTarget('controller', 'stuck', hang),
+    ]
+    started = time.monotonic()
+    try:
+        reports = probe_all(targets, probes=2, timeout=0.2)
+    finally:
+        release.set()
+    by_name = {report.name: report for report in reports}
+
+    assert time.monotonic() - started < 2
+    assert by_name['a'].ok and by_name['b'].ok
+    assert len(by_name['a'].latencies) == 2 and by_name['a'].p95 is not None
+    assert not by_name['rejected'].ok
+    assert by_name['down'].failures == ["refused", "refused"]
+    assert by_name['stuck'].failures == ["timed out after 0.2s"]
+    assert by_name['stuck'].p50 is None
+
+
+def test_hung_probe_does_not_delay_exit():
+    """Test the process exits at the timeout even while a probe is still stuck."""
+    script = (
+        "import time\n"
+        "from src.unifi_access_pms.core.health import ProbeTarget, probe_all\n"
+        "probe_all([ProbeTarget('provider', 'stuck', lambda: time.sleep(30))], timeout=0.2)\n"
+    )
+    started = time.monotonic()
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=20,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    assert time.monotonic() - started < 10
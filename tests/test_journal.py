@@ -0,0 +1,135 @@
+"""Test crash recovery from the operation journal."""
+
+from datetime import datetime
+
+import pytest
+
+from src.unifi_access_pms.core.journal import OperationJournal
+from src.unifi_access_pms.core.models import SyncResult, Visitor
+from src.unifi_access_pms.core.sync import SyncEngine
+from tests.conftest import make_reservation
+
+
+class Crash(BaseException):
+    pass
+
+
+class RecordingIntegration:
+    def __init__(self, visitors, crash_on=None):
+        self.visitors = visitors
+        self.crash_on = crash_on
+        self.calls = []
+        self.listings = 0
+
+    def get_visitors(self):
+        self.listings += 1
+        return list(self.visitors)
+
+    def create_visitor(self, visitor):
+        self._record('create', visitor.name)
+        visitor_id = f"v-{len(self.calls)}"
+        self.visitors.append(Visitor(id=visitor_id, name=visitor.name, pin=visitor.pin,
+                                     start_time=visitor.start_time, end_time=visitor.end_time))
+        return visitor_id
+
+    def update_visitor(self, visitor_id, visitor):
+        return self._record('update', visitor.name)
+
+    def delete_visitor(self, visitor_id):
+        self._record('delete', visitor_id)
+        remaining = [v for v in self.visitors if v.id != visitor_id]
+        # Like the controller, report a visitor that is already gone as a failure
+        found = len(remaining) < len(self.visitors)
+        self.visitors = remaining
+        return found
+
+    def _record(self, action, name):
+        if (action, name) == self.crash_on:
+            raise Crash()
+        self.calls.append((action, name))
+        return True
+
+
+def test_resume_applies_only_unfinished_operations(tmp_path):
+    """Test a crashed run's unfinished operations are re-applied first."""
+    reservations = [make_reservation("r1", "Ann"), make_reservation("r2", "Bob")]
+    visitors = [Visitor(id="9", name="Old Guest", pin="0000")]
+    journal_path = str(tmp_path / "controller.journal")
+
+    crashing = RecordingIntegration(list(visitors), crash_on=('create', 'Bob Guest'))
+    with pytest.raises(Crash):
+        SyncEngine(crashing, journal=OperationJournal(journal_path)).sync(reservations)
+    assert crashing.calls == [('create', 'Ann Guest')]
+
+    # Bob's create was in doubt and is absent, so it is re-applied; the
+    # fresh diff afterwards finds nothing left to do
+    recovered = RecordingIntegration(crashing.visitors)
+    result = SyncEngine(recovered, journal=OperationJournal(journal_path)).sync(reservations)
+
+    assert recovered.calls == [('create', 'Bob Guest'), ('delete', '9')]
+    assert result.created == 1 and result.deleted == 1
+    assert not (tmp_path / "controller.journal").exists()
+
+
+def test_resume_then_syncs_new_reservations(tmp_path):
+    """Test reservations added since the crash are synced in the same run."""
+    journal_path = str(tmp_path / "controller.journal")
+    crashing = RecordingIntegration([], crash_on=('create', 'Bob Guest'))
+    with pytest.raises(Crash):
+        SyncEngine(crashing, journal=OperationJournal(journal_path)).sync(
+            [make_reservation("r1", "Ann"), make_reservation("r2", "Bob")])
+
+    recovered = RecordingIntegration(crashing.visitors)
+    SyncEngine(recovered, journal=OperationJournal(journal_path)).sync(
+        [make_reservation("r1", "Ann"), make_reservation("r2", "Bob"),
+         make_reservation("r3", "Cat")])
+
+    assert recovered.calls == [('create', 'Bob Guest'), ('create', 'Cat Guest')]
+
+
+def test_empty_journal_is_treated_as_no_journal(tmp_path):
+    """Test a journal whose operations all finished does not cost a run."""
+    journal = OperationJournal(str(tmp_path / "controller.journal"))
+    operation = SyncEngine(RecordingIntegration([])).plan(
+        [make_reservation("r1", "Ann")], [], SyncResult())[0]
+    journal.begin([operation])
+    journal.done(operation)
+    journal.close()
+
+    integration = RecordingIntegration([])
+    SyncEngine(integration, journal=journal).sync([make_reservation("r2", "Bob")])
+
+    assert integration.calls == [('create', 'Bob Guest')]
+
+
+def test_in_doubt_create_that_landed_is_skipped(tmp_path):
+    """Test an in-doubt create is not duplicated if the visitor exists."""
+    journal_path = str(tmp_path / "controller.journal")
+    crashing = RecordingIntegration([], crash_on=('create', 'Ann Guest'))
+    with pytest.raises(Crash):
+        SyncEngine(crashing, journal=OperationJournal(journal_path)).sync(
+            [make_reservation("r1", "Ann")])
+
+    recovered = RecordingIntegration([Visitor(id="1", name="Ann Guest", pin="1234",
+                                              start_time=datetime(2024, 1, 1, 15, 0),
+                                              end_time=datetime(2024, 1, 3, 11, 0))])
+    SyncEngine(recovered, journal=OperationJournal(journal_path)).sync(
+        [make_reservation("r1", "Ann")])
+
+    assert recovered.calls == []
+
+
+def test_in_doubt_delete_that_landed_is_not_an_error(tmp_path):
+    """Test an in-doubt delete of an already removed visitor is not retried."""
+    journal_path = str(tmp_path / "controller.journal")
+    old = Visitor(id="v-old", name="Old Guest", pin="0000")
+    crashing = RecordingIntegration([old], crash_on=('delete', 'v-old'))
+    with pytest.raises(Crash):
+        SyncEngine(crashing, journal=OperationJournal(journal_path)).sync([])
+
+    recovered = RecordingIntegration([])
+    result = SyncEngine(recovered, journal=OperationJournal(journal_path)).sync([])
+
+    assert recovered.calls == []
+    assert result.errors == []
+    assert OperationJournal(journal_path).pending() is None
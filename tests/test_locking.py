@@ -0,0 +1,88 @@
+"""Test single-flight locking and coalescing."""
+
+import threading
+import time
+
+from src.unifi_access_pms.core.locking import SingleFlight, controller_scopes, sync_scope
+
+
+def test_overlapping_requests_coalesce_into_one_follow_up(tmp_path):
+    """Test requests during an active run trigger exactly one more run."""
+    calls = []
+    coalesced = []
+
+    def run():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            for _ in range(3):
+                coalesced.append(SingleFlight("scope", str(tmp_path)).run(lambda: None))
+
+    runs = SingleFlight("scope", str(tmp_path)).run(run)
+
+    assert runs == 2
+    assert coalesced == [0, 0, 0]
+    assert not SingleFlight("scope", str(tmp_path)).pending_paths[0].exists()
+
+
+def test_different_scopes_do_not_block(tmp_path):
+    """Test locks for different controllers are independent."""
+    inner = []
+
+    def run():
+        inner.append(SingleFlight("other", str(tmp_path)).run(lambda: None))
+
+    assert SingleFlight("scope", str(tmp_path)).run(run) == 1
+    assert inner == [1]
+
+
+def test_sync_scope_normalizes_hosts():
+    """Test URL and bare-host spellings of a controller share a scope."""
+    assert sync_scope(["https://10.0.0.1/"]) == sync_scope(["10.0.0.1"])
+
+
+def test_overlapping_controller_sets_exclude_each_other(tmp_path):
+    """Test a run on one controller blocks any run whose set includes it."""
+    inner = []
+
+    def run():
+        if not inner:
+            inner.append(SingleFlight(controller_scopes(["https://b", "https://a"]),
+                                      str(tmp_path)).run(lambda: None))
+            inner.append(SingleFlight(controller_scopes(["https://b"]),
+                                      str(tmp_path)).run(lambda: None))
+
+    # The legacy script locks its one controller
+    runs = SingleFlight(sync_scope(["https://a"]), str(tmp_path)).run(run)
+
+    assert inner == [0, 1]
+    assert runs == 2
+
+
+def test_hold_waits_for_running_sync(tmp_path):
+    """Test a transition on a controller waits for the sync holding it."""
+    events = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def sync():
+        started.set()
+        release.wait(2)
+        events.append('sync')
+
+    def transition():
+        with SingleFlight(sync_scope(["https://b"]), str(tmp_path)).hold():
+            events.append('transition')
+
+    syncing = threading.Thread(target=SingleFlight(
+        controller_scopes(["https://a", "https://b"]), str(tmp_path)).run, args=(sync,))
+    syncing.start()
+    started.wait(2)
+    waiting = threading.Thread(target=transition)
+    waiting.start()
+    time.sleep(0.1)
+    assert events == []
+
+    release.set()
+    syncing.join()
+    waiting.join()
+    assert events == ['sync', 'transition']
@@ -0,0 +1,89 @@
+"""Test cross-provider reservation merging."""
+
+from datetime import datetime
+
+from src.unifi_access_pms.config.models import ProviderConfig
+from src.unifi_access_pms.core.execution import ProviderExecutor
+from src.unifi_access_pms.core.interfaces import ReservationProvider
+from src.unifi_access_pms.core.merge import ReservationMerger
+from tests.conftest import make_reservation
+
+
+class StaticProvider(ReservationProvider):
+    def __init__(self, reservations):
+        self.reservations = reservations
+
+    def get_reservations(self, start_date, end_date):
+        return list(self.reservations)
+
+    def validate_config(self, config):
+        return True
+
+
+CONFIGS = {
+    'hospitable': ProviderConfig(priority=2, config={'property_mappings': {'uuid-1': 'front_door'}}),
+    'ics': ProviderConfig(priority=1, config={'property_mappings': {'airbnb': 'front_door'}}),
+}
+
+
+def test_same_stay_from_two_providers_is_merged():
+    """Test the higher priority record wins and keeps provenance."""
+    merger = ReservationMerger(CONFIGS)
+    merged = merger.merge([
+        make_reservation("ics-1", "Reserved", "", provider="ics", phone="1234",
+                         property_id="airbnb"),
+        make_reservation("h-1", "Ann", provider="hospitable", phone="+1 555 123 1234",
+                         property_id="uuid-1", check_in=datetime(2024, 1, 1, 16, 0)),
+    ])
+
+    assert len(merged) == 1
+    assert merged[0].id == "h-1"
+    assert merged[0].sources == ["ics:ics-1", "hospitable:h-1"]
+    assert merger.duplicates == 1
+
+
+def test_placeholder_winner_takes_name_from_other_provider():
+    """Test a placeholder guest name is replaced by the real one."""
+    configs = {'ics': ProviderConfig(priority=5), 'hospitable': ProviderConfig(priority=1)}
+    merged = ReservationMerger(configs).merge([
+        make_reservation("ics-1", "Reserved", "", phone=None, provider="ics", property_id="p"),
+        make_reservation("h-1", "Ann", provider="hospitable", property_id="p"),
+    ])
+
+    assert merged[0].id == "ics-1"
+    assert merged[0].guest_name == "Ann Guest"
+    assert merged[0].guest.phone == "5551234"
+
+
+def test_different_guests_and_same_provider_are_kept():
+    """Test distinct phones, other dates and same-provider records stay separate."""
+    merged = ReservationMerger(CONFIGS).merge([
+        make_reservation("h-1", "Ann", provider="hospitable", property_id="uuid-1"),
+        make_reservation("ics-1", "Ann", provider="ics", phone="9999", property_id="airbnb"),
+        make_reservation("ics-2", "Bob", phone=None, provider="ics", property_id="airbnb",
+                         check_in=datetime(2024, 1, 2, 15, 0)),
+        make_reservation("h-2", "Ann", provider="hospitable", property_id="uuid-1"),
+    ])
+
+    assert [r.id for r in merged] == ["h-1", "ics-1", "ics-2", "h-2"]
+
+
+def test_duplicates_fetched_by_executor_are_merged():
+    """Test providers sharing a door group are all fetched and then merged."""
+    executor = ProviderExecutor({
+        'hospitable': StaticProvider([
+            make_reservation("h-1", "Ann", provider="hospitable", property_id="uuid-1")]),
+        'ics': StaticProvider([
+            make_reservation("ics-1", "Reserved", "", provider="ics", phone="1234",
+                             property_id="airbnb"),
+            make_reservation("ics-2", "Bob", provider="ics", phone="9876", property_id="airbnb",
+                             check_in=datetime(2024, 1, 2, 15, 0)),
+        ]),
+    }, CONFIGS)
+
+    merger = ReservationMerger(CONFIGS)
+    merged = merger.merge(executor.fetch_all(datetime(2024, 1, 1), datetime(2024, 1, 31)))
+    executor.close()
+
+    assert sorted(r.id for r in merged) == ["h-1", "ics-2"]
+    assert merger.duplicates == 1
@@ -0,0 +1,65 @@
+"""Test notification channels and their shared HTTP session."""
+
+from src.unifi_access_pms.config.models import Config, HttpConfig
+from src.unifi_access_pms.notifications.http import HttpClient
+from src.unifi_access_pms.notifications.manager import NotificationManager
+from src.unifi_access_pms.notifications.simplepush import SIMPLEPUSH_URL
+
+
+class Response:
+    status_code = 200
+    text = ''
+
+
+class RecordingSession:
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        return Response()
+
+    def close(self):
+        pass
+
+
+CONFIG = {'notifications': {
+    'enabled_channels': ['simplepush', 'matrix'],
+    'channels': {
+        'simplepush': {'config': {'key': 'abc'}},
+        'matrix': {'config': {'homeserver': 'matrix.org', 'access_token': 't',
+                              'room_id': '!r:matrix.org'}},
+    },
+    'http': {'timeout': 3, 'proxy': 'http://proxy.local:3128'},
+}}
+
+
+def test_channels_share_one_session_with_default_timeout():
+    """Test every message goes through the manager's pooled session."""
+    manager = NotificationManager(Config.from_dict(CONFIG))
+    session = RecordingSession()
+    manager.http._session = session
+
+    assert manager.channels['simplepush'].http is manager.http
+    assert manager.channels['matrix'].http is manager.http
+
+    assert manager.send_notification("first") and manager.send_notification("second")
+
+    assert len(session.requests) == 4
+    assert session.requests[0][1] == SIMPLEPUSH_URL
+    assert all(kwargs['timeout'] == 3 for _, _, kwargs in session.requests)
+    assert manager.http.config == HttpConfig(timeout=3, proxy='http://proxy.local:3128')
+
+
+def test_http_settings_change_moves_channels_to_new_session():
+    """Test a reload with new HTTP settings rebuilds the shared client."""
+    config = Config.from_dict(CONFIG)
+    manager = NotificationManager(config)
+    old_http = manager.http
+
+    config.notifications.http = HttpConfig(timeout=5)
+    manager.reconfigure(config, set())
+
+    assert manager.http is not old_http
+    assert manager.channels['matrix'].http is manager.http
+    assert HttpClient().config.timeout == 10
@@ -0,0 +1,42 @@
+"""Test the profiling mode."""
+
+import json
+import pstats
+import threading
+
+from src.unifi_access_pms.core import profiling
+from src.unifi_access_pms.core.profiling import Profiler, span, traced
+
+
+def slow_fetch():
+    return sum(range(10000))
+
+
+def test_spans_are_no_ops_when_off():
+    """Test instrumentation costs nothing unless profiling is on."""
+    assert traced('provider', 'p', slow_fetch) is slow_fetch
+    assert span('controller', 'get_visitors') is span('channel', 'matrix')
+
+
+def test_profiler_writes_stats_and_trace(tmp_path):
+    """Test calls on worker threads end up in both outputs."""
+    prefix = str(tmp_path / "run")
+
+    with Profiler(prefix):
+        worker = threading.Thread(target=traced('provider', 'hospitable', slow_fetch),
+                                  name='provider_0')
+        worker.start()
+        worker.join()
+        with span('controller', 'create_visitor', host='h'):
+            slow_fetch()
+
+    assert profiling._tracer is None
+    with open(f"{prefix}.trace.json") as f:
+        trace = json.load(f)
+    events = {e['name']: e for e in trace['traceEvents'] if e['ph'] == 'X'}
+    assert events['hospitable']['cat'] == 'provider'
+    assert events['create_visitor']['args'] == {'host': 'h'}
+    assert events['hospitable']['tid'] != events['create_visitor']['tid']
+
+    functions = {func[2] for func in pstats.Stats(f"{prefix}.pstats").stats}
+    assert 'slow_fetch' in functions
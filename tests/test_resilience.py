@@ -0,0 +1,215 @@
+"""Test rate limiting, backoff and circuit breaking."""
+
+import pytest
+from datetime import datetime
+
+from src.unifi_access_pms.core.models import Guest, Reservation, Visitor
+from src.unifi_access_pms.core.resilience import (
+    TokenBucket, CircuitBreaker, TransientError, CircuitOpenError, parse_retry_after,
+)
+from src.unifi_access_pms.core.sync import SyncEngine
+from src.unifi_access_pms.integrations.unifi_access import UniFiAccessClient
+from tests.conftest import FakeClock
+
+
+class ThrottledError(Exception):
+    status_code = 429
+    retry_after = "2"
+
+
+class FakeVisitors:
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.deleted = []
+
+    def list(self):
+        return []
+
+    def create(self, **kwargs):
+        if self.failures:
+            raise self.failures.pop(0)
+        return type('Created', (), {'id': 'v-new'})()
+
+    def delete(self, visitor_id):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.deleted.append(visitor_id)
+
+
+class FakeSDK:
+    def __init__(self, failures=()):
+        self.visitors = FakeVisitors(failures)
+
+
+def make_client(sdk, **kwargs):
+    client = UniFiAccessClient("host", "token", **kwargs)
+    client._client = sdk
+    clock = FakeClock()
+    client._sleep = clock.sleep
+    client._bucket = TokenBucket(10, 20, clock=clock, sleep=clock.sleep)
+    return client
+
+
+def test_token_bucket_burst_then_rate():
+    """Test bucket allows a burst and then refills at the configured rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    bucket.acquire()
+    assert clock.now == pytest.approx(0.5)
+
+
+def test_token_bucket_honors_retry_after():
+    """Test throttling pauses the bucket and halves its rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=4, burst=4, clock=clock, sleep=clock.sleep)
+
+    bucket.throttle(retry_after=5)
+    assert bucket.current_rate == 2
+    assert bucket.try_acquire() == pytest.approx(5)
+
+
+def test_parse_retry_after():
+    """Test Retry-After parsing for seconds and invalid values."""
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    """Test breaker opens after the threshold and half-opens after timeout."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_circuit_allows_a_single_trial():
+    """Test only one call probes a half-open circuit until it reports back."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_client_retries_throttled_write():
+    """Test a throttled delete is retried and counted as a retry."""
+    sdk = FakeSDK([ThrottledError()])
+    client = make_client(sdk)
+
+    assert client.delete_visitor("v1") is True
+    assert sdk.visitors.deleted == ["v1"]
+    assert client.retry_count == 1
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+class ConnectTimeout(Exception):
+    pass
+
+
+def test_client_does_not_retry_ambiguous_create():
+    """Test a create that may have landed is deferred, not sent twice."""
+    client = make_client(FakeSDK([ServerError()]))
+
+    with pytest.raises(TransientError):
+        client.create_visitor(Visitor(name="Ann Guest", pin="1234"))
+    assert client.retry_count == 0
+
+
+def test_client_retries_create_that_never_connected():
+    """Test creates are retried after connect failures and throttling."""
+    client = make_client(FakeSDK([ConnectTimeout(), ThrottledError()]))
+
+    assert client.create_visitor(Visitor(name="Ann Guest", pin="1234")) == "v-new"
+    assert client.retry_count == 2
+
+
+class NotFound(Exception):
+    status_code = 404
+
+
+def test_hard_write_failure_keeps_its_cause():
+    """Test a rejected delete is recorded with the controller's error message."""
+    client = make_client(FakeSDK([NotFound("visitor v1 not found")]))
+
+    class Integration:
+        retry_count = 0
+
+        def get_visitors(self):
+            return [Visitor(id="v1", name="Old Guest", pin="1234")]
+
+        def delete_visitor(self, visitor_id):
+            return client.delete_visitor(visitor_id)
+
+    result = SyncEngine(Integration()).sync([])
+
+    assert result.errors == ["Failed to delete Old Guest: visitor v1 not found"]
+
+
+def test_client_open_circuit_rejects_writes():
+    """Test writes are refused while the circuit is open."""
+    client = make_client(FakeSDK([ConnectionError()] * 5), max_retries=0,
+                         failure_threshold=1)
+
+    with pytest.raises(TransientError):
+        client.delete_visitor("v1")
+    with pytest.raises(CircuitOpenError):
+        client.delete_visitor("v1")
+
+
+def test_sync_result_separates_deferred_from_errors():
+    """Test transient failures are deferred rather than reported as errors."""
+    class Integration:
+        retry_count = 0
+
+        def get_visitors(self):
+            return [Visitor(id="1", name="Old Guest", pin="1234")]
+
+        def create_visitor(self, visitor):
+            raise TransientError("throttled")
+
+        def update_visitor(self, visitor_id, visitor):
+            return True
+
+        def delete_visitor(self, visitor_id):
+            return False
+
+    reservation = Reservation(
+        id="r1",
+        guest=Guest(first_name="Jane", last_name="Smith", phone="5551234"),
+        check_in=datetime(2024, 1, 1, 15, 0),
+        check_out=datetime(2024, 1, 3, 11, 0),
+        status="confirmed",
+        property_id="prop_1"
+    )
+
+    result = SyncEngine(Integration()).sync([reservation])
+
+    assert result.total_processed == 1
+    assert len(result.deferred) == 1
+    assert result.errors == ["Failed to delete Old Guest"]
@@ -0,0 +1,48 @@
+"""Test tiered sync scheduling."""
+
+from datetime import datetime
+
+from src.unifi_access_pms.config.models import CoreConfig, SyncTierConfig
+from src.unifi_access_pms.core.models import SyncResult, Visitor
+from src.unifi_access_pms.core.scheduler import TieredScheduler
+from src.unifi_access_pms.core.sync import SyncEngine
+from tests.conftest import FakeClock
+
+
+def test_widest_due_tier_runs_and_covers_narrower():
+    """Test only the widest due tier runs and narrower ones are rescheduled."""
+    clock = FakeClock(1_700_000_000.0)
+    runs = []
+    tiers = [SyncTierConfig("near", 48, 60), SyncTierConfig("far", 2160, 3600)]
+    scheduler = TieredScheduler(tiers, lambda tier, start, end: runs.append(tier.name),
+                                clock=clock)
+
+    scheduler.run_pending()
+    clock.now += 60
+    scheduler.run_pending()
+    clock.now += 30
+    assert scheduler.run_pending() is None
+
+    assert runs == ["far", "near"]
+    assert scheduler.seconds_until_next() == 30
+
+
+def test_core_config_parses_tiers():
+    """Test tier dictionaries from YAML become SyncTierConfig."""
+    core = CoreConfig(sync_tiers=[{'name': 'near', 'horizon_hours': 48, 'interval': 60}])
+
+    assert core.get_sync_tiers() == [SyncTierConfig('near', 48, 60)]
+    assert CoreConfig(sync_interval=120).get_sync_tiers()[0].interval == 120
+
+
+def test_window_limits_deletions():
+    """Test a short window never deletes visitors starting after it."""
+    visitors = [
+        Visitor(id="1", name="Soon", start_time=datetime(2024, 1, 2), pin="1234"),
+        Visitor(id="2", name="Later", start_time=datetime(2024, 3, 1), pin="1234"),
+    ]
+
+    operations = SyncEngine(None).plan([], visitors, SyncResult(),
+                                       window_end=datetime(2024, 1, 3))
+
+    assert [op.visitor_id for op in operations] == ["1"]
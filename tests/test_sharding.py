@@ -0,0 +1,156 @@
+"""Test controller sharding across nodes."""
+
+from datetime import datetime
+
+from src.unifi_access_pms.config.models import Config, UniFiConfig
+from src.unifi_access_pms.config.watcher import diff_configs
+from src.unifi_access_pms.core.models import Guest, Reservation
+from src.unifi_access_pms.core.sharding import HashRing, ShardCoordinator
+from src.unifi_access_pms.core.sync import ControllerFanOut
+from src.unifi_access_pms.runner import SyncRunner
+from tests.conftest import FakeClock
+
+
+SHARDS = [f"controller-{i}" for i in range(12)]
+
+
+def make_node(tmp_path, node_id, clock):
+    return ShardCoordinator(str(tmp_path / "shards.db"), SHARDS, node_id=node_id,
+                            lease_ttl=30, clock=clock)
+
+
+def test_ring_moves_few_shards_when_a_node_joins():
+    """Test consistent hashing only reassigns shards to the new node."""
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b", "c", "d"])
+    shards = [f"s{i}" for i in range(200)]
+
+    moved = [s for s in shards if before.node_for(s) != after.node_for(s)]
+
+    assert all(after.node_for(s) == "d" for s in moved)
+    assert 0 < len(moved) < len(shards) / 2
+
+
+def test_rebalance_on_join_and_death_never_overlaps(tmp_path):
+    """Test shards move on join and death and are never held twice."""
+    clock = FakeClock(1_700_000_000.0)
+    a = make_node(tmp_path, "node-a", clock)
+    b = make_node(tmp_path, "node-b", clock)
+
+    assert a.acquire() == set(SHARDS)
+
+    # b joins: it only gets shards once a has let go of them
+    b_first = b.acquire()
+    assert b_first == set()
+    a_owned = a.acquire()
+    b_owned = b.acquire()
+    assert a_owned and b_owned
+    assert a_owned.isdisjoint(b_owned)
+    assert a_owned | b_owned == set(SHARDS)
+
+    # a dies: once its leases expire b takes everything
+    clock.now += 31
+    assert a.owned() == set()
+    assert b.acquire() == set(SHARDS)
+    assert set(b.assignment().values()) == {"node-b"}
+
+
+def test_leases_lapse_locally_before_they_expire(tmp_path):
+    """Test a node that cannot renew stops syncing before others may take over."""
+    clock = FakeClock(1_700_000_000.0)
+    node = make_node(tmp_path, "node-a", clock)
+    node.acquire()
+
+    clock.now += 15
+    assert node.owned() == set(SHARDS)
+    clock.now += 6
+    assert node.owned() == set()
+    assert node.renew()
+    assert node.owned() == set(SHARDS)
+
+
+def test_fan_out_syncs_only_owned_controllers():
+    """Test a node never writes another node's reservations to its catch-all."""
+    controllers = [
+        UniFiConfig(name='a', api_host='https://a', properties=['p1']),
+        UniFiConfig(name='b', api_host='https://b'),
+    ]
+    synced = {}
+
+    class Integration:
+        def __init__(self, name):
+            self.name = name
+
+        def get_visitors(self):
+            return []
+
+        def create_visitor(self, visitor):
+            synced.setdefault(self.name, []).append(visitor.name)
+            return "id"
+
+    guest = Guest(first_name="Jane", last_name="Smith")
+    reservations = [
+        Reservation(id="1", guest=guest, check_in=datetime(2024, 1, 1),
+                    check_out=datetime(2024, 1, 2), status="confirmed", property_id="p1"),
+    ]
+    fan_out = ControllerFanOut(controllers, lambda c: Integration(c.name), owned={'b'})
+
+    results = fan_out.sync(reservations)
+
+    assert list(results) == ['b']
+    assert synced == {}
+
+
+def test_reload_with_new_node_id_rejoins_ring(tmp_path):
+    """Test changed shard settings release the old leases and rejoin."""
+    def make_config(node_id):
+        return Config.from_dict({
+            'core': {'enabled_providers': [], 'snapshot_dir': None, 'audit_db': None,
+                     'shard_store': str(tmp_path / "shards.db"), 'node_id': node_id},
+            'unifi': {'api_host': 'https://main.local', 'api_token': 'token'},
+        })
+    old_config, new_config = make_config("node-a"), make_config("node-b")
+    runner = SyncRunner(old_config)
+    assert runner.shards.acquire() == {"https://main.local"}
+
+    runner.reconfigure(new_config, diff_configs(old_config, new_config))
+
+    assert runner.shards.node_id == "node-b"
+    assert runner.shards.live_nodes() == []
+    assert runner.shards.acquire() == {"https://main.local"}
+    runner.close()
+
+
+def test_fan_out_stops_writing_when_lease_lapses_mid_run(tmp_path):
+    """Test writes stop once the lease lapses, so another node can safely take over."""
+    clock = FakeClock(1_700_000_000.0)
+    shards = ShardCoordinator(str(tmp_path / "shards.db"), ['a'], node_id="node-a",
+                              lease_ttl=30, clock=clock)
+    written = []
+
+    class SlowIntegration:
+        """Each write takes long enough for a missed renewal to lapse the lease."""
+
+        def get_visitors(self):
+            return []
+
+        def create_visitor(self, visitor):
+            clock.now += 12
+            written.append(visitor.name)
+            return "id"
+
+    reservations = [
+        Reservation(id=str(i), guest=Guest(first_name=f"Guest{i}", last_name="Smith"),
+                    check_in=datetime(2024, 1, 1 + i), check_out=datetime(2024, 1, 2 + i),
+                    status="confirmed", property_id="p1")
+        for i in range(3)
+    ]
+    fan_out = ControllerFanOut([UniFiConfig(name='a', api_host='https://a')],
+                               lambda c: SlowIntegration(), owned=shards.acquire(),
+                               lease=shards.owned)
+
+    result = fan_out.sync(reservations)['a']
+
+    assert written == ["Guest0 Smith", "Guest1 Smith"]
+    assert result.created == 2
+    assert result.deferred == ["create Guest2 Smith: shard lease lapsed"]
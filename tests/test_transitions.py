@@ -0,0 +1,173 @@
+"""Test event-time check-in and check-out transitions."""
+
+from datetime import datetime, timedelta
+
+from src.unifi_access_pms.config.models import Config
+from src.unifi_access_pms.core.models import SyncResult, Visitor
+from src.unifi_access_pms.core.sync import SyncEngine
+from src.unifi_access_pms.core.transitions import Transition, TransitionScheduler
+from src.unifi_access_pms.integrations.pool import ControllerPool
+from src.unifi_access_pms.runner import SyncRunner
+from tests.conftest import FakeClock, make_reservation
+
+
+def test_transitions_fire_in_time_order():
+    """Test each transition is applied once, exactly when due."""
+    clock = FakeClock(datetime(2024, 1, 1, 12, 0))
+    applied = []
+    scheduler = TransitionScheduler(lambda t: applied.append((t.action, t.reservation.id)),
+                                    grace_period=timedelta(minutes=30), clock=clock)
+    scheduler.plan([
+        make_reservation("r1", "Ann"),
+        make_reservation("r2", "Bob", check_in=datetime(2023, 12, 30, 15, 0),
+                         check_out=datetime(2024, 1, 1, 11, 0)),
+    ])
+
+    # Bob's check-in has passed; only his revocation after the grace period remains
+    assert scheduler.seconds_until_next() == 3600 * 3
+    clock.now += 3600 * 3
+    assert scheduler.run_due() == 1
+    clock.now += 3600 * 44 + 1800
+    scheduler.run_due()
+
+    assert applied == [("activate", "r1"), ("revoke", "r1")]
+    assert scheduler.seconds_until_next() is None
+
+
+def test_replanning_keeps_transitions_beyond_horizon():
+    """Test a narrow window replaces only the transitions inside it."""
+    clock = FakeClock(datetime(2024, 1, 1, 12, 0))
+    scheduler = TransitionScheduler(lambda t: None, clock=clock)
+    scheduler.plan([
+        make_reservation("r1", "Ann"),
+        make_reservation("r2", "Bob", check_in=datetime(2024, 2, 1, 15, 0),
+                         check_out=datetime(2024, 2, 3, 11, 0)),
+    ])
+    assert len(scheduler) == 4
+
+    # r1 was cancelled; the 48 hour sync no longer reports it
+    scheduler.plan([], until=datetime(2024, 1, 3, 12, 0))
+
+    assert [t.reservation.id for t in scheduler.pop_due()] == []
+    assert len(scheduler) == 2
+
+
+def test_revoke_deletes_only_that_guest():
+    """Test a revocation removes the guest's visitor and nothing else."""
+    class Integration:
+        deleted = []
+
+        def get_visitors(self):
+            return [Visitor(id="1", name="Ann Guest", pin="1234"),
+                    Visitor(id="2", name="Bob Guest", pin="1234")]
+
+        def delete_visitor(self, visitor_id):
+            self.deleted.append(visitor_id)
+            return True
+
+    integration = Integration()
+    result = SyncResult()
+    reservation = make_reservation("r1", "Ann", check_in=datetime(2024, 1, 1),
+                                   check_out=datetime(2024, 1, 3))
+
+    assert SyncEngine(integration).transition(reservation, 'revoke', result)
+    assert integration.deleted == ["1"]
+    assert result.deleted == 1
+
+
+def test_revoke_keeps_visitor_of_overlapping_next_stay():
+    """Test a late revoke does not lock out a guest whose next stay began."""
+    class Integration:
+        deleted = []
+
+        def get_visitors(self):
+            return [Visitor(id="1", name="Ann Guest", pin="1234")]
+
+        def delete_visitor(self, visitor_id):
+            self.deleted.append(visitor_id)
+            return True
+
+    clock = FakeClock(datetime(2024, 1, 3, 12, 30))
+    first = make_reservation("r1", "Ann")
+    second = make_reservation("r2", "Ann", check_in=datetime(2024, 1, 3, 12, 0),
+                              check_out=datetime(2024, 1, 5, 11, 0))
+    integration = Integration()
+    engine = SyncEngine(integration, grace_period=timedelta(hours=2), clock=clock)
+
+    assert engine.transition(first, 'revoke', SyncResult(), [first, second])
+    assert integration.deleted == []
+
+    clock.now = datetime(2024, 1, 5, 13, 0).timestamp()
+    assert engine.transition(second, 'revoke', SyncResult(), [first, second])
+    assert integration.deleted == ["1"]
+
+
+def test_runner_skips_revokes_while_provider_data_is_stale(tmp_path):
+    """Test a revoke planned from snapshot data cannot bypass delete suppression."""
+    class Integration:
+        deleted = []
+
+        def get_visitors(self):
+            return [Visitor(id="1", name="Ann Guest", pin="1234")]
+
+        def delete_visitor(self, visitor_id):
+            self.deleted.append(visitor_id)
+            return True
+
+    config = Config.from_dict({
+        'core': {'enabled_providers': [], 'snapshot_dir': None, 'journal_dir': None,
+                 'audit_db': None, 'lock_dir': str(tmp_path)},
+        'unifi': {'api_host': 'https://main.local', 'api_token': 'token'},
+    })
+    integration = Integration()
+    runner = SyncRunner(config, pool=ControllerPool(factory=lambda c: integration))
+    reservation = make_reservation("r1", "Ann")
+    revoke = Transition(reservation.check_out.timestamp(), 'revoke', reservation)
+
+    runner.executor.stale = {"ics"}
+    runner.transition(revoke)
+    assert integration.deleted == []
+
+    runner.executor.stale = set()
+    runner.transition(revoke)
+    assert integration.deleted == ["1"]
+    runner.close()
+
+
+def test_back_to_back_stays_share_one_stable_visitor():
+    """Test a guest's chained stays get one visitor that syncs and transitions agree on."""
+    class Integration:
+        def __init__(self):
+            self.visitors = []
+            self.writes = []
+
+        def get_visitors(self):
+            return list(self.visitors)
+
+        def create_visitor(self, visitor):
+            self.writes.append('create')
+            visitor.id = str(len(self.visitors) + 1)
+            self.visitors.append(visitor)
+            return visitor.id
+
+        def update_visitor(self, visitor_id, visitor):
+            self.writes.append('update')
+            return True
+
+    clock = FakeClock(datetime(2024, 1, 1, 12, 0))
+    first = make_reservation("r1", "Ann")
+    second = make_reservation("r2", "Ann", check_in=datetime(2024, 1, 3, 12, 0),
+                              check_out=datetime(2024, 1, 5, 11, 0))
+    later = make_reservation("r3", "Ann", check_in=datetime(2024, 2, 1, 15, 0),
+                             check_out=datetime(2024, 2, 3, 11, 0))
+    integration = Integration()
+    engine = SyncEngine(integration, grace_period=timedelta(hours=2), clock=clock)
+
+    engine.sync([first, second, later])
+    engine.sync([first, second, later])
+    clock.now = datetime(2024, 1, 3, 12, 0).timestamp()
+    assert engine.transition(second, 'activate', SyncResult(), [first, second, later])
+
+    assert integration.writes == ['create']
+    visitor = integration.visitors[0]
+    assert (visitor.start_time, visitor.end_time) == (first.check_in, datetime(2024, 1, 5, 13, 0))
@@ -0,0 +1,100 @@
+"""Tests for configuration hot reload."""
+
+import os
+
+import yaml
+
+from src.unifi_access_pms.config.manager import ConfigManager
+from src.unifi_access_pms.config.watcher import ConfigWatcher, diff_configs
+from src.unifi_access_pms.config.models import Config
+from src.unifi_access_pms.core.interfaces import NotificationChannel
+from src.unifi_access_pms.core.registry import NotificationRegistry
+from src.unifi_access_pms.notifications.manager import NotificationManager
+
+
+BASE = {
+    'core': {'enabled_providers': ['ics']},
+    'unifi': {
+        'api_token': 'token',
+        'controllers': [
+            {'api_host': 'https://a.local', 'properties': ['p1']},
+            {'api_host': 'https://b.local'}
+        ]
+    },
+    'providers': {'ics': {'config': {'feeds': {'airbnb': 'https://example.com/a.ics'}}}},
+    'notifications': {
+        'enabled_channels': ['simplepush'],
+        'channels': {'simplepush': {'config': {'key': 'abc'}}}
+    }
+}
+
+
+def test_diff_reports_only_changed_sections():
+    new_data = yaml.safe_load(yaml.safe_dump(BASE))
+    new_data['unifi']['controllers'][1]['rate_limit'] = 2
+    new_data['notifications']['channels']['simplepush']['config']['key'] = 'xyz'
+
+    changes = diff_configs(Config.from_dict(BASE), Config.from_dict(new_data))
+
+    assert changes.controllers == {'https://b.local'}
+    assert changes.channels == {'simplepush'}
+    assert changes.providers == set()
+    assert not changes.core
+
+
+def test_shared_setting_change_touches_every_controller():
+    new_data = yaml.safe_load(yaml.safe_dump(BASE))
+    new_data['unifi']['api_token'] = 'rotated'
+
+    changes = diff_configs(Config.from_dict(BASE), Config.from_dict(new_data))
+
+    assert changes.controllers == {'https://a.local', 'https://b.local'}
+
+
+def test_watcher_reloads_edited_file(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text(yaml.safe_dump(BASE))
+    watcher = ConfigWatcher(ConfigManager(str(path)))
+
+    assert watcher.poll() is None
+
+    edited = yaml.safe_load(yaml.safe_dump(BASE))
+    edited['providers']['ics']['priority'] = 5
+    path.write_text(yaml.safe_dump(edited))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    new_config, changes = watcher.poll()
+    assert changes.providers == {'ics'}
+    assert new_config.providers['ics'].priority == 5
+    assert watcher.config_manager.config is new_config
+
+
+class RecordingChannel(NotificationChannel):
+    def __init__(self, config):
+        self.config = config
+
+    def send_notification(self, message, **kwargs):
+        return True
+
+    def validate_config(self, config):
+        return True
+
+
+def test_notification_reconfigure_keeps_unchanged_channels():
+    NotificationRegistry.register('recording-a', RecordingChannel)
+    NotificationRegistry.register('recording-b', RecordingChannel)
+    config = Config.from_dict({'notifications': {
+        'enabled_channels': ['recording-a', 'recording-b'],
+        'channels': {'recording-a': {'config': {'key': 1}}, 'recording-b': {}}
+    }})
+    manager = NotificationManager(config)
+    a = manager.channels['recording-a']
+    b = manager.channels['recording-b']
+
+    config.notifications.channels['recording-a'].config['key'] = 2
+    manager.reconfigure(config, {'recording-a'})
+
+    assert manager.channels['recording-b'] is b
+    assert manager.channels['recording-a'] is not a
+    assert manager.channels['recording-a'].config == {'key': 2}
@@ -0,0 +1,97 @@
+"""Test urgency ordering of visitor writes."""
+
+from datetime import datetime, timedelta
+
+from src.unifi_access_pms.core.journal import OperationJournal
+from src.unifi_access_pms.core.models import Visitor, VisitorOperation
+from src.unifi_access_pms.core.sync import SyncEngine
+from src.unifi_access_pms.core.write_queue import WriteQueue
+from tests.conftest import FakeClock, make_reservation
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+class SlowIntegration:
+    """Every write takes ten seconds on the fake clock."""
+
+    def __init__(self, clock, visitors):
+        self.clock = clock
+        self.visitors = visitors
+        self.writes = []
+
+    def get_visitors(self):
+        return list(self.visitors)
+
+    def _write(self, action, name):
+        self.clock.now += 10
+        self.writes.append((action, name))
+        return True
+
+    def create_visitor(self, visitor):
+        return self._write('create', visitor.name)
+
+    def update_visitor(self, visitor_id, visitor):
+        return self._write('update', visitor.name)
+
+    def delete_visitor(self, visitor_id):
+        return self._write('delete', visitor_id)
+
+
+def arriving(first_name, check_in):
+    return make_reservation(first_name, first_name, check_in=check_in,
+                            check_out=check_in + timedelta(days=2))
+
+
+def test_queue_orders_by_tier_then_deadline():
+    """Test imminent check-ins, then overdue revocations, then later writes."""
+    clock = FakeClock(NOW)
+    operations = [
+        VisitorOperation('create', 'Far', deadline=NOW + timedelta(days=90)),
+        VisitorOperation('delete', 'Cancelled', deadline=NOW + timedelta(days=10)),
+        VisitorOperation('delete', 'Overdue', deadline=NOW - timedelta(days=3)),
+        VisitorOperation('update', 'Tonight', deadline=NOW + timedelta(hours=6)),
+        VisitorOperation('create', 'Soon', deadline=NOW + timedelta(minutes=20)),
+        VisitorOperation('delete', 'Unknown'),
+    ]
+
+    ordered = [op.name for op in WriteQueue(operations, clock=clock).drain()]
+
+    assert ordered == ['Soon', 'Tonight', 'Overdue', 'Cancelled', 'Far', 'Unknown']
+
+
+def test_write_budget_defers_least_urgent_writes():
+    """Test a throttled run lands the imminent check-in and defers the rest."""
+    clock = FakeClock(NOW)
+    stale = Visitor(id="v-old", name="Old Guest", pin="0000",
+                    start_time=NOW - timedelta(days=5), end_time=NOW - timedelta(days=3))
+    integration = SlowIntegration(clock, [stale])
+    reservations = [arriving(f"Future{i}", NOW + timedelta(days=60 + i))
+                    for i in range(5)]
+    reservations.append(arriving("Arriving", NOW + timedelta(minutes=20)))
+
+    engine = SyncEngine(integration, write_budget=15, clock=clock)
+    result = engine.sync(reservations)
+
+    assert integration.writes == [('create', 'Arriving Guest'), ('delete', 'v-old')]
+    assert result.created == 1 and result.deleted == 1
+    assert len(result.deferred) == 5
+    assert all('Future' in deferred for deferred in result.deferred)
+
+
+def test_budget_deferrals_do_not_preempt_new_imminent_check_in(tmp_path):
+    """Test writes left over by the budget are re-planned behind new urgent work."""
+    clock = FakeClock(NOW)
+    integration = SlowIntegration(clock, [])
+    journal = OperationJournal(str(tmp_path / "controller.journal"))
+    later = [arriving(name, NOW + timedelta(days=60 + i))
+             for i, name in enumerate(["A", "B", "C", "D"])]
+
+    SyncEngine(integration, journal=journal, write_budget=15, clock=clock).sync(later)
+    assert integration.writes == [('create', 'A Guest'), ('create', 'B Guest')]
+
+    integration.writes = []
+    soon = datetime.fromtimestamp(clock.now) + timedelta(minutes=15)
+    engine = SyncEngine(integration, journal=journal, write_budget=15, clock=clock)
+    engine.sync(later + [arriving("Arriving", soon)])
+
+    assert integration.writes[0] == ('create', 'Arriving Guest')